@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""页面解析基准测试
+
+通过自定义 httpx 传输层回放 corpus/ 下录制的页面，完整走一遍
+ForumAPI / ThreadAPI / SearchAPI / AuthAPI 的公开方法（请求 → 解析 → 模型），
+不访问网络。使用临时配置目录，关闭缓存、本地存储、频率限制和重试，
+测出来的基本就是解析本身的耗时。
+
+每个用例先预热，再计时 N 次，报告：
+- ops/s：每秒完成的调用次数
+- p50/p90/p99：单次调用耗时的百分位
+- 峰值内存：单次调用期间 tracemalloc 记录的峰值（单独一轮，不计入耗时）
+
+用法：
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py -n 200 -k thread
+    python benchmarks/bench_parsers.py --json > result.json
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+
+# 直接从源码目录运行时也能导入 s1cli
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from s1cli.api.auth import AuthAPI  # noqa: E402
+from s1cli.api.client import S1Client  # noqa: E402
+from s1cli.api.forum import ForumAPI  # noqa: E402
+from s1cli.api.search import SearchAPI  # noqa: E402
+from s1cli.api.thread import ThreadAPI  # noqa: E402
+from s1cli.config import Config  # noqa: E402
+
+CORPUS_ROOT = Path(__file__).parent / "corpus"
+DEFAULT_CORPUS = CORPUS_ROOT / "v2"
+
+# 语料中帖子 ID 对应的页面类型
+THREAD_KINDS = {"2000001": "short", "2000002": "long", "2000003": "quotes"}
+
+
+@dataclass
+class BenchResult:
+    """单个用例的测试结果"""
+    name: str
+    page_bytes: int
+    runs: int
+    ops_per_sec: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    peak_kib: float
+
+
+class CorpusTransport(httpx.BaseTransport):
+    """按 URL 返回语料页面的传输层
+
+    路由规则与真实站点一致：search.php 不带 searchid 时 302 跳转到结果页；
+    语料中没有的页面（如 v1 语料中的移动端接口）返回 404。
+    """
+
+    def __init__(self, pages: Dict[str, bytes]):
+        """初始化传输层
+
+        Args:
+            pages: 页面文件名到页面内容的映射
+        """
+        self.pages = pages
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """根据请求路径返回对应的语料页面
+
+        Args:
+            request: 请求对象
+
+        Returns:
+            响应对象
+        """
+        path = request.url.path.rsplit("/", 1)[-1]
+        query = request.url.params
+
+        if path == "forum.php" and query.get("mod") == "forumdisplay":
+            name = "forumdisplay.html"
+        elif path == "forum.php":
+            name = "forum_index.html"
+        elif path == "search.php":
+            if "searchid" not in query:
+                return httpx.Response(
+                    302,
+                    headers={"Location": "search.php?mod=forum&searchid=123&orderby=lastpost&ascdesc=desc&searchsubmit=yes"},
+                )
+            name = "search.html"
+        elif path == "home.php":
+            name = "profile.html"
+        elif path.startswith("thread-"):
+            name = f"thread_{THREAD_KINDS.get(path.split('-')[1])}.html"
+        elif path == "index.php":
+            module = query.get("module")
+            if module == "viewthread":
+                module = f"viewthread_{THREAD_KINDS.get(query.get('tid'))}"
+            name = f"mobile_{module}.json"
+        else:
+            name = None
+
+        if name not in self.pages:
+            return httpx.Response(404)
+        content_type = "application/json" if name.endswith(".json") else "text/html"
+        return httpx.Response(
+            200,
+            content=self.pages[name],
+            headers={"Content-Type": f"{content_type}; charset=utf-8"},
+        )
+
+
+def load_corpus(corpus_dir: Path) -> Dict[str, bytes]:
+    """读取语料目录下清单中列出的页面
+
+    Args:
+        corpus_dir: 语料目录（如 corpus/v1）
+
+    Returns:
+        页面文件名到页面内容的映射
+    """
+    manifest = json.loads((corpus_dir / "manifest.json").read_text(encoding="utf-8"))
+    return {name: (corpus_dir / name).read_bytes() for name in manifest["pages"]}
+
+
+def make_client(config_dir: str, pages: Dict[str, bytes]) -> S1Client:
+    """创建回放语料的客户端
+
+    Args:
+        config_dir: 临时配置目录
+        pages: 语料页面
+
+    Returns:
+        HTTP 客户端
+    """
+    config = Config(config_dir)
+    config._config.update({
+        "cache": {"enabled": False},
+        "rate_limit": {"enabled": False},
+        "retry": {"max_retries": 0},
+        "store": {"enabled": False},
+    })
+    config.save_config()
+    return S1Client(config, transport=CorpusTransport(pages))
+
+
+def build_cases(client: S1Client, pages: Dict[str, bytes]) -> Dict[str, tuple]:
+    """构造所有用例
+
+    Args:
+        client: HTTP 客户端
+        pages: 语料页面，包含移动端接口数据时加入对应用例
+
+    Returns:
+        用例名到 (语料文件名, 调用函数) 的映射
+    """
+    config = client.config._config
+    forum_api = ForumAPI(client)
+    search_api = SearchAPI(client)
+    auth_api = AuthAPI(client)
+    thread_apis = {}
+    for backend in ("bs4", "lxml"):
+        config["parser"] = {"backend": backend}
+        thread_apis[backend] = ThreadAPI(client)
+
+    cases = {
+        "forum.get_forum_list": ("forum_index.html", forum_api.get_forum_list),
+        "forum.get_thread_list": ("forumdisplay.html", lambda: forum_api.get_thread_list("4")),
+        "search.search": ("search.html", lambda: search_api.search("测试")),
+        "auth.check_login": ("profile.html", auth_api.check_login),
+    }
+    for backend, thread_api in thread_apis.items():
+        for tid, kind in THREAD_KINDS.items():
+            cases[f"thread.get_thread[{kind},{backend}]"] = (
+                f"thread_{kind}.html",
+                lambda api=thread_api, tid=tid: api.get_thread(tid),
+            )
+
+    if "mobile_forumindex.json" in pages:
+        config["api"] = {"backend": "mobile"}
+        mobile_forum_api = ForumAPI(client)
+        mobile_thread_api = ThreadAPI(client)
+        config.pop("api")
+        cases["forum.get_forum_list[mobile]"] = ("mobile_forumindex.json", mobile_forum_api.get_forum_list)
+        cases["forum.get_thread_list[mobile]"] = (
+            "mobile_forumdisplay.json",
+            lambda: mobile_forum_api.get_thread_list("4"),
+        )
+        for tid, kind in THREAD_KINDS.items():
+            cases[f"thread.get_thread[{kind},mobile]"] = (
+                f"mobile_viewthread_{kind}.json",
+                lambda tid=tid: mobile_thread_api.get_thread(tid),
+            )
+    return cases
+
+
+def check_result(name: str, result) -> None:
+    """确认用例确实解析出了内容，防止页面结构变化后测的是空结果"""
+    if name.startswith("thread."):
+        ok = result is not None and result.posts
+    elif name == "auth.check_login":
+        ok = result is True
+    else:
+        ok = bool(result)
+    if not ok:
+        raise SystemExit(f"用例 {name} 没有解析出结果，请检查语料或解析代码")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """计算百分位（最近秩法）"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_case(name: str, page_bytes: int, func: Callable, runs: int, warmup: int) -> BenchResult:
+    """运行单个用例
+
+    Args:
+        name: 用例名
+        page_bytes: 页面大小
+        func: 被测函数
+        runs: 计时次数
+        warmup: 预热次数
+
+    Returns:
+        测试结果
+    """
+    check_result(name, func())
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    gc.collect()
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+
+    # tracemalloc 会显著拖慢执行，峰值内存单独测一次
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        page_bytes=page_bytes,
+        runs=runs,
+        ops_per_sec=len(samples) / sum(samples),
+        p50_ms=statistics.median(samples) * 1000,
+        p90_ms=percentile(samples, 90) * 1000,
+        p99_ms=percentile(samples, 99) * 1000,
+        peak_kib=peak / 1024,
+    )
+
+
+def print_table(results: List[BenchResult], corpus_dir: Path) -> None:
+    """用 rich 表格输出结果"""
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    table = Table(title=f"页面解析基准（语料 {corpus_dir.name}）")
+    table.add_column("用例", no_wrap=True)
+    table.add_column("页面", justify="right")
+    table.add_column("ops/s", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p90 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    table.add_column("峰值内存", justify="right")
+
+    for r in results:
+        table.add_row(
+            # 用例名中的 [short,bs4] 等不能当作 rich 标记
+            escape(r.name),
+            f"{r.page_bytes / 1024:.0f} KiB",
+            f"{r.ops_per_sec:.1f}",
+            f"{r.p50_ms:.2f}",
+            f"{r.p90_ms:.2f}",
+            f"{r.p99_ms:.2f}",
+            f"{r.peak_kib / 1024:.1f} MiB",
+        )
+
+    # 输出到文件或管道时按 80 列排版会折行，至少按 120 列输出
+    console = Console()
+    if console.width < 120:
+        console = Console(width=120)
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="页面解析基准测试")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="语料目录（默认 corpus/v2）")
+    parser.add_argument("-n", "--runs", type=int, default=50, help="每个用例计时次数（默认 50）")
+    parser.add_argument("--warmup", type=int, default=3, help="每个用例预热次数（默认 3）")
+    parser.add_argument("-k", "--filter", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    if not (args.corpus / "manifest.json").exists():
+        raise SystemExit(f"找不到语料 {args.corpus}，请先运行 benchmarks/make_corpus.py")
+    pages = load_corpus(args.corpus)
+
+    with tempfile.TemporaryDirectory(prefix="s1cli-bench-") as config_dir:
+        client = make_client(config_dir, pages)
+        try:
+            results = [
+                run_case(name, len(pages[page]), func, args.runs, args.warmup)
+                for name, (page, func) in build_cases(client, pages).items()
+                if args.filter in name
+            ]
+        finally:
+            client.close()
+
+    if args.json:
+        print(json.dumps(
+            {"corpus": args.corpus.name, "results": [asdict(r) for r in results]},
+            ensure_ascii=False,
+            indent=2,
+        ))
+    else:
+        print_table(results, args.corpus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""启动耗时基准测试
+
+s1cli 经常在 shell 提示符和脚本中被调用，--help、logout 这类命令不应该为
+rich、httpx、bs4/lxml、textual、toml 付出导入时间。本测试在子进程中运行这些命令：
+
+- 用 ``python -X importtime`` 统计解释器启动之后（site 之后）的导入耗时
+- 检查导入的模块中有没有上面的重型依赖
+- 测量整个进程的耗时，并减去 ``python -c pass`` 的基线
+
+导入耗时超出预算（--budget，默认 60 ms）或导入了重型依赖时以状态码 1 退出，
+可以放在 CI 里防止入口重新变慢。
+
+用法：
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py -n 20 --budget 40
+    python benchmarks/bench_startup.py --json > result.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 这些命令都不需要访问网络，也不需要 rich 之类的依赖
+CASES: Dict[str, List[str]] = {
+    "--help": ["--help"],
+    "--version": ["--version"],
+    "list --help": ["list", "--help"],
+    "tui --help": ["tui", "--help"],
+    "logout": ["logout"],
+}
+
+# 启动路径上不允许出现的模块（包括其子模块）
+HEAVY_MODULES = ("rich", "httpx", "bs4", "lxml", "textual", "toml")
+
+DEFAULT_BUDGET_MS = 60.0
+
+
+@dataclass
+class StartupResult:
+    """单个命令的测试结果"""
+    name: str
+    runs: int
+    import_ms: float  # site 之后的导入耗时（中位数）
+    wall_ms: float  # 进程耗时（中位数）
+    overhead_ms: float  # 减去 python -c pass 基线之后的进程耗时
+    heavy: List[str] = field(default_factory=list)  # 导入了的重型依赖
+
+
+def parse_importtime(stderr: str) -> Tuple[float, List[str]]:
+    """解析 -X importtime 的输出
+
+    Args:
+        stderr: 子进程的标准错误输出
+
+    Returns:
+        (site 之后顶层导入的累计耗时（毫秒）, 导入的模块名列表)
+    """
+    total_us = 0
+    modules = []
+    after_site = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # 表头
+        name = parts[2].rstrip()
+        module = name.strip()
+        modules.append(module)
+        # 顶层导入：模块名前只有一个空格
+        if name.startswith("  "):
+            continue
+        if after_site:
+            total_us += int(parts[1])
+        elif module == "site":
+            after_site = True
+    return total_us / 1000, modules
+
+
+def run_command(args: List[str], env: Dict[str, str], importtime: bool) -> Tuple[float, str]:
+    """在子进程中运行 s1cli
+
+    Returns:
+        (进程耗时（秒）, 标准错误输出)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-m", "s1cli", *args]
+
+    started = time.perf_counter()
+    proc = subprocess.run(command, env=env, capture_output=True, text=True, encoding="utf-8")
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise SystemExit(f"s1cli {' '.join(args)} 退出码 {proc.returncode}：\n{proc.stderr[-2000:]}")
+    return elapsed, proc.stderr
+
+
+def baseline(runs: int, env: Dict[str, str]) -> float:
+    """python -c pass 的进程耗时中位数（秒）"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run_case(name: str, args: List[str], runs: int, env: Dict[str, str], base: float) -> StartupResult:
+    """运行单个用例（先预热一次，生成字节码缓存）"""
+    run_command(args, env, importtime=False)
+
+    import_samples = []
+    heavy = set()
+    for _ in range(runs):
+        _, stderr = run_command(args, env, importtime=True)
+        import_ms, modules = parse_importtime(stderr)
+        import_samples.append(import_ms)
+        heavy.update(m.split(".")[0] for m in modules if m.split(".")[0] in HEAVY_MODULES)
+
+    wall_samples = [run_command(args, env, importtime=False)[0] for _ in range(runs)]
+    wall = statistics.median(wall_samples)
+
+    return StartupResult(
+        name=name,
+        runs=runs,
+        import_ms=statistics.median(import_samples),
+        wall_ms=wall * 1000,
+        overhead_ms=max(wall - base, 0.0) * 1000,
+        heavy=sorted(heavy),
+    )
+
+
+def print_table(results: List[StartupResult], base: float, budget: float) -> None:
+    """输出结果表格"""
+    print(f"启动耗时基准（python -c pass 基线 {base * 1000:.1f} ms，导入预算 {budget:.0f} ms）")
+    print(f"{'命令':<16}{'导入 (ms)':>12}{'进程 (ms)':>12}{'减基线 (ms)':>14}  重型依赖")
+    for r in results:
+        status = ", ".join(r.heavy) if r.heavy else "-"
+        over = " ✗ 超出预算" if r.import_ms > budget else ""
+        print(f"{r.name:<16}{r.import_ms:>12.1f}{r.wall_ms:>12.1f}{r.overhead_ms:>14.1f}  {status}{over}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="每个命令运行次数（默认 10）")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"导入耗时预算（毫秒，默认 {DEFAULT_BUDGET_MS:.0f}）")
+    parser.add_argument("-k", "--filter", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="s1cli-bench-") as home:
+        # 使用临时主目录，logout 等命令不会改动真实的配置
+        env = dict(os.environ, HOME=home, USERPROFILE=home, PYTHONIOENCODING="utf-8")
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+
+        base = baseline(args.runs, env)
+        results = [
+            run_case(name, case_args, args.runs, env, base)
+            for name, case_args in CASES.items()
+            if args.filter in name
+        ]
+
+    if args.json:
+        print(json.dumps(
+            {"baseline_ms": base * 1000, "budget_ms": args.budget, "results": [asdict(r) for r in results]},
+            ensure_ascii=False,
+            indent=2,
+        ))
+    else:
+        print_table(results, base, args.budget)
+
+    if any(r.heavy or r.import_ms > args.budget for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""生成解析基准测试使用的页面语料
+
+语料按 Discuz! X3（Stage1st 使用的模板）的页面结构构造，所有用户名、标题、
+正文都是虚构内容，不包含任何真实账号信息。生成过程使用固定随机种子，
+同一版本的语料每次生成的结果完全相同。
+
+页面结构或内容有变化时不要覆盖已有版本，而是新建 corpus/v<N+1>/，
+并在基准测试时用 --corpus 指定，保证新旧结果可以对比。
+
+用法：
+    python benchmarks/make_corpus.py --version 2   # 生成 corpus/v2
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+
+CORPUS_ROOT = Path(__file__).parent / "corpus"
+
+HEAD = '''<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8" />
+<title>{title} - Stage1st - stage1/s1 游戏动漫论坛</title>
+<link rel="stylesheet" type="text/css" href="data/cache/style_6_common.css?x" />
+<script type="text/javascript">var STYLEID = '6', STATICURL = 'static/', IMGDIR = 'static/image/common', VERHASH = 'abc', charset = 'utf-8', discuz_uid = '100001', cookiepre = 'B7_', formhash = '0123abcd';</script>
+<script src="data/cache/common.js?x" type="text/javascript"></script>
+<style type="text/css">.fl_tb td {{ padding: 4px; }}</style>
+</head>
+<body id="nv_forum" class="{body_class}" onkeydown="if(event.keyCode==27) return false;">
+<div id="append_parent"></div><div id="ajaxwaitid"></div>
+<div id="toptb" class="cl"><div class="wp"><div class="z">{toplinks}</div>
+<div class="y"><div id="um"><p><strong class="vwmy"><a href="space-uid-100001.html" target="_blank" title="访问我的空间">测试用户</a></strong>
+<span class="pipe">|</span><a href="member.php?mod=logging&amp;action=logout&amp;formhash=0123abcd">退出</a></p></div></div></div></div>
+<div id="hd"><div class="wp"><div class="hdc cl"><h2><a href="./" title="Stage1st"><img src="static/image/common/logo.png" alt="Stage1st" border="0" /></a></h2></div>
+<div id="nv"><ul>{nav}</ul></div></div></div>
+<input type="hidden" name="formhash" value="0123abcd" />
+'''
+
+FOOT = '''<div id="ft" class="wp cl"><div id="flk" class="y"><p>{links}</p></div>
+<div id="frt"><p>Powered by <strong><a href="http://www.discuz.net" target="_blank">Discuz!</a></strong> <em>X3.4</em></p></div></div>
+<script type="text/javascript">_attachEvent(window, 'scroll', function () {{ showTopLink(); }});checkBlind();</script>
+</body></html>
+'''
+
+WORDS = (
+    "今天 明天 游戏 动画 漫画 主机 掌机 新作 发售 评测 剧情 角色 系统 画面 音乐 "
+    "玩法 难度 通关 收集 剧透 讨论 吐槽 推荐 感想 更新 补丁 联动 活动 抽卡 版本"
+).split()
+
+
+def words(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(WORDS) for _ in range(n))
+
+
+def page(title: str, body_class: str, content: str) -> str:
+    nav = "".join(f'<li><a href="forum-{i}-1.html" hidefocus="true">导航{i}</a></li>' for i in range(12))
+    toplinks = "".join(f'<a href="#">链接{i}</a>' for i in range(8))
+    links = "".join(f'<a href="#">页脚{i}</a><span class="pipe">|</span>' for i in range(10))
+    return (
+        HEAD.format(title=title, body_class=body_class, nav=nav, toplinks=toplinks)
+        + content
+        + FOOT.format(links=links)
+    )
+
+
+# ---------------------------------------------------------------- 版块首页
+
+def forum_index(rng: random.Random) -> str:
+    groups = []
+    fid = 4
+    for gid, group_name in enumerate(["主论坛", "子论坛", "专楼"], start=1):
+        rows = []
+        for _ in range(8):
+            subforums = "".join(
+                f'<a href="forum-{fid * 10 + k}-1.html">子版块{fid}-{k}</a> '
+                for k in range(rng.choice([0, 0, 2, 3]))
+            )
+            threads = rng.randint(100, 300000)
+            posts = threads * rng.randint(5, 40)
+            stats = (
+                (f"{threads // 10000}万" if threads >= 10000 else str(threads))
+                + " / "
+                + (f"{posts // 10000}万" if posts >= 10000 else str(posts))
+            )
+            rows.append(f'''<tr>
+<td class="fl_icn"><a href="forum-{fid}-1.html"><img src="data/attachment/common/icon_{fid}.png" align="left" alt="" /></a></td>
+<td><h2><a href="forum-{fid}-1.html" style="color: #336699;">版块{fid}</a><em class="xw0 xi1" title="今日"> ({rng.randint(0, 3000)})</em></h2>
+<p class="xg2">{words(rng, 10)}</p>
+{'<p>子版块: ' + subforums + '</p>' if subforums else ''}
+<p>版主: <span class="xi2"><a href="home.php?mod=space&amp;username=mod{fid}" class="notabs" c="1">版主{fid}</a></span></p></td>
+<td class="fl_i"><span class="xi2">{stats}</span></td>
+<td class="fl_by"><div><a href="forum.php?mod=redirect&amp;tid={rng.randint(1, 9) * 100000}&amp;goto=lastpost#lastpost" class="xi2">{words(rng, 4)}</a>
+<cite>2025-10-28 10:{rng.randint(10, 59)} <a href="home.php?mod=space&amp;username=u{fid}">用户{fid}</a></cite></div></td>
+</tr>''')
+            fid += 1
+        groups.append(f'''<div class="bm bmw flg cl"><div class="bm_h cl"><span class="o"><img id="category_{gid}_img" src="static/image/common/collapsed_no.gif" /></span>
+<h2><a href="forum.php?gid={gid}" style="">{group_name}</a></h2></div>
+<div id="category_{gid}" class="bm_c"><table cellspacing="0" cellpadding="0" class="fl_tb">
+{''.join(rows)}
+<tr class="fl_row"><td class="fl_g" colspan="4"></td></tr></table></div></div>''')
+
+    content = f'''<div id="wp" class="wp"><div id="pt" class="bm cl"><div class="z"><a href="./" class="nvhm">Stage1st</a></div></div>
+<div id="ct" class="wp cl"><div class="mn">{''.join(groups)}</div></div></div>'''
+    return page("论坛", "pg_index", content)
+
+
+# ---------------------------------------------------------------- 帖子列表
+
+def forumdisplay(rng: random.Random, fid: int = 4, rows: int = 50) -> str:
+    def row(i: int) -> str:
+        tid = 2260000 + i
+        kind = rng.choice(["", "", "", "", "stk", "digest", "digest_icon", "sortnum"])
+        flag = {
+            "stk": '<a href="#" class="icn stk" title="置顶"></a>',
+            "digest": '<img src="static/image/common/digest_1.gif" align="absmiddle" alt="digest" title="精华 1" />',
+            "digest_icon": '<img class="icn dgt" src="static/image/common/digest.gif" />',
+        }.get(kind, "")
+        pages = "".join(f'<a href="thread-{tid}-{p}-1.html">{p}</a>' for p in range(2, rng.randint(2, 7)))
+        return f'''<tbody id="normalthread_{tid}"{' class="sortnum"' if kind == "sortnum" else ''}>
+<tr><td class="icn"><a href="thread-{tid}-1-1.html" title="有新回复 - 新窗口打开" target="_blank"><img src="static/image/common/folder_new.gif" /></a></td>
+<th class="new"><a href="javascript:;" id="content_{tid}" class="showcontent y" title="更多操作" onclick="CONTENT_TID='{tid}';CONTENT_ID='normalthread_{tid}';showMenu({{'ctrlid':this.id,'menuid':'content_menu'}})"></a>
+<em>[<a href="forum.php?mod=forumdisplay&amp;fid={fid}&amp;filter=typeid&amp;typeid={rng.randint(1, 9)}">分类{i % 7}</a>]</em>
+<a href="thread-{tid}-1-1.html" onclick="atarget(this)" class="s xst">{words(rng, rng.randint(3, 9))} &amp; {i}</a>{flag}
+{'<span class="tps">&nbsp;...' + pages + '</span>' if pages else ''}</th>
+<td class="by"><cite><a href="space-uid-{1000 + i}.html" c="1">作者{i}</a></cite><em><span>2025-10-{i % 28 + 1}</span></em></td>
+<td class="num"><a href="thread-{tid}-1-1.html" class="xi2">{rng.randint(0, 5000)}</a><em>{rng.randint(100, 900000)}</em></td>
+<td class="by"><cite><a href="space-username-r{i}.html" c="1">回复者{i}</a></cite><em><a href="forum.php?mod=redirect&amp;tid={tid}&amp;goto=lastpost#lastpost">2025-10-28 1{i % 10}:{i % 60:02d}</a></em></td>
+</tr></tbody>'''
+
+    sidebar = "".join(
+        f'<div class="bm"><div class="bm_h"><h2>侧栏{k}</h2></div><div class="bm_c">'
+        + "".join(f'<a href="thread-{k}{j}-1-1.html">{words(rng, 3)}</a><br />' for j in range(15))
+        + "</div></div>"
+        for k in range(6)
+    )
+    pagination = f'''<div class="pg"><strong>1</strong>{''.join(f'<a href="forum-{fid}-{p}-1.html">{p}</a>' for p in range(2, 11))}
+<a href="forum-{fid}-1234.html" class="last">... 1234</a><label><input type="text" name="custompage" class="px" size="2" title="输入页码，按回车快速跳转" value="1" /><span title="共 1234 页"> / 1234 页</span></label>
+<a href="forum-{fid}-2.html" class="nxt">下一页</a></div>'''
+    content = f'''<div id="wp" class="wp"><div id="pt" class="bm cl"><div class="z"><a href="./">Stage1st</a> <em>&rsaquo;</em> <a href="forum-{fid}-1.html">游戏论坛</a></div></div>
+<div class="boardnav"><div id="ct" class="wp cl"><div class="mn">
+<div class="bm bml pbn"><div class="bm_h cl"><h1 class="xs2"><a href="forum-{fid}-1.html">游戏论坛</a> <span class="xs1 xw0 i">今日: <strong class="xi1">2345</strong></span></h1></div>
+<div class="bm_c cl pbn"><div>{''.join('<p>' + words(rng, 20) + '</p>' for _ in range(15))}</div></div></div>
+<div id="pgt" class="bm bw0 pgs cl"><span id="fd_page_top">{pagination}</span>
+<a id="newspecial" href="forum.php?mod=post&amp;action=newthread&amp;fid={fid}" title="发新帖"><img src="static/image/common/pn_post.png" alt="发新帖" /></a></div>
+<div id="threadlist" class="tl bm bmw"><div class="bm_c"><form method="post" autocomplete="off" name="moderate" id="moderate" action="forum.php?mod=topicadmin">
+<input type="hidden" name="formhash" value="0123abcd" />
+<table summary="forum_{fid}" cellspacing="0" cellpadding="0" id="threadlisttableid">
+<tbody><tr><th colspan="2"><div class="tf">主题</div></th><td class="by">作者</td><td class="num">回复/查看</td><td class="by">最后发表</td></tr></tbody>
+<tbody id="stickthread_100"><tr><td class="icn"><img src="static/image/common/pin_3.gif" /></td><th class="common"><a href="thread-100-1-1.html" class="s xst">版规公告</a></th></tr></tbody>
+<tbody id="separatorline" class="emptb"><tr><td class="icn"></td><th class="common">版块主题</th><td class="by"></td><td class="num"></td><td class="by"></td></tr></tbody>
+{''.join(row(i) for i in range(rows))}
+</table></form></div></div>
+<div class="bm bw0 pgs cl"><span id="fd_page_bottom">{pagination}</span></div>
+</div><div class="sd">{sidebar}</div></div></div></div>'''
+    return page("游戏论坛", "pg_forumdisplay", content)
+
+
+# ---------------------------------------------------------------- 帖子内容
+
+def _quote(rng: random.Random, depth: int) -> str:
+    inner = _quote(rng, depth - 1) if depth > 1 else ""
+    return f'''<div class="quote"><blockquote><font size="2"><a href="forum.php?mod=redirect&amp;goto=findpost&amp;pid={rng.randint(1, 9999999)}&amp;ptid=1" target="_blank"><font color="#999999">用户{rng.randint(1, 999)} 发表于 2025-10-2{rng.randint(0, 8)} 1{rng.randint(0, 9)}:{rng.randint(10, 59)}</font></a></font><br />
+{inner}{words(rng, 12)} https://quoted.example.com/{rng.randint(1, 99)}</blockquote></div>'''
+
+
+def _message(rng: random.Random, quotes: float) -> str:
+    parts = []
+    if rng.random() < quotes:
+        parts.append(_quote(rng, rng.choice([1, 1, 2, 3])) + "<br />")
+    for _ in range(rng.randint(1, 6)):
+        piece = rng.random()
+        if piece < 0.15:
+            parts.append(f'<a href="https://www.bilibili.com/video/BV{rng.randint(10**9, 10**10)}" target="_blank">https://www.bilibili.com/video/BV{rng.randint(10**5, 10**6)}...</a>')
+        elif piece < 0.25:
+            parts.append(f'纯文本链接 http://example.org/path?id={rng.randint(1, 99)}&amp;p=2​ ')
+        elif piece < 0.35:
+            parts.append(f'<img id="aimg_{rng.randint(1, 10**6)}" class="zoom" src="https://img.example.com/{rng.randint(1, 10**6)}.jpg" onmouseover="img_onmouseoverfunc(this)" lazyloadthumb="1" border="0" alt="" />')
+        elif piece < 0.45:
+            parts.append('<img src="static/image/smiley/face2017/001.png" smilieid="1" border="0" alt="" />')
+        elif piece < 0.55:
+            parts.append(f'<strong>{words(rng, 3)}</strong> <font color="Red">{words(rng, 2)}</font>')
+        elif piece < 0.6:
+            parts.append(f'<font class="jammer">{rng.randint(1000, 9999)}</font>')
+        else:
+            parts.append(words(rng, rng.randint(5, 40)))
+        parts.append("<br />\r\n")
+    if rng.random() < 0.2:
+        parts.append('<i class="pstatus"> 本帖最后由 用户 于 2025-10-28 10:00 编辑 </i>')
+    return "".join(parts)
+
+
+def _post(rng: random.Random, tid: int, pid: int, floor: int, quotes: float) -> str:
+    if floor == 1:
+        floor_link = f'<a href="forum.php?mod=redirect&amp;ptid={tid}&amp;authorid=0" id="postnum{pid}" onclick="setCopy(this.href, \'帖子地址复制成功\');return false;"><strong>楼主</strong></a>'
+    else:
+        label = {2: "沙发", 3: "板凳", 4: "地板"}.get(floor) if rng.random() < 0.5 else None
+        floor_link = f'<a href="forum.php?mod=redirect&amp;goto=findpost&amp;ptid={tid}&amp;pid={pid}" id="postnum{pid}" onclick="setCopy(this.href, \'帖子地址复制成功\');return false;"><em>{label or floor}</em><sup>#</sup></a>'
+    uid = rng.randint(1, 500000)
+    sign = f'<div class="sign" style="max-height:100px;maxHeightIE:100px;" id="sign_{pid}">{words(rng, 6)}</div>' if rng.random() < 0.3 else ""
+    return f'''<div id="post_{pid}" ><table id="pid{pid}" class="plhin" summary="pid{pid}" cellspacing="0" cellpadding="0">
+<tr><td class="pls" rowspan="2"><div id="favatar{pid}" class="pls favatar"><div class="pi"><div class="authi"><a href="space-uid-{uid}.html" target="_blank" class="xw1">用户{uid}</a></div></div>
+<div><div class="avatar" onmouseover="showauthor(this, 'userinfo{pid}')"><a href="space-uid-{uid}.html" class="avtm" target="_blank"><img src="https://avatar.example.com/{uid}.jpg" /></a></div></div>
+<div class="tns xg2"><table cellspacing="0" cellpadding="0"><th><p><a href="home.php?mod=space&amp;uid={uid}&amp;do=thread&amp;type=thread&amp;view=me&amp;from=space" class="xi2">{rng.randint(0, 999)}</a></p>主题</th><th><p>{rng.randint(0, 99999)}</p>帖子</th><td><p>{rng.randint(0, 99999)}</p>战斗力</td></table></div></div></td>
+<td class="plc"><div class="pi"><strong>{floor_link}</strong>
+<div class="pti"><div class="pdbt"></div><div class="authi"><img class="authicn vm" id="authicon{pid}" src="static/image/common/online_member.gif" />
+<em id="authorposton{pid}">发表于 2025-{floor % 12 + 1}-{floor % 28 + 1} {floor % 24:02d}:{floor % 60:02d}</em>
+<span class="pipe">|</span><a href="forum.php?mod=viewthread&amp;tid={tid}&amp;page=1&amp;authorid={uid}" rel="nofollow">只看该作者</a></div></div></div>
+<div class="pct"><style type="text/css">.pcb{{margin-right:0}}</style><div class="pcb">
+<div class="t_fsz"><table cellspacing="0" cellpadding="0"><tr><td class="t_f" id="postmessage_{pid}">
+{_message(rng, quotes)}</td></tr></table></div>
+<div id="comment_{pid}" class="cm"></div><div id="post_rate_div_{pid}"></div></div></div>
+</td></tr>
+<tr><td class="plc plm">{sign}</td></tr>
+<tr id="_postposition{pid}"></tr><tr><td class="pls"></td><td class="plc" style="overflow:visible;"><div class="po hin"><div class="pob cl"><em><a class="fastre" href="forum.php?mod=post&amp;action=reply&amp;fid=4&amp;tid={tid}&amp;repquote={pid}">回复</a></em></div></div></td></tr>
+</table></div>'''
+
+
+def thread(rng: random.Random, tid: int, page_no: int, total_pages: int, floors: int, quotes: float) -> str:
+    first_floor = (page_no - 1) * 30 + 1
+    posts = "\n".join(
+        _post(rng, tid, 50000000 + tid % 1000 * 1000 + first_floor + i, first_floor + i, quotes)
+        for i in range(floors)
+    )
+    pagination = (
+        f'<div class="pg"><strong>{page_no}</strong><a href="thread-{tid}-2-1.html">2</a>'
+        f'<label><input type="text" name="custompage" class="px" size="2" title="输入页码，按回车快速跳转" value="{page_no}" />'
+        f'<span title="共 {total_pages} 页"> / {total_pages} 页</span></label><a href="thread-{tid}-2-1.html" class="nxt">下一页</a></div>'
+        if total_pages > 1 else ""
+    )
+    content = f'''<div id="wp" class="wp"><div id="pt" class="bm cl"><div class="z"><a href="./">Stage1st</a> <em>&rsaquo;</em> <a href="forum-4-1.html">游戏论坛</a></div></div>
+<div id="ct" class="wp cl"><div id="pgt" class="pgs mbm cl "><div class="pgt">{pagination}</div>
+<span class="y pgb"><a href="forum-4-1.html">返回列表</a></span></div>
+<div id="postlist" class="pl bm"><table cellspacing="0" cellpadding="0"><tr>
+<td class="pls ptn pbn"><div class="hm ptn"><span class="xg1">查看:</span> <span class="xi1">{rng.randint(1000, 999999)}</span><span class="pipe">|</span><span class="xg1">回复:</span> <span class="xi1">{total_pages * 30 - 1}</span></div></td>
+<td class="plc ptm pbn vwthd"><h1 class="ts"><a href="forum.php?mod=forumdisplay&amp;fid=4&amp;filter=typeid&amp;typeid=1">[讨论]</a>
+<span id="thread_subject">{words(rng, 6)} &lt;{tid}&gt;</span></h1>
+<span class="xg1"><a href="thread-{tid}-1-1.html" onclick="return copyThreadUrl(this, 'Stage1st')">[复制链接]</a></span></td></tr></table>
+<table cellspacing="0" cellpadding="0" class="ad"><tr><td class="pls"></td><td class="plc"></td></tr></table>
+{posts}
+<div id="postlistreply" class="pl"><div id="post_new" class="viewthread_table" style="display: none"></div></div>
+</div>
+<div class="pgs mtm mbm cl">{pagination}</div></div></div>'''
+    return page(f"主题 {tid}", "pg_viewthread", content)
+
+
+# ---------------------------------------------------------------- 搜索、个人资料
+
+def search(rng: random.Random, results: int = 40) -> str:
+    items = "".join(f'''<li class="pbw" id="{3000000 + i}">
+<h3 class="xs3"><a href="forum.php?mod=viewthread&amp;tid={3000000 + i}&amp;highlight=%E6%B5%8B%E8%AF%95" target="_blank" class="xst">{words(rng, 3)}<strong><font color="#ff0000">测试</font></strong>{words(rng, 2)}</a></h3>
+<p class="xg1">{rng.randint(0, 999)} 个回复 - {rng.randint(100, 99999)} 次查看</p>
+<p>{words(rng, 25)}</p>
+<p><span>2025-10-{i % 28 + 1} 1{i % 10}:00</span> - <span><a href="space-uid-{i}.html" target="_blank">用户{i}</a></span> -
+<span><a href="forum-{4 + i % 5}-1.html" target="_blank" class="xi1">版块{4 + i % 5}</a></span></p></li>''' for i in range(results))
+    content = f'''<div id="ct" class="cl w"><div class="mw"><div class="tl"><div class="sttl mbn"><h2>结果: <em>找到 “<span class="emfont">测试</span>” 相关内容 {results} 个</em></h2></div>
+<div class="slst mtw" id="threadlist"><ul>{items}</ul></div>
+<div class="pgs cl mbm"><div class="pg"><strong>1</strong><a href="search.php?mod=forum&amp;searchid=123&amp;orderby=lastpost&amp;ascdesc=desc&amp;searchsubmit=yes&amp;page=2">2</a></div></div></div></div></div>'''
+    return page("搜索", "pg_search", content)
+
+
+def profile(rng: random.Random) -> str:
+    fields = "".join(f'<li><em>字段{i}</em>{words(rng, 3)}</li>' for i in range(20))
+    content = f'''<div id="ct" class="ct2 wp cl"><div class="mn"><div class="bm bw0"><div class="bm_c u_profile">
+<div class="pbm mbm bbda cl"><h2 class="mbn">测试用户 <span class="xw0">(UID: 100001)</span></h2><ul class="pf_l cl pbm mbm">{fields}</ul></div>
+<div class="pbm mbm bbda cl"><h2 class="mbn">活跃概况</h2><ul id="pbbs" class="pf_l"><li><em>在线时间</em>{rng.randint(100, 9999)} 小时</li><li><em>注册时间</em>2015-1-1 10:00</li></ul></div>
+<div id="psts" class="cl"><ul class="pf_l"><li><em>积分</em>{rng.randint(100, 99999)}</li><li><em>战斗力</em>{rng.randint(1, 999)} 鹅</li></ul></div>
+</div></div></div></div>'''
+    return page("测试用户的个人资料", "pg_space", content)
+
+
+# ---------------------------------------------------------------- 移动端接口（v2 起）
+
+def _mobile(variables: dict) -> str:
+    """套上移动端接口的外层结构"""
+    common = {
+        "cookiepre": "B7_",
+        "auth": None,
+        "saltkey": "abcd1234",
+        "member_uid": "100001",
+        "member_username": "测试用户",
+        "member_avatar": "https://avatar.example.com/100001.jpg",
+        "groupid": "10",
+        "formhash": "0123abcd",
+        "ismoderator": None,
+        "readaccess": "10",
+        "notice": {"newpush": "0", "newpm": "0", "newprompt": "0", "newmypost": "0"},
+    }
+    payload = {"Version": "4", "Charset": "UTF-8", "Variables": {**common, **variables}}
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def mobile_forumindex(rng: random.Random) -> str:
+    forums = []
+    for fid in range(4, 28):
+        threads = rng.randint(100, 300000)
+        forums.append({
+            "fid": str(fid),
+            "name": f"版块{fid}",
+            "threads": str(threads),
+            "posts": str(threads * rng.randint(5, 40)),
+            "todayposts": str(rng.randint(0, 3000)),
+            "description": words(rng, 10),
+            "icon": f"https://img.example.com/forum/{fid}.png",
+            "sublist": [
+                {"fid": str(fid * 10 + k), "name": f"子版块{fid}-{k}", "threads": str(rng.randint(10, 999)),
+                 "posts": str(rng.randint(100, 9999)), "todayposts": str(rng.randint(0, 99))}
+                for k in range(rng.choice([0, 0, 2, 3]))
+            ],
+        })
+    catlist = [
+        {"fid": str(gid), "name": name, "forums": [f["fid"] for f in forums[(gid - 1) * 8:gid * 8]]}
+        for gid, name in enumerate(["主论坛", "子论坛", "专楼"], start=1)
+    ]
+    return _mobile({"member_email": "", "catlist": catlist, "forumlist": forums})
+
+
+def mobile_forumdisplay(rng: random.Random, fid: int = 4, rows: int = 50) -> str:
+    threads = []
+    for i in range(rows):
+        kind = rng.choice(["", "", "", "", "stk", "digest"])
+        threads.append({
+            "tid": str(2260000 + i),
+            "typeid": str(rng.randint(1, 9)),
+            "readperm": "0",
+            "price": "0",
+            "author": f"作者{i}",
+            "authorid": str(1000 + i),
+            "subject": f"{words(rng, rng.randint(3, 9))} &amp; {i}",
+            "dateline": f'<span title="2025-10-{i % 28 + 1} 10:00">{rng.randint(1, 9)} 天前</span>',
+            "lastpost": f"2025-10-28 1{i % 10}:{i % 60:02d}",
+            "lastposter": f"回复者{i}",
+            "views": str(rng.randint(100, 900000)),
+            "replies": str(rng.randint(0, 5000)),
+            "displayorder": "1" if kind == "stk" else "0",
+            "digest": "1" if kind == "digest" else "0",
+            "special": "0",
+            "attachment": str(rng.choice([0, 0, 2])),
+            "recommend_add": "0",
+            "replycredit": "0",
+            "dbdateline": str(1760000000 + i * 3600),
+            "dblastpost": str(1761600000 + i * 60),
+            "rushreply": "0",
+            "closed": "0",
+        })
+    forum = {"fid": str(fid), "fup": "1", "name": "游戏论坛", "threads": "61700", "posts": "8610000",
+             "rules": words(rng, 40), "autoclose": "0", "password": "0", "icon": ""}
+    return _mobile({"forum": forum, "group": {"groupid": "10", "grouptitle": "用户"},
+                    "forum_threadlist": threads, "sublist": [], "tpp": "50", "page": 1})
+
+
+def mobile_viewthread(rng: random.Random, tid: int, page_no: int, total_pages: int, floors: int, quotes: float) -> str:
+    first_floor = (page_no - 1) * 30 + 1
+    posts = []
+    for i in range(floors):
+        floor = first_floor + i
+        uid = rng.randint(1, 500000)
+        posts.append({
+            "pid": str(50000000 + tid % 1000 * 1000 + floor),
+            "tid": str(tid),
+            "first": "1" if floor == 1 else "0",
+            "author": f"用户{uid}",
+            "authorid": str(uid),
+            "dateline": f"2025-{floor % 12 + 1}-{floor % 28 + 1} {floor % 24:02d}:{floor % 60:02d}",
+            "message": _message(rng, quotes),
+            "anonymous": "0",
+            "attachment": "0",
+            "status": "0",
+            "replycredit": "0",
+            "position": str(floor),
+            "username": f"用户{uid}",
+            "adminid": "0",
+            "groupid": "10",
+            "memberstatus": "0",
+            "number": str(floor),
+            "dbdateline": str(1760000000 + floor * 60),
+        })
+    info = {"tid": str(tid), "fid": "4", "posttableid": "0", "typeid": "1", "author": posts[0]["author"] if page_no == 1 else "楼主",
+            "authorid": "1", "subject": f"{words(rng, 6)} &lt;{tid}&gt;", "dateline": "1760000000",
+            "lastpost": "1761600000", "lastposter": "回复者", "views": str(rng.randint(1000, 999999)),
+            "replies": str(total_pages * 30 - 1), "displayorder": "0", "digest": "0", "closed": "0"}
+    return _mobile({"thread": info, "fid": "4", "postlist": posts, "allowpostcomment": None,
+                    "comments": [], "commentcount": [], "ppp": "30", "setting_rewriterule": None,
+                    "forum_threadpay": "", "cache_custominfo_postno": ["楼主", "沙发", "板凳", "地板"]})
+
+
+def build(version: int):
+    """生成指定版本的语料及清单"""
+    out = CORPUS_ROOT / f"v{version}"
+    out.mkdir(parents=True, exist_ok=True)
+
+    rng = random.Random(version)
+    pages = {
+        "forum_index.html": ("forum.php?gid=1", "版块首页，3 个分区共 24 个版块", forum_index(rng)),
+        "forumdisplay.html": ("forum.php?mod=forumdisplay&fid=4&page=1", "版块帖子列表，50 行，含置顶/精华标记", forumdisplay(rng)),
+        "thread_short.html": ("thread-2000001-1-1.html", "短帖，单页 5 楼", thread(rng, 2000001, 1, 1, 5, quotes=0.1)),
+        "thread_long.html": ("thread-2000002-1-1.html", "长帖第 1 页，30 楼（共 10 页）", thread(rng, 2000002, 1, 10, 30, quotes=0.3)),
+        "thread_quotes.html": ("thread-2000003-2-1.html", "引用密集的帖子第 2 页，30 楼，多层嵌套引用", thread(rng, 2000003, 2, 5, 30, quotes=0.9)),
+        "search.html": ("search.php?mod=forum&searchid=123&orderby=lastpost&ascdesc=desc&searchsubmit=yes", "搜索结果，40 条", search(rng)),
+        "profile.html": ("home.php?mod=space&do=profile", "个人资料页（已登录）", profile(rng)),
+    }
+    if version >= 2:
+        # 单独的随机数序列，不影响上面的 HTML 页面
+        mrng = random.Random(f"mobile-{version}")
+        api = "api/mobile/index.php?version=4&module="
+        pages.update({
+            "mobile_forumindex.json": (api + "forumindex", "移动端接口版块列表，24 个版块", mobile_forumindex(mrng)),
+            "mobile_forumdisplay.json": (api + "forumdisplay&fid=4&page=1", "移动端接口帖子列表，50 行", mobile_forumdisplay(mrng)),
+            "mobile_viewthread_short.json": (api + "viewthread&tid=2000001&page=1", "移动端接口短帖，5 楼", mobile_viewthread(mrng, 2000001, 1, 1, 5, quotes=0.1)),
+            "mobile_viewthread_long.json": (api + "viewthread&tid=2000002&page=1", "移动端接口长帖第 1 页，30 楼", mobile_viewthread(mrng, 2000002, 1, 10, 30, quotes=0.3)),
+            "mobile_viewthread_quotes.json": (api + "viewthread&tid=2000003&page=2", "移动端接口引用密集的帖子第 2 页，30 楼", mobile_viewthread(mrng, 2000003, 2, 5, 30, quotes=0.9)),
+        })
+
+    manifest = {"version": version, "pages": {}}
+    for name, (url, description, html) in pages.items():
+        (out / name).write_text(html, encoding="utf-8")
+        manifest["pages"][name] = {"url": url, "description": description, "bytes": len(html.encode("utf-8"))}
+
+    (out / "manifest.json").write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+    )
+    print(f"已生成 {out}（{len(pages)} 个文件）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成解析基准测试语料")
+    parser.add_argument("--version", type=int, default=2, help="语料版本号（默认 2）")
+    args = parser.parse_args()
+    build(args.version)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,9 @@
 """S1CLI 主入口"""
 import sys
 import os
-import click
-from rich.console import Console
+from contextlib import contextmanager, redirect_stdout
 
-from s1cli.config import Config
+import click
 
 # 设置 Windows 环境下的 UTF-8 编码
 if sys.platform == 'win32':
@@ -25,13 +24,34 @@ if sys.platform == 'win32':
         sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
         sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-console = Console()
+
+class _LazyConsole:
+    """第一次输出时才创建 rich Console
+    
+    导入 rich 要几十毫秒，--help 等不输出内容的路径不需要它。
+    """
+    
+    def __init__(self):
+        self._console = None
+    
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
 
 
 @click.group(invoke_without_command=True)
 @click.pass_context
 @click.version_option(version="0.1.1")
-def cli(ctx):
+@click.option('--no-cache', is_flag=True, help='不读写本地响应缓存')
+@click.option('--refresh', is_flag=True, help='忽略缓存强制从网络获取（并更新缓存）')
+@click.option('--timings', is_flag=True, help='结束时输出各请求和解析阶段的耗时')
+@click.option('--offline', is_flag=True, help='离线模式：只显示本地保存的内容，不访问网络')
+def cli(ctx, no_cache, refresh, timings, offline):
     """S1CLI - Stage1st 论坛命令行工具
     
     一个功能完整的 Stage1st 论坛命令行客户端。
@@ -59,6 +79,30 @@ def cli(ctx):
     # 查看帖子的第2页回复
     s1cli thread 2265995 -p 2
     
+    \b
+    # 查看第3到10页，或全部页面
+    s1cli thread 2265995 -p 3-10
+    s1cli thread 2265995 --all
+    
+    \b
+    # 每行输出一个 JSON 对象（帖子、楼层或搜索结果），边获取边输出
+    s1cli thread 2265995 --all --format ndjson | jq -r .content
+    s1cli list 4 -p 1-5 --format ndjson
+    
+    \b
+    # 批量执行多条命令（每行一条），复用同一个连接，结果按 NDJSON 输出
+    printf 'thread 2265995 -p 2\\nlist 4\\nsearch 塞尔达\\n' | s1cli batch
+    
+    \b
+    # 只获取关注帖子的新回复（不带 ID 时同步所有同步过的帖子）
+    s1cli sync 2265995
+    s1cli sync -f 4
+    
+    \b
+    # 把整个帖子归档为 JSONL/HTML/Markdown 文件，中断后可继续
+    s1cli archive 2265995 -f html
+    s1cli archive 2265995 -f html --resume
+    
     \b
     # 登录账号
     s1cli login
@@ -79,6 +123,10 @@ def cli(ctx):
     # 在指定版块内搜索
     s1cli search 塞尔达 -f 游戏论坛
     
+    \b
+    # 在本地保存过的帖子和回复中全文搜索（离线可用）
+    s1cli search 塞尔达 --local -a 作者名
+    
     \b
     # 每日签到打卡
     s1cli checkin
@@ -87,21 +135,160 @@ def cli(ctx):
     # 查看个人信息
     s1cli profile
     
+    \b
+    # 忽略缓存重新获取帖子
+    s1cli --refresh thread 2265995
+    
+    \b
+    # 查看请求和解析各阶段耗时
+    s1cli --timings thread 2265995
+    
+    \b
+    # 离线阅读本地保存过的内容（不访问网络）
+    s1cli --offline thread 2265995
+    
     \b
     使用 's1cli <命令> --help' 查看具体命令的详细说明
     """
+    ctx.ensure_object(dict)
+    if offline:
+        ctx.obj['cache_mode'] = 'offline'
+    elif no_cache:
+        ctx.obj['cache_mode'] = 'off'
+    elif refresh:
+        ctx.obj['cache_mode'] = 'refresh'
+    
+    if timings:
+        from s1cli.metrics import get_registry
+        get_registry().enable()
+        ctx.call_on_close(_print_timings)
+    
     if ctx.invoked_subcommand is None:
         # 不带参数时显示帮助信息
         click.echo(ctx.get_help())
 
 
+def _create_client(config):
+    """按全局命令行选项创建 HTTP 客户端
+    
+    Args:
+        config: 配置对象
+        
+    Returns:
+        S1Client 实例
+    """
+    from s1cli.api.client import S1Client
+    
+    ctx = click.get_current_context(silent=True)
+    options = (ctx.find_root().obj if ctx else None) or {}
+    return S1Client(config, cache_mode=options.get('cache_mode', 'normal'))
+
+
+@contextmanager
+def _ndjson_output():
+    """NDJSON 输出：每行一个紧凑的 JSON 对象，写完一行立即刷新
+    
+    期间 console 和 print 的输出（进度提示、警告）改写到 stderr，
+    标准输出中只有记录，可以直接交给 jq 等工具。
+    
+    Yields:
+        写出一条记录的函数
+    """
+    from s1cli.records import dumps
+    
+    stream = sys.stdout
+    
+    def emit(record):
+        stream.write(dumps(record) + "\n")
+        stream.flush()
+    
+    with redirect_stdout(sys.stderr):
+        yield emit
+
+
+def _write_ndjson(records):
+    """逐条输出记录，获取失败时报告错误并以状态码 1 退出
+    
+    Args:
+        records: 记录的迭代器（在 NDJSON 输出期间迭代）
+    """
+    from s1cli.api.exceptions import S1CLIException
+    
+    with _ndjson_output() as emit:
+        try:
+            for record in records:
+                emit(record)
+        except S1CLIException as e:
+            console.print(f"[bold red]✗ {e}[/bold red]")
+            sys.exit(1)
+
+
+def _print_timings():
+    """输出耗时统计（写到 stderr，不影响正常输出）"""
+    from rich.console import Console
+    from rich.table import Table
+    from s1cli.metrics import get_registry
+    
+    registry = get_registry()
+    err_console = Console(stderr=True)
+    ms = lambda seconds: f"{seconds * 1000:.1f}"
+    
+    if registry.requests:
+        table = Table(title="请求耗时 (ms)")
+        table.add_column("请求", style="cyan", overflow="fold")
+        table.add_column("状态", justify="right")
+        table.add_column("排队", justify="right")
+        table.add_column("连接", justify="right")
+        table.add_column("首字节", justify="right")
+        table.add_column("下载", justify="right")
+        table.add_column("合计", justify="right", style="bold")
+        table.add_column("大小", justify="right")
+        table.add_column("缓存", justify="center")
+        
+        for timing in registry.requests:
+            path = timing.url.split('://', 1)[-1]
+            path = path[path.find('/'):] if '/' in path else path
+            table.add_row(
+                f"{timing.method} {path}",
+                str(timing.status or '-'),
+                ms(timing.queued),
+                ms(timing.connect),
+                ms(timing.ttfb),
+                ms(timing.download),
+                ms(timing.total),
+                f"{timing.bytes / 1024:.1f}K",
+                "命中" if timing.cache_hit else "",
+            )
+        err_console.print(table)
+    
+    wall = registry.wall_time()
+    summary = Table(title="阶段汇总 (ms)")
+    summary.add_column("阶段", style="cyan")
+    summary.add_column("次数", justify="right")
+    summary.add_column("合计", justify="right", style="bold")
+    summary.add_column("平均", justify="right")
+    
+    # 并发请求时各阶段合计可能超过总耗时，余下部分按 0 计
+    network = sum(t.total for t in registry.requests)
+    summary.add_row("请求", str(len(registry.requests)), ms(network),
+                    ms(network / len(registry.requests)) if registry.requests else "-")
+    accounted = network
+    for name, phase in sorted(registry.phases.items()):
+        summary.add_row(name, str(phase.count), ms(phase.total), ms(phase.total / phase.count))
+        accounted += phase.total
+    summary.add_row("其他（渲染等）", "", ms(max(wall - accounted, 0.0)), "")
+    summary.add_row("总耗时", "", ms(wall), "", style="bold")
+    err_console.print(summary)
+
+
 @cli.command()
 def tui():
     """启动图形界面"""
     from s1cli.ui.app import S1App
     
     console.print("[bold green]正在启动 S1CLI...[/bold green]")
-    app = S1App()
+    options = click.get_current_context().find_root().obj or {}
+    app = S1App(cache_mode=options.get('cache_mode', 'normal'))
     app.run()
 
 
@@ -110,8 +297,8 @@ def tui():
 @click.option('--password', '-p', default=None, help='密码')
 def login(username, password):
     """登录 Stage1st 账号\n    -u 用户名\n    -p 密码"""
+    from s1cli.config import Config
     from s1cli.api.auth import AuthAPI
-    from s1cli.api.client import S1Client
     
     # 如果没有提供用户名，提示输入
     if not username:
@@ -124,7 +311,7 @@ def login(username, password):
     console.print(f"[cyan]正在登录用户：{username}[/cyan]")
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     auth = AuthAPI(client)
     
     try:
@@ -145,61 +332,75 @@ def logout():
     
     config = Config()
     config.clear_session()
-    console.print("[bold green]✓ 已登出[/bold green]")
+    click.secho("✓ 已登出", fg="green", bold=True)
 
 
 @cli.command()
 @click.argument('forum_id_or_name', required=False)
-@click.option('--page', '-p', default=1, help='页码（默认为第1页）')
+@click.option('--page', '-p', default='1', help='页码（默认为第1页；--format ndjson 时支持 1-5 这样的范围）')
 @click.option('--json', 'output_json', is_flag=True, help='以 JSON 格式输出')
-def list(forum_id_or_name, page, output_json):
-    """列出版块（带ID）或帖子\n    -p 页码\n    --json JSON格式"""
+@click.option('--format', 'output_format', type=click.Choice(['text', 'ndjson']), default='text',
+              help='输出格式：text（默认）或 ndjson（每行一个版块/帖子，边获取边输出）')
+def list(forum_id_or_name, page, output_json, output_format):
+    """列出版块（带ID）或帖子\n    -p 页码\n    --json JSON格式\n    --format ndjson 机器可读输出"""
+    from s1cli.config import Config
     from s1cli.api.forum import ForumAPI
-    from s1cli.api.client import S1Client
+    from s1cli.utils import format_age
     from rich.table import Table
     import json
+    import time
+    
+    start_page, end_page = _parse_page_range(page)
+    if end_page > start_page and output_format != 'ndjson':
+        console.print("[bold red]✗ 页码范围只能与 --format ndjson 一起使用[/bold red]")
+        sys.exit(1)
+    page = start_page
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     forum_api = ForumAPI(client)
     
+    if output_format == 'ndjson':
+        options = click.get_current_context().find_root().obj or {}
+        _write_ndjson(_list_records(
+            forum_api, forum_id_or_name, start_page, end_page,
+            refresh=options.get('cache_mode') == 'refresh'
+        ))
+        if not forum_id_or_name:
+            forum_api.forum_index.wait_for_refresh(5)
+        return
+    
     if forum_id_or_name:
         # 判断是版块ID还是版块名
         forum_name = None
         
         if forum_id_or_name.isdigit():
-            # 是版块ID，从缓存中查找对应的版块名
+            # 是版块ID，从本地存储中查找对应的版块名
             forum_id = forum_id_or_name
-            cached_forums = config.load_forum_list()
+            if forum_api.store is not None:
+                forum_name = forum_api.store.forum_name(forum_id)
             
-            if cached_forums:
-                # 在缓存中查找匹配的版块ID
-                for forum_data in cached_forums:
-                    if forum_data['id'] == forum_id:
-                        forum_name = forum_data['name']
-                        console.print(f"[cyan]正在加载版块：[ID:{forum_id}] {forum_name} (第{page}页)[/cyan]")
-                        break
-                
-                if not forum_name:
-                    # 缓存中没找到，直接用ID尝试
-                    forum_name = forum_id
-                    console.print(f"[cyan]正在加载版块 ID：{forum_id} (第{page}页)[/cyan]")
+            if forum_name:
+                console.print(f"[cyan]正在加载版块：[ID:{forum_id}] {forum_name} (第{page}页)[/cyan]")
             else:
-                # 没有缓存，直接用ID
+                # 没有保存过该版块，直接用ID
                 forum_name = forum_id
                 console.print(f"[cyan]正在加载版块 ID：{forum_id} (第{page}页)[/cyan]")
         else:
             # 是版块名称
             forum_name = forum_id_or_name
+            forum_id, _ = forum_api.forum_index.lookup(forum_name)
             console.print(f"[cyan]正在加载版块：{forum_name} (第{page}页)[/cyan]")
         
-        # 列出指定版块的帖子
-        threads = forum_api.get_thread_list(forum_name, page)
+        # 列出指定版块的帖子，离线或获取失败时显示本地存储中该页最近一次的内容
+        threads, total_pages = forum_api.load_thread_list(forum_id or forum_name, page)
+        if threads and threads[0].fetched_at is not None:
+            console.print(f"[yellow]显示的是本地保存的帖子列表（{format_age(threads[0].fetched_at)}获取）[/yellow]")
         
         if output_json:
             click.echo(json.dumps([t.__dict__ for t in threads], ensure_ascii=False, indent=2))
         else:
-            table = Table(title=f"{forum_name} - 第{page}页")
+            table = Table(title=f"{forum_name} - 第{page}/{total_pages}页")
             table.add_column("ID", style="cyan", no_wrap=True)
             table.add_column("标题", style="white")
             table.add_column("作者", style="green", no_wrap=True)
@@ -245,51 +446,161 @@ def list(forum_id_or_name, page, output_json):
             console.print(table)
             console.print("\n[dim]提示：使用 's1cli thread <ID>' 查看该帖子[/dim]")
     else:
-        # 列出所有版块
-        console.print("[cyan]正在加载版块列表...[/cyan]")
-        forums = forum_api.get_forum_list()
-        
-        # 保存到缓存
-        config.save_forum_list(forums)
+        # 列出所有版块：优先使用缓存的列表，过期时在后台刷新
+        options = click.get_current_context().find_root().obj or {}
+        forums, updated_at = forum_api.load_forum_list(refresh=options.get('cache_mode') == 'refresh')
         
         if output_json:
             click.echo(json.dumps([f.__dict__ for f in forums], ensure_ascii=False, indent=2))
         else:
             table = Table(title="Stage1st 论坛版块")
+            table.add_column("分区", style="magenta", no_wrap=True)
             table.add_column("ID", style="yellow", justify="right", no_wrap=True)
             table.add_column("版块名称", style="cyan", no_wrap=True)
             table.add_column("主题数", style="white", justify="right")
             table.add_column("帖子数", style="white", justify="right")
             table.add_column("新帖", style="bold red", justify="right")
             
-            for f in forums:
+            group = None
+            for index, f in enumerate(forums):
+                # 每个分区之间加分隔线，分区名称只在第一行显示
+                if index == 0 or f.group != group:
+                    if index > 0:
+                        table.add_section()
+                    group = f.group
+                    group_str = group or "-"
+                else:
+                    group_str = ""
+                
                 # 格式化主题数和帖子数
                 threads_str = f"{f.threads_count:,}" if f.threads_count > 0 else "-"
                 posts_str = f"{f.posts_count:,}" if f.posts_count > 0 else "-"
                 new_posts_str = f"[bold red]{f.new_posts}[/bold red]" if f.new_posts > 0 else "-"
                 
-                table.add_row(f.id, f.name, threads_str, posts_str, new_posts_str)
+                table.add_row(group_str, f.id, f.name, threads_str, posts_str, new_posts_str)
             
             console.print(table)
+            if updated_at is not None and client.offline:
+                console.print(f"[dim]离线模式，版块列表更新于 {format_age(updated_at)}[/dim]")
+            elif updated_at is not None and time.time() - updated_at >= forum_api.forum_index.ttl:
+                console.print(f"[dim]版块列表更新于 {format_age(updated_at)}，正在后台刷新[/dim]")
             console.print("\n[dim]提示：使用 's1cli list <ID>' 查看该版块的帖子列表[/dim]")
+        
+        # 后台刷新随进程退出而结束，输出后等它写完缓存，下次即可使用新列表
+        forum_api.forum_index.wait_for_refresh(5)
+
+
+def _list_records(forum_api, forum_id_or_name, start_page, end_page, refresh=False):
+    """版块列表或帖子列表的 NDJSON 记录
+    
+    帖子列表边下载边解析，每解析出一个帖子立即产出。翻页期间有新回复的帖子会移到前面的页，
+    超出总页数时论坛返回最后一页，所以按 ID 去重，某一页没有新的帖子时停止。
+    
+    Args:
+        forum_api: 论坛 API
+        forum_id_or_name: 版块 ID 或名称，None 时产出版块列表
+        start_page: 起始页码
+        end_page: 最后一页的页码
+        refresh: 版块列表不使用缓存，重新获取
+        
+    Yields:
+        版块记录或帖子记录
+        
+    Raises:
+        NetworkError: 网络故障或论坛服务器错误（已自动重试）
+        RateLimitError: 请求被论坛限制（已自动重试）
+    """
+    from s1cli.records import forum_record, thread_record
+    
+    if not forum_id_or_name:
+        forums, _ = forum_api.load_forum_list(refresh=refresh)
+        for forum in forums:
+            yield forum_record(forum)
+        return
+    
+    seen = set()
+    for page in range(start_page, end_page + 1):
+        count = 0
+        for thread in forum_api.iter_thread_list(forum_id_or_name, page):
+            if thread.id in seen:
+                continue
+            seen.add(thread.id)
+            yield thread_record(thread)
+            count += 1
+        if count == 0:
+            break
+
+
+def _parse_page_range(value: str):
+    """解析页码参数
+    
+    Args:
+        value: 形如 "3" 或 "3-10" 的页码字符串
+        
+    Returns:
+        (起始页, 结束页) 元组
+    """
+    try:
+        if '-' in value:
+            start, end = (int(part) for part in value.split('-', 1))
+        else:
+            start = end = int(value)
+    except ValueError:
+        raise click.BadParameter(f"无效的页码：{value}（示例：3 或 3-10）")
+    
+    if start < 1 or end < start:
+        raise click.BadParameter(f"无效的页码范围：{value}")
+    return start, end
 
 
 @cli.command()
 @click.argument('thread_id')
-@click.option('--page', '-p', default=1, help='页码')
-def thread(thread_id, page):
-    """查看帖子内容和回复\n    -p 页码"""
+@click.option('--page', '-p', default='1', help='页码或页码范围（如 3-10）')
+@click.option('--all', 'all_pages', is_flag=True, help='获取全部页面（与 -p N 一起使用时从第 N 页到最后一页）')
+@click.option('--format', 'output_format', type=click.Choice(['text', 'ndjson']), default='text',
+              help='输出格式：text（默认）或 ndjson（每行一个楼层，边获取边输出）')
+def thread(thread_id, page, all_pages, output_format):
+    """查看帖子内容和回复\n    -p 页码（支持 3-10）\n    --all 全部页面\n    --format ndjson 机器可读输出"""
+    from s1cli.config import Config
     from s1cli.api.thread import ThreadAPI
-    from s1cli.api.client import S1Client
+    from s1cli.utils import format_age
     from rich.panel import Panel
     from rich.rule import Rule
     
+    start_page, end_page = _parse_page_range(page)
+    
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     thread_api = ThreadAPI(client)
     
-    console.print(f"[cyan]正在加载帖子：{thread_id} (第{page}页)[/cyan]")
-    thread = thread_api.get_thread(thread_id, page)
+    if output_format == 'ndjson':
+        _write_ndjson(_thread_records(thread_api, thread_id, start_page, None if all_pages else end_page))
+        return
+    
+    if all_pages:
+        scope = f"第{start_page}页至最后一页" if start_page > 1 else "全部页面"
+        console.print(f"[cyan]正在加载帖子：{thread_id} ({scope})[/cyan]")
+        thread = thread_api.get_thread_pages(thread_id, 'all', start_page=start_page)
+    elif end_page > start_page:
+        console.print(f"[cyan]正在加载帖子：{thread_id} (第{start_page}-{end_page}页)[/cyan]")
+        thread = thread_api.get_thread_pages(thread_id, range(start_page, end_page + 1))
+    else:
+        console.print(f"[cyan]正在加载帖子：{thread_id} (第{start_page}页)[/cyan]")
+        # 离线或获取失败时显示本地存储中保存的该页内容
+        thread = thread_api.load_thread(thread_id, start_page)
+    
+    if thread is not None and thread.fetched_at is not None:
+        console.print(f"[yellow]显示的是本地保存的内容（{format_age(thread.fetched_at)}获取）[/yellow]")
+    
+    if thread is None:
+        console.print("[bold red]✗ 获取帖子失败[/bold red]")
+        sys.exit(1)
+    
+    # 多页时显示的最后一页
+    if all_pages:
+        last_page = thread.total_pages
+    else:
+        last_page = min(end_page, max(thread.total_pages, thread.current_page))
     
     # 检查页码是否超出范围
     if thread.current_page > thread.total_pages:
@@ -297,7 +608,12 @@ def thread(thread_id, page):
     
     # 显示帖子标题和内容
     post_time_str = f" | 发帖时间：{thread.created_at}" if thread.created_at else ""
-    page_info_str = f" | 第{thread.current_page}/{thread.total_pages}页" if thread.total_pages > 1 else ""
+    if thread.total_pages <= 1:
+        page_info_str = ""
+    elif last_page > thread.current_page:
+        page_info_str = f" | 第{thread.current_page}-{last_page}/{thread.total_pages}页"
+    else:
+        page_info_str = f" | 第{thread.current_page}/{thread.total_pages}页"
     console.print(Panel(
         f"[bold]{thread.title}[/bold]\n"
         f"作者：{thread.author}{post_time_str} | 查看：{thread.views} | 回复：{thread.replies}{page_info_str}",
@@ -319,27 +635,58 @@ def thread(thread_id, page):
     # 在底部显示分页提示
     if thread.total_pages > 1:
         nav_hint = ""
-        if thread.current_page < thread.total_pages:
-            nav_hint = f"[dim]下一页：s1cli thread {thread_id} -p {thread.current_page + 1}[/dim]"
-        elif thread.current_page == thread.total_pages:
+        if last_page < thread.total_pages:
+            nav_hint = f"[dim]下一页：s1cli thread {thread_id} -p {last_page + 1}[/dim]"
+        elif last_page == thread.total_pages:
             nav_hint = f"[dim]已是最后一页[/dim]"
         if nav_hint:
             console.print(f"\n{nav_hint}")
 
 
+def _thread_records(thread_api, thread_id, start_page, end_page):
+    """帖子的 NDJSON 记录，每个楼层一条
+    
+    边下载边解析，每个楼层解析完立即产出；离线或获取失败时使用本地存储中保存的页面。
+    
+    Args:
+        thread_api: 帖子 API
+        thread_id: 帖子 ID
+        start_page: 起始页码
+        end_page: 最后一页的页码，None 表示到最后一页
+        
+    Yields:
+        楼层记录（第一页包括楼主）
+        
+    Raises:
+        APIError: 没有获取到任何楼层
+        NetworkError: 网络故障或论坛服务器错误（已自动重试）
+        RateLimitError: 请求被论坛限制（已自动重试）
+    """
+    from s1cli.api.exceptions import APIError
+    from s1cli.records import post_record
+    
+    count = 0
+    for page, post in thread_api.iter_posts(thread_id, start_page, end_page):
+        yield post_record(post, page)
+        count += 1
+    
+    if count == 0:
+        raise APIError(f"没有获取到帖子 {thread_id} 的内容")
+
+
 @cli.command()
 @click.argument('thread_id')
 @click.option('--page', '-p', default=1, help='页码')
 def view(thread_id, page):
     """查看帖子（旧命令，推荐使用 s1cli thread）"""
+    from s1cli.config import Config
     from s1cli.api.thread import ThreadAPI
-    from s1cli.api.client import S1Client
     from rich.panel import Panel
     from rich.markdown import Markdown
     from rich.rule import Rule
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     thread_api = ThreadAPI(client)
     
     console.print(f"[cyan]正在加载帖子：{thread_id} (第{page}页)[/cyan]")
@@ -381,17 +728,135 @@ def view(thread_id, page):
             console.print(f"\n{nav_hint}")
 
 
+@cli.command()
+@click.argument('thread_ids', nargs=-1)
+@click.option('--forum', '-f', 'forums', multiple=True, help='先获取该版块第一页的帖子列表，跳过其中没有新回复的帖子（可多次指定）')
+@click.option('--remove', is_flag=True, help='不再同步指定的帖子')
+def sync(thread_ids, forums, remove):
+    """增量同步帖子，只获取新回复\n    不带 ID 时同步所有同步过的帖子\n    -f 先刷新版块帖子列表"""
+    from s1cli.config import Config
+    from s1cli.api.forum import ForumAPI
+    from s1cli.api.thread import ThreadAPI
+    
+    config = Config()
+    client = _create_client(config)
+    thread_api = ThreadAPI(client)
+    
+    if thread_api.store is None:
+        console.print("[bold red]✗ 本地存储未启用（store.enabled = false），无法增量同步[/bold red]")
+        sys.exit(1)
+    
+    if client.offline and not remove:
+        console.print("[bold red]✗ 离线模式下无法同步[/bold red]")
+        sys.exit(1)
+    
+    if remove:
+        for thread_id in thread_ids:
+            if thread_api.store.remove_sync_state(thread_id):
+                console.print(f"[green]✓ 不再同步帖子 {thread_id}[/green]")
+            else:
+                console.print(f"[yellow]帖子 {thread_id} 没有在同步[/yellow]")
+        return
+    
+    # 帖子列表中的回复数会写入本地存储，同步时据此跳过没有新回复的帖子
+    forum_api = ForumAPI(client)
+    for forum in forums:
+        console.print(f"[cyan]正在获取版块帖子列表：{forum}[/cyan]")
+        forum_api.get_thread_list(forum)
+    
+    targets = thread_ids or thread_api.store.synced_thread_ids()
+    if not targets:
+        console.print("[yellow]还没有同步过任何帖子，使用 's1cli sync <ID>' 开始同步[/yellow]")
+        return
+    
+    requests = 0
+    for thread_id in targets:
+        result = thread_api.sync_thread(thread_id)
+        if result is None:
+            console.print(f"[red]✗ [{thread_id}] 同步失败[/red]")
+            continue
+        
+        requests += result.requests
+        if result.skipped:
+            console.print(f"[dim]- [{thread_id}] 没有新回复（已同步到 #{result.last_floor}）[/dim]")
+        elif result.new_posts:
+            console.print(
+                f"[green]✓ [{thread_id}] {result.title}：{len(result.new_posts)} 条新回复"
+                f"（#{result.new_posts[0].floor}-#{result.last_floor}，第{result.last_page}页）[/green]"
+            )
+        else:
+            console.print(f"[dim]✓ [{thread_id}] {result.title}：没有新回复[/dim]")
+    
+    console.print(f"\n[dim]共 {len(targets)} 个帖子，请求了 {requests} 个帖子页面[/dim]")
+
+
+@cli.command()
+@click.argument('thread_id')
+@click.option('--format', '-f', 'fmt', type=click.Choice(['jsonl', 'html', 'md']), default='jsonl', help='输出格式（默认 jsonl）')
+@click.option('--output', '-o', default=None, help='输出文件（默认为 <帖子ID>.<格式>）')
+@click.option('--resume', is_flag=True, help='从上次中断的位置继续（已完成的归档只追加新回复）')
+def archive(thread_id, fmt, output, resume):
+    """把整个帖子逐页写入文件\n    -f 格式 jsonl/html/md\n    --resume 断点续传"""
+    from s1cli.config import Config
+    from pathlib import Path
+    from s1cli.api.exceptions import NetworkError, RateLimitError
+    from s1cli.api.thread import ThreadAPI
+    from s1cli.archive import archive_thread, load_checkpoint
+    
+    path = Path(output or f"{thread_id}.{fmt}")
+    
+    config = Config()
+    client = _create_client(config)
+    thread_api = ThreadAPI(client)
+    
+    checkpoint = load_checkpoint(path) if resume and path.exists() else None
+    if checkpoint is not None:
+        console.print(f"[cyan]继续归档帖子 {thread_id}：已写到第{checkpoint.page}页 #{checkpoint.floor}[/cyan]")
+    else:
+        console.print(f"[cyan]正在归档帖子 {thread_id} → {path}[/cyan]")
+    
+    with console.status("正在获取第一页...") as status:
+        def on_progress(result):
+            status.update(f"第{result.last_page}/{result.total_pages}页，已写入 {result.posts} 个楼层")
+        
+        try:
+            result = archive_thread(thread_api, thread_id, path, fmt=fmt, resume=resume, progress=on_progress)
+        except ValueError as e:
+            console.print(f"[bold red]✗ {e}[/bold red]")
+            sys.exit(1)
+        except (NetworkError, RateLimitError) as e:
+            saved = load_checkpoint(path)
+            console.print(f"[bold red]✗ 获取失败：{e}[/bold red]")
+            if saved is not None and saved.thread_id == str(thread_id):
+                console.print(f"[yellow]已保存到第{saved.page}页，使用 --resume 继续[/yellow]")
+            sys.exit(1)
+    
+    if result.title is None:
+        console.print("[bold red]✗ 获取帖子失败[/bold red]")
+        sys.exit(1)
+    
+    if result.total_pages > result.last_page:
+        console.print(
+            f"[yellow]⚠ 第{result.last_page + 1}页获取失败，已保存到第{result.last_page}页，"
+            f"使用 --resume 继续[/yellow]"
+        )
+    console.print(
+        f"[green]✓ {result.title}：写入 {result.posts} 个楼层"
+        f"（{result.pages} 页，共 {result.total_pages} 页）→ {path}[/green]"
+    )
+
+
 @cli.command()
 @click.option('--forum', '-f', required=True, help='论坛版块名称')
 @click.option('--title', '-t', required=True, help='帖子标题')
 @click.option('--content', '-c', required=True, help='帖子内容')
 def post(forum, title, content):
     """发布新帖\n    -f 版块名\n    -t 标题\n    -c 内容"""
+    from s1cli.config import Config
     from s1cli.api.thread import ThreadAPI
-    from s1cli.api.client import S1Client
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     thread_api = ThreadAPI(client)
     
     console.print(f"[cyan]正在发布帖子到：{forum}[/cyan]")
@@ -409,11 +874,11 @@ def post(forum, title, content):
 @click.option('--content', '-c', required=True, help='回复内容')
 def reply(thread_id, content):
     """回复帖子\n    -c 回复内容"""
+    from s1cli.config import Config
     from s1cli.api.thread import ThreadAPI
-    from s1cli.api.client import S1Client
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     thread_api = ThreadAPI(client)
     
     console.print(f"[cyan]正在回复帖子：{thread_id}[/cyan]")
@@ -429,16 +894,57 @@ def reply(thread_id, content):
 @cli.command()
 @click.argument('keyword')
 @click.option('--forum', '-f', help='限定搜索的版块')
-def search(keyword, forum):
-    """搜索帖子\n    -f 限定版块（可选）"""
+@click.option('--local', '-l', 'local', is_flag=True, help='在本地保存过的帖子和回复中全文搜索（不访问网络）')
+@click.option('--author', '-a', help='限定作者（仅 --local）')
+@click.option('--limit', default=50, help='最多显示的结果数（仅 --local，默认 50）')
+@click.option('--format', 'output_format', type=click.Choice(['text', 'ndjson']), default='text',
+              help='输出格式：text（默认）或 ndjson（每行一个结果）')
+def search(keyword, forum, local, author, limit, output_format):
+    """搜索帖子\n    -f 限定版块（可选）\n    -l 本地全文搜索\n    -a 限定作者（仅本地）\n    --format ndjson 机器可读输出"""
+    from s1cli.config import Config
     from s1cli.api.search import SearchAPI
-    from s1cli.api.client import S1Client
     from rich.table import Table
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     search_api = SearchAPI(client)
     
+    if output_format == 'ndjson':
+        _write_ndjson(_search_records(search_api, keyword, forum, local or client.offline, author, limit))
+        return
+    
+    # 离线时只能搜索本地保存的内容
+    if local or client.offline:
+        from rich.text import Text
+        
+        hits = search_api.search_local(keyword, forum, author=author, limit=limit)
+        
+        table = Table(title=f"本地搜索结果：{keyword}")
+        table.add_column("ID", style="cyan", no_wrap=True)
+        table.add_column("标题", style="white")
+        table.add_column("版块", style="green", no_wrap=True)
+        table.add_column("作者", style="yellow", no_wrap=True)
+        table.add_column("楼层", style="magenta", justify="right", no_wrap=True)
+        table.add_column("内容", style="dim")
+        
+        for hit in hits:
+            table.add_row(
+                hit.thread_id,
+                hit.title,
+                hit.forum or hit.forum_id or "",
+                hit.author,
+                f"#{hit.floor}",
+                # 摘要是原文，可能包含 [link] 等方括号，不按 markup 解析
+                Text(hit.snippet)
+            )
+        
+        console.print(table)
+        console.print(f"\n[dim]共 {len(hits)} 条结果 | 使用 's1cli thread <ID>' 查看该帖子[/dim]")
+        return
+    
+    if author:
+        console.print("[yellow]⚠ --author 只在本地搜索（--local）时生效[/yellow]")
+    
     console.print(f"[cyan]正在搜索：{keyword}[/cyan]")
     results = search_api.search(keyword, forum)
     
@@ -459,12 +965,168 @@ def search(keyword, forum):
     console.print(table)
 
 
+def _search_records(search_api, keyword, forum, local, author, limit):
+    """搜索结果的 NDJSON 记录
+    
+    在线搜索每个帖子一条；本地搜索每条命中一条（含楼层、摘要和相关度）。
+    
+    Args:
+        search_api: 搜索 API
+        keyword: 搜索关键词
+        forum: 限定的版块（可选）
+        local: 本地全文搜索
+        author: 限定作者（仅本地）
+        limit: 最多产出的结果数（仅本地）
+        
+    Yields:
+        帖子记录或本地搜索命中记录
+        
+    Raises:
+        NetworkError: 网络故障或论坛服务器错误（已自动重试）
+        RateLimitError: 请求被论坛限制（已自动重试）
+    """
+    from dataclasses import asdict
+    from s1cli.records import thread_record
+    
+    if local:
+        for hit in search_api.search_local(keyword, forum, author=author, limit=limit):
+            yield asdict(hit)
+        return
+    
+    for result in search_api.search(keyword, forum):
+        yield thread_record(result)
+
+
+# 批量模式支持的命令，参数与单独运行时相同
+_BATCH_COMMANDS = ('thread', 'list', 'search')
+
+
+@cli.command()
+@click.argument('input_file', type=click.File('r', encoding='utf-8'), default='-')
+def batch(input_file):
+    """从标准输入或文件读取多条命令，复用同一个客户端执行\n    每行一条 thread/list/search 命令，结果按 NDJSON 输出"""
+    import queue
+    import shlex
+    import threading
+    from collections import deque
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from s1cli.config import Config
+    from s1cli.api.forum import ForumAPI
+    from s1cli.api.search import SearchAPI
+    from s1cli.api.thread import ThreadAPI
+    
+    config = Config()
+    client = _create_client(config)
+    forum_api = ForumAPI(client)
+    thread_api = ThreadAPI(client)
+    search_api = SearchAPI(client)
+    options = click.get_current_context().find_root().obj or {}
+    commands = {'thread': thread, 'list': list, 'search': search}
+    
+    def parse(line):
+        """把一行命令解析为产出记录的函数"""
+        args = shlex.split(line, comments=True)
+        if not args:
+            return None
+        name, args = args[0], args[1:]
+        if name not in _BATCH_COMMANDS:
+            raise click.UsageError(f"不支持的命令：{name}（可用：{'/'.join(_BATCH_COMMANDS)}）")
+        if '--help' in args:
+            raise click.UsageError("批量模式不支持 --help")
+        
+        params = commands[name].make_context(name, args).params
+        if name == 'thread':
+            start_page, end_page = _parse_page_range(params['page'])
+            return lambda: _thread_records(
+                thread_api, params['thread_id'], start_page, None if params['all_pages'] else end_page
+            )
+        if name == 'list':
+            start_page, end_page = _parse_page_range(params['page'])
+            return lambda: _list_records(
+                forum_api, params['forum_id_or_name'], start_page, end_page,
+                refresh=options.get('cache_mode') == 'refresh'
+            )
+        return lambda: _search_records(
+            search_api, params['keyword'], params['forum'], params['local'] or client.offline,
+            params['author'], params['limit']
+        )
+    
+    # 单独的线程读取输入：从管道逐行输入时，前面命令的结果不用等后面的输入就能输出
+    events = queue.Queue()
+    
+    def read_lines():
+        for line_no, line in enumerate(input_file, 1):
+            events.put((line_no, line.strip()))
+        events.put(None)
+    
+    threading.Thread(target=read_lines, daemon=True).start()
+    
+    def run(job, output):
+        """在工作线程中执行命令，每产出一条记录就交给主线程输出"""
+        for record in job():
+            output.append(record)
+            events.put('record')
+    
+    failed = 0
+    emitted = 0  # 最前面的命令已输出的记录数
+    workers = max(1, int(config.get("network.max_concurrency", 4)))
+    with _ndjson_output() as emit, ThreadPoolExecutor(max_workers=workers) as executor:
+        # 各命令并发执行，结果按输入顺序输出：排在最前面的命令边执行边输出，
+        # 后面的命令产出的记录先留在各自的队列中
+        pending = deque()
+        eof = False
+        while not eof or pending:
+            event = events.get()
+            if event is None:
+                eof = True
+            elif isinstance(event, tuple):
+                line_no, line = event
+                output = deque()
+                try:
+                    job = parse(line)
+                except Exception as e:
+                    future = Future()
+                    future.set_exception(e)
+                else:
+                    future = executor.submit(run, job, output) if job else None
+                if future is not None:
+                    future.add_done_callback(lambda _: events.put('done'))
+                    pending.append((line_no, line, output, future))
+            
+            while pending:
+                line_no, line, output, future = pending[0]
+                # 先确认是否结束再取记录，结束前产出的记录都在队列中
+                done = future.done()
+                while output:
+                    emit({'line': line_no, 'data': output.popleft()})
+                    emitted += 1
+                if not done:
+                    break
+                
+                pending.popleft()
+                status = {'line': line_no, 'command': line, 'done': True, 'count': emitted}
+                emitted = 0
+                try:
+                    future.result()
+                except click.ClickException as e:
+                    failed += 1
+                    status['error'] = e.format_message()
+                except Exception as e:
+                    failed += 1
+                    status['error'] = str(e) or type(e).__name__
+                emit(status)
+    
+    forum_api.forum_index.wait_for_refresh(5)
+    if failed:
+        sys.exit(1)
+
+
 @cli.command()
 @click.option('--ua', is_flag=True, help='显示 User Agent 信息')
 @click.option('-e', '--expire', 'show_expire', is_flag=True, help='显示会话过期信息')
 def debug(ua, show_expire):
     """调试信息\n    --ua 查看UA\n    -e 查看过期时间"""
-    from s1cli.api.client import S1Client
+    from s1cli.config import Config
     from rich.panel import Panel
     from datetime import datetime, timedelta
     
@@ -472,7 +1134,7 @@ def debug(ua, show_expire):
     
     if ua:
         # 显示 User Agent 信息
-        client = S1Client(config)
+        client = _create_client(config)
         console.print(Panel(
             f"[bold cyan]User Agent:[/bold cyan]\n{client.USER_AGENT}\n\n"
             f"[bold cyan]Base URL:[/bold cyan]\n{client.BASE_URL}",
@@ -533,7 +1195,7 @@ def debug(ua, show_expire):
 @cli.command()
 def checkin():
     """每日签到打卡"""
-    from s1cli.api.client import S1Client
+    from s1cli.config import Config
     from s1cli.api.auth import AuthAPI
     from rich.panel import Panel
     
@@ -545,7 +1207,7 @@ def checkin():
         console.print("[dim]使用 's1cli login' 登录账号[/dim]")
         sys.exit(1)
     
-    client = S1Client(config)
+    client = _create_client(config)
     auth = AuthAPI(client)
     
     console.print("[cyan]🎯 正在签到...[/cyan]")
@@ -590,12 +1252,12 @@ def checkin():
 @cli.command()
 def profile():
     """查看个人信息"""
+    from s1cli.config import Config
     from s1cli.api.auth import AuthAPI
-    from s1cli.api.client import S1Client
     from rich.panel import Panel
     
     config = Config()
-    client = S1Client(config)
+    client = _create_client(config)
     auth = AuthAPI(client)
     
     if not auth.check_login():
@@ -651,6 +1313,10 @@ def main():
     except KeyboardInterrupt:
         console.print("\n[yellow]已取消[/yellow]")
         sys.exit(0)
+    except BrokenPipeError:
+        # 下游（如 head）提前关闭了管道：不再输出，退出时也不再刷新标准输出
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except Exception as e:
         console.print(f"[bold red]错误：{e}[/bold red]")
         sys.exit(1)
@@ -66,14 +66,18 @@ class AuthAPI:
                 
                 # Discuz 登录成功后会返回包含用户信息的页面或重定向
                 if "succeedhandle" in response_text or "欢迎" in response_text:
-                    # 保存用户信息
+                    # 立即写入登录 cookies，再保存用户信息
+                    self.client.flush_cookies()
                     self.config.set_user_info(username)
                     return True
                 elif "登录失败" in response_text or "密码错误" in response_text:
                     return False
                 else:
                     # 尝试验证登录状态
-                    return self.check_login()
+                    if self.check_login():
+                        self.client.flush_cookies()
+                        return True
+                    return False
             
             return False
             
@@ -0,0 +1,291 @@
+"""HTTP 响应磁盘缓存"""
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from s1cli.api.page_store import PageStore
+from s1cli.config import Config
+
+
+# 缓存模式
+CACHE_NORMAL = "normal"    # 命中且未过期时直接使用缓存
+CACHE_REFRESH = "refresh"  # 跳过读取，但写入最新响应
+CACHE_OFF = "off"          # 完全不读写缓存
+CACHE_OFFLINE = "offline"  # 离线：只读缓存（忽略过期时间），不访问网络
+
+
+# 各路由默认的缓存时间（秒），可通过 cache.ttl.<路由名> 覆盖
+DEFAULT_TTLS: Dict[str, int] = {
+    # 非最后一页的帖子内容基本不会再变化
+    "thread_page": 7 * 24 * 3600,
+    # 最后一页随时可能有新回复
+    "thread_last_page": 60,
+    "forumdisplay": 60,
+    "forum_index": 3600,
+    "search": 300,
+}
+
+_THREAD_PAGE_PATTERN = re.compile(r"/thread-(\d+)-(\d+)-\d+\.html$")
+_TOTAL_PAGES_PATTERN = re.compile(r'title="共\s*(\d+)\s*页"'.encode("utf-8"))
+
+# 移动端接口（api/mobile/index.php）各模块对应的路由
+_MOBILE_ROUTES = {
+    "forumindex": "forum_index",
+    "forumdisplay": "forumdisplay",
+    "viewthread": "thread_page",
+}
+_MOBILE_REPLIES_PATTERN = re.compile(rb'"replies":"?(\d+)')
+_MOBILE_PPP_PATTERN = re.compile(rb'"ppp":"?(\d+)')
+
+
+class ResponseCache:
+    """HTTP 响应磁盘缓存
+
+    以规范化后的 URL 和登录身份作为键，每个条目存成一个只有一行 JSON 元数据的
+    文件，响应体保存在压缩的内容寻址页面存储（``pages/``）中，元数据记录它的摘要。
+    页面存储总大小超过上限时按 LRU 淘汰，指向已淘汰页面的条目随后清理。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_size: int = 100 * 1024 * 1024,
+        ttls: Optional[Dict[str, int]] = None,
+        codec: str = "auto"
+    ):
+        """初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_size: 缓存总大小上限（字节，按压缩后计算）
+            ttls: 各路由的缓存时间，未提供的路由使用默认值
+            codec: 响应体压缩编码（auto/zstd/zlib）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update({name: int(ttl) for name, ttl in ttls.items()})
+        self.pages = PageStore(self.cache_dir / "pages", max_size=max_size, codec=codec)
+
+    @classmethod
+    def from_config(cls, config: Config) -> "ResponseCache":
+        """根据配置创建缓存
+
+        Args:
+            config: 配置对象
+
+        Returns:
+            缓存对象
+        """
+        max_size_mb = float(config.get("cache.max_size_mb", 100))
+        return cls(
+            config.cache_dir / "http",
+            max_size=int(max_size_mb * 1024 * 1024),
+            ttls=config.get("cache.ttl", {}),
+            codec=config.get("cache.compression", "auto"),
+        )
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """规范化 URL：小写协议和主机名、排序查询参数、去掉片段"""
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+    def _key(self, url: str, identity: str) -> str:
+        """计算缓存键"""
+        raw = f"{identity}\n{self.normalize_url(url)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """缓存条目文件路径"""
+        return self.cache_dir / f"{key}.cache"
+
+    def route_of(self, url: str) -> Optional[str]:
+        """判断 URL 所属的缓存路由
+
+        Args:
+            url: 请求 URL
+
+        Returns:
+            路由名，不缓存的页面返回 None
+        """
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+
+        if _THREAD_PAGE_PATTERN.search(parts.path):
+            return "thread_page"
+        if parts.path.endswith("/api/mobile/index.php"):
+            return _MOBILE_ROUTES.get(query.get("module"))
+        if parts.path.endswith("/forum.php"):
+            if query.get("mod") == "forumdisplay":
+                return "forumdisplay"
+            if "mod" not in query:
+                return "forum_index"
+        if parts.path.endswith("/search.php") and ("srchtxt" in query or "searchid" in query):
+            return "search"
+        return None
+
+    def ttl_for(self, url: str, body: bytes) -> int:
+        """根据路由和页面内容决定缓存时间
+
+        Args:
+            url: 请求 URL
+            body: 响应体
+
+        Returns:
+            缓存时间（秒），0 表示不缓存
+        """
+        route = self.route_of(url)
+        if route is None:
+            return 0
+
+        if route == "thread_page":
+            page, total_pages = self._thread_position(url, body)
+            if page >= total_pages:
+                route = "thread_last_page"
+
+        return self.ttls.get(route, 0)
+
+    @staticmethod
+    def _thread_position(url: str, body: bytes) -> Tuple[int, int]:
+        """从帖子页面（或移动端 viewthread 接口）的 URL 和内容取出页码和总页数"""
+        parts = urlsplit(url)
+        match = _THREAD_PAGE_PATTERN.search(parts.path)
+        if match:
+            total = _TOTAL_PAGES_PATTERN.search(body)
+            return int(match.group(2)), int(total.group(1)) if total else 1
+
+        page = int(dict(parse_qsl(parts.query)).get("page") or 1)
+        replies = _MOBILE_REPLIES_PATTERN.search(body)
+        ppp = _MOBILE_PPP_PATTERN.search(body)
+        if not replies or not ppp or int(ppp.group(1)) == 0:
+            return page, page
+        return page, -(-(int(replies.group(1)) + 1) // int(ppp.group(1)))
+
+    def _read(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        """读取缓存条目"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+            digest = meta["body"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        body = self.pages.get(digest)
+        if body is None:
+            # 响应体已被淘汰
+            self._unlink(path)
+            return None
+        return meta, body
+
+    def get(self, url: str, identity: str, allow_stale: bool = False) -> Optional[httpx.Response]:
+        """读取未过期的缓存响应
+
+        Args:
+            url: 请求 URL
+            identity: 登录身份
+            allow_stale: 已过期的响应也返回（离线模式使用）
+
+        Returns:
+            缓存的响应，未命中或已过期时返回 None
+        """
+        key = self._key(url, identity)
+        entry = self._read(key)
+        if entry is None:
+            return None
+
+        meta, body = entry
+        if not allow_stale and time.time() - meta["stored_at"] > meta["ttl"]:
+            return None
+
+        return httpx.Response(
+            meta["status"],
+            headers=meta["headers"],
+            content=body,
+            request=httpx.Request("GET", meta["final_url"]),
+        )
+
+    def put(self, url: str, identity: str, response: httpx.Response):
+        """写入响应
+
+        只缓存 200 的页面，且路由必须有缓存策略。
+
+        Args:
+            url: 请求 URL
+            identity: 登录身份
+            response: 响应对象（需要已读取响应体）
+        """
+        if response.status_code != 200:
+            return
+
+        body = response.content
+        ttl = self.ttl_for(url, body)
+        if ttl <= 0:
+            return
+
+        evictions = self.pages.evictions
+        meta = {
+            "url": url,
+            "final_url": str(response.url),
+            "status": response.status_code,
+            "headers": {"content-type": response.headers.get("content-type", "")},
+            "stored_at": time.time(),
+            "ttl": ttl,
+            "body": self.pages.put(body),
+        }
+
+        key = self._key(url, identity)
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+            os.replace(tmp_path, path)
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return
+
+        if self.pages.evictions != evictions:
+            self._prune()
+
+    @staticmethod
+    def _unlink(path: Path):
+        """删除缓存条目文件，文件已不存在时忽略"""
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _prune(self):
+        """删除响应体已被淘汰的条目，以及无法解析的条目
+
+        只在页面存储淘汰过页面之后调用，读取每个条目的第一行。
+        """
+        for path in self.cache_dir.glob("*.cache"):
+            try:
+                with open(path, "rb") as f:
+                    meta = json.loads(f.readline())
+            except (OSError, ValueError):
+                self._unlink(path)
+                continue
+            digest = meta.get("body")
+            if digest is None or digest not in self.pages:
+                self._unlink(path)
+
+    def clear(self):
+        """清空缓存"""
+        for path in self.cache_dir.glob("*.cache"):
+            self._unlink(path)
+        self.pages.clear()
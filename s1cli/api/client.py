@@ -1,48 +1,61 @@
 """Stage1st HTTP 客户端"""
-import httpx
+import asyncio
+import atexit
+import itertools
 import time
-import random
-from typing import Dict, Any, Optional
+import httpx
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
 from s1cli.config import Config
+from s1cli.api.cache import CACHE_NORMAL, CACHE_OFF, CACHE_OFFLINE, CACHE_REFRESH, ResponseCache
+from s1cli.api.exceptions import OfflineError, RateLimitError
+from s1cli.api.ratelimit import get_rate_limiter
+from s1cli.api.retry import classify_exception, classify_response, get_retry_policy
+from s1cli.metrics import RequestTiming, RequestTracer, get_registry
 
 
-class S1Client:
-    """Stage1st HTTP 客户端
-    
-    模拟真实浏览器访问，包含：
-    - Chrome User Agent
-    - 完整的浏览器 headers
-    - 请求频率限制
-    - Cookie 管理
+class BaseS1Client:
+    """同步/异步客户端的公共部分
+
+    负责请求头、URL 拼接、Cookie 持久化、共享的请求频率限制和 GET 请求的重试。
+
+    GET 请求遇到网络故障、429/503 或 5xx 时按 ``retry.*`` 配置自动重试，
+    仍然失败时抛出 NetworkError / RateLimitError；连续失败过多时熔断，
+    之后的请求直接抛出 CircuitOpenError。POST 请求不是幂等的，不会重试。
+
+    离线模式（cache_mode = offline）下不访问网络：GET 请求只返回缓存中的响应
+    （包括已过期的），缓存中没有时和 POST 请求一样抛出 OfflineError。
     """
-    
+
     BASE_URL = "https://stage1st.com/2b"
-    
+
     # 模拟 Chrome User Agent
     USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    
-    def __init__(self, config: Config):
+
+    def __init__(self, config: Config, cache_mode: str = CACHE_NORMAL):
         """初始化客户端
-        
+
         Args:
             config: 配置对象
+            cache_mode: 响应缓存模式（normal/refresh/off/offline）
         """
         self.config = config
-        self._last_request_time = 0
-        
-        # 初始化 httpx 客户端
-        self._client = httpx.Client(
-            timeout=30.0,
-            follow_redirects=True,
-            headers=self._get_default_headers()
-        )
-        
-        # 加载已保存的 cookies
-        self._load_cookies()
-    
+        self._rate_limiter = get_rate_limiter(config)
+        self._retry_policy, self._breaker = get_retry_policy(config)
+
+        # 响应缓存（cache.enabled = false 时关闭）
+        self.cache_mode = cache_mode
+        self._cache: Optional[ResponseCache] = None
+        if str(config.get("cache.enabled", True)).lower() not in ("false", "0", "no"):
+            self._cache = ResponseCache.from_config(config)
+
+        # 上次写入 session.toml 的 cookies，用于判断是否需要重新保存
+        self._saved_cookies: Dict[str, str] = {}
+        self._cookies_dirty = False
+
     def _get_default_headers(self) -> Dict[str, str]:
         """获取默认请求头
-        
+
         Returns:
             请求头字典
         """
@@ -60,80 +73,403 @@ class S1Client:
             "Sec-Fetch-User": "?1",
             "Cache-Control": "max-age=0",
         }
-    
+
+    def _build_url(self, path: str) -> str:
+        """拼接完整请求 URL"""
+        return f"{self.BASE_URL}/{path.lstrip('/')}"
+
+    def _build_headers(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        with_origin: bool = False
+    ) -> Dict[str, str]:
+        """合并默认请求头和额外请求头
+
+        Args:
+            headers: 额外的请求头
+            with_origin: 是否添加 Origin（POST 请求使用）
+
+        Returns:
+            请求头字典
+        """
+        request_headers = self._get_default_headers()
+        if headers:
+            request_headers.update(headers)
+
+        # 添加 Referer
+        request_headers["Referer"] = self.BASE_URL
+        if with_origin:
+            request_headers["Origin"] = self.BASE_URL
+        return request_headers
+
+    @staticmethod
+    def _fix_encoding(response: httpx.Response):
+        """确保响应编码正确（针对中文网站）"""
+        if 'text/html' in response.headers.get('content-type', ''):
+            response.encoding = response.encoding or 'utf-8'
+
+    def _cache_identity(self) -> str:
+        """缓存键中的登录身份，不同账号（及游客）的页面互不混用"""
+        return self.config.get_user_info().get("username") or "guest"
+
+    @property
+    def offline(self) -> bool:
+        """是否处于离线模式"""
+        return self.cache_mode == CACHE_OFFLINE
+
+    def _check_online(self):
+        """离线模式下禁止访问网络
+
+        Raises:
+            OfflineError: 处于离线模式
+        """
+        if self.offline:
+            raise OfflineError("离线模式，不访问网络")
+
+    def _cache_lookup(self, url: str, cache: bool) -> Optional[httpx.Response]:
+        """按当前缓存模式查找缓存响应
+
+        Raises:
+            OfflineError: 离线模式下缓存中没有该页面
+        """
+        if self.offline:
+            cached = None
+            if cache and self._cache is not None:
+                cached = self._cache.get(url, self._cache_identity(), allow_stale=True)
+            if cached is None:
+                raise OfflineError("离线模式，本地没有缓存该页面")
+            return cached
+        if not cache or self._cache is None or self.cache_mode != CACHE_NORMAL:
+            return None
+        return self._cache.get(url, self._cache_identity())
+
+    def _cache_store(self, url: str, response: httpx.Response, cache: bool):
+        """按当前缓存模式写入响应"""
+        if not cache or self._cache is None or self.cache_mode in (CACHE_OFF, CACHE_OFFLINE):
+            return
+        self._cache.put(url, self._cache_identity(), response)
+
+    @staticmethod
+    def _record_cache_hit(url: str, response: httpx.Response, started: float):
+        """记录命中缓存的请求"""
+        get_registry().record_request(RequestTiming(
+            method="GET",
+            url=url,
+            status=response.status_code,
+            total=time.perf_counter() - started,
+            bytes=len(response.content),
+            cache_hit=True,
+        ))
+
+    def _retry_delay(self, error: Exception, attempt: int, previous: float) -> float:
+        """记录一次失败并计算重试前的等待时间
+
+        Args:
+            error: 本次失败的异常
+            attempt: 已经重试的次数
+            previous: 上一次的等待时间
+
+        Returns:
+            等待秒数
+
+        Raises:
+            error: 不再重试时抛出本次失败的异常
+        """
+        self._breaker.record_failure()
+        delay = self._retry_policy.next_delay(attempt, previous, error)
+        if delay is None:
+            raise error
+        if isinstance(error, RateLimitError):
+            # 让共享额度的其他线程和进程一起暂停
+            self._rate_limiter.pause(delay)
+        return delay
+
+    @staticmethod
+    def _transport_error(error: httpx.TransportError) -> Exception:
+        """把 httpx 的传输层异常转换为 NetworkError，并保留原始异常"""
+        converted = classify_exception(error)
+        converted.__cause__ = error
+        return converted
+
+    @staticmethod
+    def _request_url(url: str, params: Optional[Dict[str, Any]]) -> str:
+        """合并查询参数后的完整 URL，用作缓存键"""
+        if not params:
+            return url
+        return str(httpx.URL(url).copy_merge_params(params))
+
+    @contextmanager
+    def refreshing(self) -> Iterator[None]:
+        """在代码块内跳过缓存读取，强制从网络获取并更新缓存（离线模式下不起作用）
+
+        Example:
+            with client.refreshing():
+                threads = forum_api.get_thread_list("4")
+        """
+        previous = self.cache_mode
+        if previous not in (CACHE_OFF, CACHE_OFFLINE):
+            self.cache_mode = CACHE_REFRESH
+        try:
+            yield
+        finally:
+            self.cache_mode = previous
+
     def _load_cookies(self):
         """从配置加载 cookies"""
         cookies = self.config.load_cookies()
         for name, value in cookies.items():
             self._client.cookies.set(name, value, domain=".stage1st.com")
-    
-    def _save_cookies(self):
-        """保存 cookies 到配置"""
+        self._saved_cookies = dict(cookies)
+
+    def _current_cookies(self) -> Dict[str, str]:
+        """收集 stage1st.com 域下的 cookies"""
         cookies = {}
         for cookie in self._client.cookies.jar:
             if "stage1st.com" in cookie.domain:
                 cookies[cookie.name] = cookie.value
-        self.config.save_cookies(cookies)
-    
-    def _rate_limit(self, min_delay: float = 0.5, max_delay: float = 2.0):
-        """请求频率限制
-        
+        return cookies
+
+    def _save_cookies(self):
+        """记录 cookies 变化
+
+        只做脏标记，真正写入由 flush_cookies() 在关闭客户端或进程退出时完成，
+        避免每个请求都重写一次 session.toml。
+        """
+        if self._current_cookies() != self._saved_cookies:
+            self._cookies_dirty = True
+
+    def flush_cookies(self):
+        """将有变化的 cookies 写入配置
+
+        只有登录凭证（``*_auth``）变化时才刷新会话的创建时间，
+        普通请求更新的 ``lastact`` 等 cookie 不会延长会话有效期。
+        """
+        if not self._cookies_dirty:
+            return
+
+        cookies = self._current_cookies()
+        renew = any(
+            cookies.get(name) != self._saved_cookies.get(name)
+            for name in set(cookies) | set(self._saved_cookies)
+            if name.endswith("_auth")
+        )
+        self.config.save_cookies(cookies, renew=renew)
+        self._saved_cookies = cookies
+        self._cookies_dirty = False
+
+
+class S1Client(BaseS1Client):
+    """Stage1st HTTP 客户端
+
+    模拟真实浏览器访问，包含：
+    - Chrome User Agent
+    - 完整的浏览器 headers
+    - 请求频率限制
+    - Cookie 管理
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        cache_mode: str = CACHE_NORMAL,
+        transport: Optional[httpx.BaseTransport] = None
+    ):
+        """初始化客户端
+
         Args:
-            min_delay: 最小延迟（秒）
-            max_delay: 最大延迟（秒）
-        """
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        
-        # 如果距离上次请求时间太短，则等待
-        if time_since_last_request < min_delay:
-            delay = random.uniform(min_delay, max_delay)
-            time.sleep(delay)
-        
-        self._last_request_time = time.time()
-    
+            config: 配置对象
+            cache_mode: 响应缓存模式（normal/refresh/off/offline）
+            transport: 自定义 httpx 传输层（可选），基准测试中用来回放录制的页面
+        """
+        super().__init__(config, cache_mode)
+
+        # 初始化 httpx 客户端
+        self._client = httpx.Client(
+            timeout=30.0,
+            follow_redirects=True,
+            headers=self._get_default_headers(),
+            transport=transport
+        )
+
+        # 加载已保存的 cookies
+        self._load_cookies()
+
+        # 进程退出时写回有变化的 cookies
+        atexit.register(self.flush_cookies)
+
+    def _rate_limit(self):
+        """请求频率限制（与其他客户端及其他 s1cli 进程共享额度）"""
+        self._rate_limiter.acquire()
+
+    def _send(self, method: str, url: str, started: float, **kwargs) -> httpx.Response:
+        """发送请求，开启耗时统计时记录各阶段耗时
+
+        Args:
+            method: 请求方法
+            url: 请求 URL
+            started: 开始排队（等待频率限制）的时间
+            **kwargs: 传给 httpx 的其他参数
+
+        Returns:
+            响应对象
+        """
+        registry = get_registry()
+        if not registry.enabled:
+            return self._client.request(method, url, **kwargs)
+
+        tracer = RequestTracer()
+        sent = time.perf_counter()
+        response = self._client.request(method, url, extensions={"trace": tracer}, **kwargs)
+        registry.record_request(tracer.timing(
+            method, str(response.request.url), started, sent, time.perf_counter(),
+            response.status_code, len(response.content)
+        ))
+        return response
+
     def get(
-        self, 
-        path: str, 
+        self,
+        path: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
-        rate_limit: bool = True
+        rate_limit: bool = True,
+        cache: bool = True
     ) -> httpx.Response:
         """发送 GET 请求
-        
+
         Args:
             path: 请求路径
             params: 查询参数
             headers: 额外的请求头
             rate_limit: 是否启用请求频率限制
-            
+            cache: 是否使用响应缓存
+
         Returns:
             响应对象
+
+        Raises:
+            NetworkError: 重试后仍然网络故障或服务器错误
+            RateLimitError: 重试后仍然被限制访问
         """
-        if rate_limit:
-            self._rate_limit()
-        
-        url = f"{self.BASE_URL}/{path.lstrip('/')}"
-        
-        # 合并请求头
-        request_headers = self._get_default_headers()
-        if headers:
-            request_headers.update(headers)
-        
-        # 添加 Referer
-        request_headers["Referer"] = self.BASE_URL
-        
-        response = self._client.get(url, params=params, headers=request_headers)
-        
-        # 确保响应编码正确（针对中文网站）
-        if 'text/html' in response.headers.get('content-type', ''):
-            response.encoding = response.encoding or 'utf-8'
-        
-        # 保存 cookies
+        url = self._build_url(path)
+        request_url = self._request_url(url, params)
+        started = time.perf_counter()
+
+        # 命中缓存时不占用请求额度
+        cached = self._cache_lookup(request_url, cache)
+        if cached is not None:
+            self._record_cache_hit(request_url, cached, started)
+            self._fix_encoding(cached)
+            return cached
+
+        request_headers = self._build_headers(headers)
+
+        delay = 0.0
+        for attempt in itertools.count():
+            self._breaker.check()
+            if rate_limit:
+                self._rate_limit()
+            try:
+                response = self._send("GET", url, started, params=params, headers=request_headers)
+                error = classify_response(response)
+            except httpx.TransportError as e:
+                error = self._transport_error(e)
+            if error is None:
+                break
+            delay = self._retry_delay(error, attempt, delay)
+            time.sleep(delay)
+            started = time.perf_counter()
+        self._breaker.record_success()
+
+        self._fix_encoding(response)
+
+        # 记录 cookies 变化
         self._save_cookies()
-        
+
+        self._cache_store(request_url, response, cache)
+
         return response
-    
+
+    @contextmanager
+    def stream(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limit: bool = True,
+        cache: bool = True
+    ) -> Iterator[httpx.Response]:
+        """以流式方式发送 GET 请求
+
+        调用方可以用 ``response.iter_bytes()`` 边接收边处理，提前退出代码块时
+        剩余的响应体不会再读取。命中缓存时直接返回缓存的响应；
+        流式读取的响应可能不完整，因此不会写入缓存。
+
+        Args:
+            path: 请求路径
+            params: 查询参数
+            headers: 额外的请求头
+            rate_limit: 是否启用请求频率限制
+            cache: 是否读取响应缓存
+
+        Yields:
+            响应对象（响应体尚未读取）
+
+        Raises:
+            NetworkError: 重试后仍然网络故障或服务器错误，或读取响应体时连接中断
+            RateLimitError: 重试后仍然被限制访问
+        """
+        url = self._build_url(path)
+        request_url = self._request_url(url, params)
+        started = time.perf_counter()
+
+        cached = self._cache_lookup(request_url, cache)
+        if cached is not None:
+            self._record_cache_hit(request_url, cached, started)
+            self._fix_encoding(cached)
+            yield cached
+            return
+
+        request_headers = self._build_headers(headers)
+
+        delay = 0.0
+        for attempt in itertools.count():
+            self._breaker.check()
+            if rate_limit:
+                self._rate_limit()
+            tracer = RequestTracer()
+            sent = time.perf_counter()
+            request = self._client.build_request(
+                "GET", url, params=params, headers=request_headers, extensions={"trace": tracer}
+            )
+            try:
+                response = self._client.send(request, stream=True)
+                error = classify_response(response)
+                if error is not None:
+                    response.close()
+            except httpx.TransportError as e:
+                error = self._transport_error(e)
+            if error is None:
+                break
+            delay = self._retry_delay(error, attempt, delay)
+            time.sleep(delay)
+            started = time.perf_counter()
+        self._breaker.record_success()
+
+        try:
+            self._fix_encoding(response)
+            self._save_cookies()
+            yield response
+        except httpx.TransportError as e:
+            # 响应体读到一半连接中断，已经产出的数据无法撤回，不再重试
+            raise self._transport_error(e)
+        finally:
+            response.close()
+            # 提前退出时 download 只包含实际读取的部分
+            get_registry().record_request(tracer.timing(
+                "GET", request_url, started, sent, time.perf_counter(),
+                response.status_code, response.num_bytes_downloaded
+            ))
+
     def post(
         self,
         path: str,
@@ -143,58 +479,260 @@ class S1Client:
         rate_limit: bool = True
     ) -> httpx.Response:
         """发送 POST 请求
-        
+
         Args:
             path: 请求路径
             data: 表单数据
             json: JSON 数据
             headers: 额外的请求头
             rate_limit: 是否启用请求频率限制
-            
+
         Returns:
             响应对象
+
+        Raises:
+            OfflineError: 处于离线模式
         """
+        self._check_online()
+        started = time.perf_counter()
         if rate_limit:
             self._rate_limit()
-        
-        url = f"{self.BASE_URL}/{path.lstrip('/')}"
-        
-        # 合并请求头
-        request_headers = self._get_default_headers()
-        if headers:
-            request_headers.update(headers)
-        
-        # 添加 Referer 和 Origin
-        request_headers["Referer"] = self.BASE_URL
-        request_headers["Origin"] = self.BASE_URL
-        
+
+        url = self._build_url(path)
+        request_headers = self._build_headers(headers, with_origin=True)
+
         if data is not None:
             request_headers["Content-Type"] = "application/x-www-form-urlencoded"
-            response = self._client.post(url, data=data, headers=request_headers)
+            response = self._send("POST", url, started, data=data, headers=request_headers)
         elif json is not None:
             request_headers["Content-Type"] = "application/json"
-            response = self._client.post(url, json=json, headers=request_headers)
+            response = self._send("POST", url, started, json=json, headers=request_headers)
         else:
-            response = self._client.post(url, headers=request_headers)
-        
-        # 确保响应编码正确（针对中文网站）
-        if 'text/html' in response.headers.get('content-type', ''):
-            response.encoding = response.encoding or 'utf-8'
-        
-        # 保存 cookies
+            response = self._send("POST", url, started, headers=request_headers)
+
+        self._fix_encoding(response)
+
+        # 记录 cookies 变化
         self._save_cookies()
-        
+
         return response
-    
+
     def close(self):
         """关闭客户端"""
+        self.flush_cookies()
+        atexit.unregister(self.flush_cookies)
         self._client.close()
-    
+
     def __enter__(self):
         """上下文管理器入口"""
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """上下文管理器出口"""
         self.close()
 
+
+class AsyncS1Client(BaseS1Client):
+    """Stage1st 异步 HTTP 客户端
+
+    基于 httpx.AsyncClient，可以在请求频率限制内并发等待多个请求。
+    与同步客户端使用相同的请求头和同一份频率限制额度；
+    传入同步客户端时还会直接共享其 Cookie。
+
+    Example:
+        async with AsyncS1Client(config) as client:
+            thread_api = ThreadAPI(client)
+            threads = await asyncio.gather(
+                thread_api.get_thread_async("2265995", 1),
+                thread_api.get_thread_async("2265995", 2),
+            )
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        client: Optional[S1Client] = None,
+        cache_mode: Optional[str] = None
+    ):
+        """初始化异步客户端
+
+        Args:
+            config: 配置对象
+            client: 同步客户端（可选），提供时共享其 Cookie 和缓存模式
+            cache_mode: 响应缓存模式，默认跟随同步客户端或 normal
+        """
+        if cache_mode is None:
+            cache_mode = client.cache_mode if client is not None else CACHE_NORMAL
+        super().__init__(config, cache_mode)
+
+        # 直接传入 CookieJar 时 httpx 不会复制，两个客户端看到的是同一份 Cookie
+        cookies = client._client.cookies.jar if client is not None else None
+
+        self._client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            headers=self._get_default_headers(),
+            cookies=cookies
+        )
+
+        if client is None:
+            self._load_cookies()
+        else:
+            self._saved_cookies = dict(client._saved_cookies)
+
+        atexit.register(self.flush_cookies)
+
+    async def _rate_limit(self):
+        """请求频率限制（与其他客户端及其他 s1cli 进程共享额度）"""
+        await self._rate_limiter.acquire_async()
+
+    async def _send(self, method: str, url: str, started: float, **kwargs) -> httpx.Response:
+        """发送请求，开启耗时统计时记录各阶段耗时
+
+        Args:
+            method: 请求方法
+            url: 请求 URL
+            started: 开始排队（等待频率限制）的时间
+            **kwargs: 传给 httpx 的其他参数
+
+        Returns:
+            响应对象
+        """
+        registry = get_registry()
+        if not registry.enabled:
+            return await self._client.request(method, url, **kwargs)
+
+        tracer = RequestTracer()
+        sent = time.perf_counter()
+        response = await self._client.request(
+            method, url, extensions={"trace": tracer.async_trace}, **kwargs
+        )
+        registry.record_request(tracer.timing(
+            method, str(response.request.url), started, sent, time.perf_counter(),
+            response.status_code, len(response.content)
+        ))
+        return response
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limit: bool = True,
+        cache: bool = True
+    ) -> httpx.Response:
+        """发送 GET 请求
+
+        Args:
+            path: 请求路径
+            params: 查询参数
+            headers: 额外的请求头
+            rate_limit: 是否启用请求频率限制
+            cache: 是否使用响应缓存
+
+        Returns:
+            响应对象
+
+        Raises:
+            NetworkError: 重试后仍然网络故障或服务器错误
+            RateLimitError: 重试后仍然被限制访问
+        """
+        url = self._build_url(path)
+        request_url = self._request_url(url, params)
+        started = time.perf_counter()
+
+        # 命中缓存时不占用请求额度
+        cached = self._cache_lookup(request_url, cache)
+        if cached is not None:
+            self._record_cache_hit(request_url, cached, started)
+            self._fix_encoding(cached)
+            return cached
+
+        request_headers = self._build_headers(headers)
+
+        delay = 0.0
+        for attempt in itertools.count():
+            self._breaker.check()
+            if rate_limit:
+                await self._rate_limit()
+            try:
+                response = await self._send("GET", url, started, params=params, headers=request_headers)
+                error = classify_response(response)
+            except httpx.TransportError as e:
+                error = self._transport_error(e)
+            if error is None:
+                break
+            delay = self._retry_delay(error, attempt, delay)
+            await asyncio.sleep(delay)
+            started = time.perf_counter()
+        self._breaker.record_success()
+
+        self._fix_encoding(response)
+
+        # 记录 cookies 变化
+        self._save_cookies()
+
+        self._cache_store(request_url, response, cache)
+
+        return response
+
+    async def post(
+        self,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limit: bool = True
+    ) -> httpx.Response:
+        """发送 POST 请求
+
+        Args:
+            path: 请求路径
+            data: 表单数据
+            json: JSON 数据
+            headers: 额外的请求头
+            rate_limit: 是否启用请求频率限制
+
+        Returns:
+            响应对象
+
+        Raises:
+            OfflineError: 处于离线模式
+        """
+        self._check_online()
+        started = time.perf_counter()
+        if rate_limit:
+            await self._rate_limit()
+
+        url = self._build_url(path)
+        request_headers = self._build_headers(headers, with_origin=True)
+
+        if data is not None:
+            request_headers["Content-Type"] = "application/x-www-form-urlencoded"
+            response = await self._send("POST", url, started, data=data, headers=request_headers)
+        elif json is not None:
+            request_headers["Content-Type"] = "application/json"
+            response = await self._send("POST", url, started, json=json, headers=request_headers)
+        else:
+            response = await self._send("POST", url, started, headers=request_headers)
+
+        self._fix_encoding(response)
+
+        # 记录 cookies 变化
+        self._save_cookies()
+
+        return response
+
+    async def aclose(self):
+        """关闭客户端"""
+        self.flush_cookies()
+        atexit.unregister(self.flush_cookies)
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        """异步上下文管理器入口"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """异步上下文管理器出口"""
+        await self.aclose()
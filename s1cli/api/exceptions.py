@@ -1,4 +1,5 @@
 """自定义异常类"""
+from typing import Optional
 
 
 class S1CLIException(Exception):
@@ -33,6 +34,24 @@ class SessionExpiredError(AuthenticationError):
 
 class RateLimitError(S1CLIException):
     """请求频率限制"""
+    
+    def __init__(self, message: str = "请求过于频繁", retry_after: Optional[float] = None):
+        """
+        Args:
+            message: 错误信息
+            retry_after: 服务器要求的等待时间（秒），未提供时为 None
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(NetworkError):
+    """连续请求失败，暂停访问论坛"""
+    pass
+
+
+class OfflineError(NetworkError):
+    """离线模式下请求的页面不在本地缓存中"""
     pass
 
 
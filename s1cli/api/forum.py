@@ -1,10 +1,25 @@
 """论坛版块和帖子列表 API"""
-from typing import List, Optional
-from bs4 import BeautifulSoup
+import asyncio
+import re
+import sqlite3
+from typing import Callable, Iterator, List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from datetime import datetime
 from s1cli.api.client import S1Client
+from s1cli.api.exceptions import NetworkError, RateLimitError
+from s1cli.api import mobile
+from s1cli.api.forum_index import get_forum_index
+from s1cli.api.parse_pool import get_parse_pool
+from s1cli.api.stream import iter_elements, to_soup
+from s1cli.metrics import get_registry
 from s1cli.models.forum import Forum
 from s1cli.models.thread import Thread
+from s1cli.store import Store, get_store
+
+
+# 版块页面只需要帖子列表和顶部分页区域，其余部分（导航、侧栏、广告）不构造节点
+_THREAD_LIST_STRAINER = SoupStrainer(id=['threadlisttableid', 'fd_page_top'])
+_TOTAL_PAGES = re.compile(r'共\s*(\d+)\s*页')
 
 
 class ForumAPI:
@@ -17,27 +32,136 @@ class ForumAPI:
             client: HTTP 客户端
         """
         self.client = client
+        # 异步获取时在子进程中解析（配置 parser.workers 启用），未启用时为 None
+        self.parse_pool = get_parse_pool(client.config)
+        # 移动端 JSON 接口（配置 api.backend = mobile 启用），未启用时为 None
+        self.mobile = mobile.get_mobile_backend(client)
+        # 版块名称 → ID 索引（缓存在 forums.json，所有 API 对象共享）
+        self.forum_index = get_forum_index(client.config)
+        # 本地存储（配置 store.enabled = false 关闭），获取到的版块和帖子列表写入其中
+        self.store = get_store(client.config)
     
     def get_forum_list(self) -> List[Forum]:
         """获取论坛版块列表
         
         Returns:
-            版块列表
+            版块列表；离线模式下直接返回缓存的版块列表
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
         """
+        if self.client.offline:
+            return self.forum_index.forums()[0]
+        
         try:
-            # 访问主论坛页面 (gid=1)
-            response = self.client.get("forum.php?gid=1")
-            html = response.text
-            soup = BeautifulSoup(html, 'lxml')
+            forums = None
+            if self.mobile is not None:
+                variables = self.mobile.fetch("forumindex")
+                if variables is not None:
+                    with get_registry().timer("parse.forum_list"):
+                        forums = mobile.parse_forum_index(variables)
             
-            forums = []
-            import re
+            if forums is None:
+                # 论坛首页一次包含所有分区
+                response = self.client.get("forum.php")
+                with get_registry().timer("parse.forum_list"):
+                    forums = self._parse_forum_list(response.text)
             
-            # Stage1st 主论坛使用 <table class="fl_tb"> 结构
-            table = soup.find('table', class_='fl_tb')
+            self.forum_index.update(forums)
+            self._save(lambda store: store.save_forums(forums), forums)
+            return forums
             
-            if not table:
-                return forums
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取版块列表异常：{e}")
+            return []
+    
+    async def get_forum_list_async(self) -> List[Forum]:
+        """获取论坛版块列表（异步版本，需要使用 AsyncS1Client）
+        
+        Returns:
+            版块列表；离线模式下直接返回缓存的版块列表
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if self.client.offline:
+            return self.forum_index.forums()[0]
+        
+        try:
+            forums = None
+            if self.mobile is not None:
+                variables = await self.mobile.fetch_async("forumindex")
+                if variables is not None:
+                    with get_registry().timer("parse.forum_list"):
+                        forums = mobile.parse_forum_index(variables)
+            
+            if forums is None:
+                response = await self.client.get("forum.php")
+                with get_registry().timer("parse.forum_list"):
+                    forums = self._parse_forum_list(response.text)
+            
+            self.forum_index.update(forums)
+            self._save(lambda store: store.save_forums(forums), forums)
+            return forums
+            
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取版块列表异常：{e}")
+            return []
+    
+    def load_forum_list(self, refresh: bool = False) -> Tuple[List[Forum], Optional[float]]:
+        """优先使用缓存的版块列表
+        
+        有缓存时立即返回，缓存过期则同时在后台刷新（下次调用即可拿到新列表，
+        可用 forum_index.wait_for_refresh 等待）；没有缓存或要求刷新时同步获取。
+        
+        Args:
+            refresh: 忽略缓存，立即从网络获取
+        
+        Returns:
+            (版块列表, 列表的更新时间戳)
+        
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if not refresh:
+            forums, updated_at = self.forum_index.forums()
+            if forums:
+                if not self.forum_index.is_fresh() and not self.client.offline:
+                    self.forum_index.refresh_in_background(self.get_forum_list)
+                return forums, updated_at
+        
+        # 获取成功时索引已更新；获取失败（没有解析到版块）时仍返回原有缓存
+        self.get_forum_list()
+        return self.forum_index.forums()
+    
+    def _parse_forum_list(self, html: str) -> List[Forum]:
+        """从论坛首页 HTML 解析所有分区的版块列表
+        
+        Args:
+            html: 页面 HTML
+            
+        Returns:
+            版块列表
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        
+        forums = []
+        import re
+        
+        # 首页的每个分区是一个 <div class="bm">：分区名称在 bm_h 的 h2 中，版块在 <table class="fl_tb"> 中
+        for table in soup.find_all('table', class_='fl_tb'):
+            group = None
+            container = table.find_parent('div', class_='bm')
+            header = container.find('div', class_='bm_h') if container else None
+            if header and header.h2:
+                group = header.h2.get_text(strip=True) or None
             
             # 遍历表格的每一行
             trs = table.find_all('tr')
@@ -117,18 +241,15 @@ class ForumAPI:
                             threads_count=threads_count if not is_subforum else 0,
                             posts_count=posts_count if not is_subforum else 0,
                             new_posts=new_posts,
-                            url=forum_url
+                            url=forum_url,
+                            group=group
                         )
                         forums.append(forum)
-                    
+                
                 except Exception:
                     continue
-            
-            return forums
-            
-        except Exception as e:
-            print(f"获取版块列表异常：{e}")
-            return []
+
+        return forums
     
     def get_thread_list(
         self, 
@@ -143,135 +264,495 @@ class ForumAPI:
             
         Returns:
             帖子列表
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        return self.get_thread_list_page(forum_name_or_id, page)[0]
+    
+    def get_thread_list_page(
+        self, 
+        forum_name_or_id: str, 
+        page: int = 1
+    ) -> Tuple[List[Thread], int]:
+        """获取指定版块的帖子列表及版块总页数
+        
+        Args:
+            forum_name_or_id: 版块名称或 ID
+            page: 页码
+            
+        Returns:
+            (帖子列表, 总页数)；离线模式下优先返回本地存储中该页最近一次的内容
+            （fetched_at 为获取时间，总页数为保存过的最大页码）
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
         """
         try:
             # 如果是名称，先查找对应的 ID
-            forum_id = forum_name_or_id
-            if not forum_name_or_id.isdigit():
-                forums = self.get_forum_list()
-                for forum in forums:
-                    if forum.name == forum_name_or_id:
-                        forum_id = forum.id
-                        break
-            
-            # 构造版块 URL
-            url = f"forum.php?mod=forumdisplay&fid={forum_id}&page={page}"
+            forum_id = self.resolve_forum_id(forum_name_or_id)
             
-            response = self.client.get(url)
-            html = response.text
-            soup = BeautifulSoup(html, 'lxml')
+            if self.client.offline:
+                stored = self._stored_thread_list(forum_id, page)
+                if stored is not None:
+                    return stored
             
-            threads = []
+            result = None
+            if self.mobile is not None:
+                variables = self.mobile.fetch("forumdisplay", fid=forum_id, page=page)
+                if variables is not None:
+                    with get_registry().timer("parse.thread_list"):
+                        result = mobile.parse_forum_display(variables, forum_name_or_id, forum_id)
             
-            # 查找帖子列表
-            # Discuz 帖子通常在 <tbody> 标签中
-            thread_list = soup.find_all('tbody', id=lambda x: x and x.startswith('normalthread'))
+            if result is None:
+                # 构造版块 URL
+                url = f"forum.php?mod=forumdisplay&fid={forum_id}&page={page}"
+                
+                response = self.client.get(url)
+                if self.parse_pool is not None:
+                    # 在子进程中解析，与多页获取帖子时一致
+                    result = self.parse_pool.submit_thread_list(
+                        response.content, response.encoding, forum_name_or_id, forum_id
+                    ).result()
+                else:
+                    with get_registry().timer("parse.thread_list"):
+                        result = self._parse_thread_list(response.text, forum_name_or_id, forum_id)
             
-            for tbody in thread_list:
-                try:
-                    # 提取帖子 ID
-                    thread_id = tbody.get('id', '').replace('normalthread_', '')
-                    
-                    # 查找标题链接
-                    title_link = tbody.find('a', class_='s xst') or tbody.find('a', class_='xst')
-                    if not title_link:
-                        continue
-                    
-                    title = title_link.get_text(strip=True)
-                    thread_url = title_link.get('href', '')
-                    
-                    # 如果 ID 不在 tbody 中，从 URL 提取
-                    if not thread_id and 'tid=' in thread_url:
-                        thread_id = thread_url.split('tid=')[1].split('&')[0]
-                    elif not thread_id and 'thread-' in thread_url:
-                        thread_id = thread_url.split('thread-')[1].split('-')[0]
-                    
-                    # 提取作者和发布时间（第一个 class='by' 的 TD）
-                    by_tds = tbody.find_all('td', class_='by')
-                    author = ''
-                    created_at = None
-                    last_reply_author = None
-                    last_reply_time = None
-                    
-                    if len(by_tds) >= 1:
-                        # 第一个 by TD：作者和发布时间
-                        first_by = by_tds[0]
-                        cite = first_by.find('cite')
-                        if cite:
-                            author_a = cite.find('a')
-                            author = author_a.get_text(strip=True) if author_a else cite.get_text(strip=True)
-                        
-                        # 发布时间
-                        time_em = first_by.find('em')
-                        if time_em:
-                            time_span = time_em.find('span')
-                            if time_span:
-                                created_at = time_span.get_text(strip=True)
-                    
-                    if len(by_tds) >= 2:
-                        # 第二个 by TD：最后回复者和时间
-                        last_by = by_tds[1]
-                        last_cite = last_by.find('cite')
-                        if last_cite:
-                            last_author_a = last_cite.find('a')
-                            last_reply_author = last_author_a.get_text(strip=True) if last_author_a else last_cite.get_text(strip=True)
-                        
-                        # 最后回复时间
-                        last_time_em = last_by.find('em')
-                        if last_time_em:
-                            last_time_span = last_time_em.find('span') or last_time_em.find('a')
-                            if last_time_span:
-                                last_reply_time = last_time_span.get_text(strip=True)
-                    
-                    # 提取回复数和查看数
-                    num_td = tbody.find('td', class_='num')
-                    replies = 0
-                    views = 0
-                    if num_td:
-                        # 回复数在 <a class="xi2"> 标签中
-                        reply_link = num_td.find('a', class_='xi2')
-                        if reply_link:
-                            try:
-                                replies = int(reply_link.get_text(strip=True))
-                            except:
-                                pass
-                        
-                        # 查看数在 <em> 标签中
-                        view_em = num_td.find('em')
-                        if view_em:
-                            try:
-                                views = int(view_em.get_text(strip=True))
-                            except:
-                                pass
-                    
-                    # 检查是否置顶、精华等
-                    is_sticky = 'class="icn stk"' in str(tbody) or 'sortnum' in tbody.get('class', [])
-                    is_digest = 'class="icn dgt"' in str(tbody) or 'digest' in str(tbody).lower()
-                    
-                    if title and thread_id:
-                        thread = Thread(
-                            id=thread_id,
-                            title=title,
-                            author=author,
-                            forum=forum_name_or_id,
-                            forum_id=forum_id,
-                            views=views,
-                            replies=replies,
-                            created_at=created_at,
-                            last_reply_author=last_reply_author,
-                            last_reply_time=last_reply_time,
-                            is_sticky=is_sticky,
-                            is_digest=is_digest
-                        )
-                        threads.append(thread)
-                        
-                except Exception as e:
-                    # 跳过解析失败的帖子
-                    continue
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取帖子列表异常：{e}")
+            return [], 1
+        
+        threads = result[0]
+        self._save(lambda store: store.save_thread_list(threads, page), threads)
+        return result
+    
+    async def get_thread_list_async(
+        self, 
+        forum_name_or_id: str, 
+        page: int = 1
+    ) -> List[Thread]:
+        """获取指定版块的帖子列表（异步版本，需要使用 AsyncS1Client）
+        
+        Args:
+            forum_name_or_id: 版块名称或 ID
+            page: 页码
             
-            return threads
+        Returns:
+            帖子列表
             
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        try:
+            forum_id = await self.resolve_forum_id_async(forum_name_or_id)
+            
+            if self.client.offline:
+                stored = self._stored_thread_list(forum_id, page)
+                if stored is not None:
+                    return stored[0]
+            
+            threads = None
+            if self.mobile is not None:
+                variables = await self.mobile.fetch_async("forumdisplay", fid=forum_id, page=page)
+                if variables is not None:
+                    with get_registry().timer("parse.thread_list"):
+                        threads, _ = mobile.parse_forum_display(variables, forum_name_or_id, forum_id)
+            
+            if threads is None:
+                url = f"forum.php?mod=forumdisplay&fid={forum_id}&page={page}"
+                
+                response = await self.client.get(url)
+                if self.parse_pool is not None:
+                    threads, _ = await asyncio.wrap_future(self.parse_pool.submit_thread_list(
+                        response.content, response.encoding, forum_name_or_id, forum_id
+                    ))
+                else:
+                    with get_registry().timer("parse.thread_list"):
+                        threads, _ = self._parse_thread_list(response.text, forum_name_or_id, forum_id)
+            
+        except (NetworkError, RateLimitError):
+            raise
         except Exception as e:
             print(f"获取帖子列表异常：{e}")
             return []
+        
+        self._save(lambda store: store.save_thread_list(threads, page), threads)
+        return threads
+    
+    def iter_thread_list(
+        self, 
+        forum_name_or_id: str, 
+        page: int = 1
+    ) -> Iterator[Thread]:
+        """流式获取指定版块的帖子列表
+        
+        边下载边解析，每解析完一个帖子就立即产出，帖子列表结束后
+        不再读取页面剩余部分（侧栏、页脚等）。
+        
+        Args:
+            forum_name_or_id: 版块名称或 ID
+            page: 页码
+            
+        Yields:
+            帖子对象
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        # 产出过的帖子在结束时一次性写入本地存储（只有普通主题，不记录在页面中的位置）
+        seen = []
+        try:
+            forum_id = self.resolve_forum_id(forum_name_or_id)
+            
+            if self.client.offline:
+                stored = self._stored_thread_list(forum_id, page)
+                if stored is not None:
+                    yield from stored[0]
+                    return
+            
+            url = f"forum.php?mod=forumdisplay&fid={forum_id}&page={page}"
+            
+            with self.client.stream(url) as response:
+                rows = iter_elements(
+                    response.iter_bytes(),
+                    match=lambda el: el.tag == 'tbody' and (el.get('id') or '').startswith('normalthread'),
+                    stop=lambda el: el.tag == 'table' and el.get('id') == 'threadlisttableid',
+                    encoding=response.encoding or 'utf-8'
+                )
+                for row in rows:
+                    try:
+                        with get_registry().timer("parse.thread_row"):
+                            thread = self._parse_thread_row(to_soup(row), forum_name_or_id, forum_id)
+                    except Exception:
+                        # 跳过解析失败的帖子
+                        continue
+                    if thread:
+                        seen.append(thread)
+                        yield thread
+                        
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取帖子列表异常：{e}")
+        finally:
+            self._save(lambda store: store.save_thread_list(seen), seen)
+    
+    def load_thread_list(
+        self,
+        forum_name_or_id: str,
+        page: int = 1
+    ) -> Tuple[List[Thread], int]:
+        """获取帖子列表及总页数，离线模式或获取失败时使用本地存储中该页最近一次的内容
+        
+        供阅读使用：来自本地存储的帖子 fetched_at 为获取该列表的时间。
+        
+        Args:
+            forum_name_or_id: 版块名称或 ID
+            page: 页码
+            
+        Returns:
+            (帖子列表, 总页数)
+            
+        Raises:
+            NetworkError: 获取失败（包括离线模式下没有缓存）且本地存储中没有该页
+            RateLimitError: 请求被论坛限制且本地存储中没有该页
+        """
+        error = None
+        try:
+            threads, total_pages = self.get_thread_list_page(forum_name_or_id, page)
+        except (NetworkError, RateLimitError) as e:
+            threads, total_pages, error = [], 1, e
+        
+        if not threads:
+            # 只查本地索引，不为了回退再请求版块列表
+            forum_id, _ = self.forum_index.lookup(forum_name_or_id)
+            stored = self._stored_thread_list(forum_id, page) if forum_id else None
+            if stored is not None:
+                return stored
+        
+        if error is not None:
+            raise error
+        return threads, total_pages
+    
+    def _stored_thread_list(self, forum_id: str, page: int) -> Optional[Tuple[List[Thread], int]]:
+        """读取本地存储中版块某一页最近一次的帖子列表
+        
+        Returns:
+            (帖子列表, 保存过的最大页码)，未启用存储、没有保存过或读取失败时返回 None
+        """
+        if self.store is None:
+            return None
+        try:
+            threads = self.store.get_thread_list(forum_id, page)
+            if not threads:
+                return None
+            return threads, max(page, self.store.thread_list_pages(forum_id))
+        except sqlite3.Error as e:
+            print(f"警告：读取本地存储失败：{e}")
+            return None
+    
+    def _save(self, write: Callable[[Store], None], items: list):
+        """写入本地存储，未启用存储、没有数据或写入失败时跳过
+        
+        Args:
+            write: 以存储对象为参数的写入函数
+            items: 要写入的数据
+        """
+        if self.store is None or not items:
+            return
+        try:
+            write(self.store)
+        except sqlite3.Error as e:
+            print(f"警告：写入本地存储失败：{e}")
+    
+    def resolve_forum_id(self, forum_name_or_id: str) -> str:
+        """把版块名称或别名解析为版块 ID
+        
+        优先查询本地索引：索引过期时照常返回，同时在后台刷新；
+        查不到时才同步请求版块列表（有频率限制）。
+        
+        Args:
+            forum_name_or_id: 版块名称、别名或 ID
+            
+        Returns:
+            版块 ID，找不到时原样返回
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if forum_name_or_id.isdigit():
+            return forum_name_or_id
+        
+        forum_id, fresh = self.forum_index.lookup(forum_name_or_id)
+        if forum_id is None:
+            if self.forum_index.should_refresh_on_miss():
+                self.get_forum_list()
+                forum_id, _ = self.forum_index.lookup(forum_name_or_id)
+        elif not fresh:
+            self.forum_index.refresh_in_background(self.get_forum_list)
+        return forum_id or forum_name_or_id
+    
+    async def resolve_forum_id_async(self, forum_name_or_id: str) -> str:
+        """把版块名称或别名解析为版块 ID（异步版本，需要使用 AsyncS1Client）
+        
+        Args:
+            forum_name_or_id: 版块名称、别名或 ID
+            
+        Returns:
+            版块 ID，找不到时原样返回
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if forum_name_or_id.isdigit():
+            return forum_name_or_id
+        
+        forum_id, fresh = self.forum_index.lookup(forum_name_or_id)
+        if forum_id is None:
+            if self.forum_index.should_refresh_on_miss():
+                await self.get_forum_list_async()
+                forum_id, _ = self.forum_index.lookup(forum_name_or_id)
+        elif not fresh:
+            self.forum_index.refresh_in_background_async(self.get_forum_list_async)
+        return forum_id or forum_name_or_id
+    
+    @staticmethod
+    def _parse_thread_list(
+        html: str,
+        forum_name_or_id: str,
+        forum_id: str
+    ) -> Tuple[List[Thread], int]:
+        """从版块页面 HTML 解析帖子列表
+        
+        只构造帖子列表表格和分页区域的节点；页面结构不同、找不到
+        帖子列表表格时退回解析整个页面。不依赖实例状态，解析池的
+        子进程中直接调用。
+        
+        Args:
+            html: 页面 HTML
+            forum_name_or_id: 调用方传入的版块名称或 ID
+            forum_id: 版块 ID
+            
+        Returns:
+            (帖子列表, 总页数)
+        """
+        soup = BeautifulSoup(html, 'lxml', parse_only=_THREAD_LIST_STRAINER)
+        if soup.find('table', id='threadlisttableid') is None:
+            soup = BeautifulSoup(html, 'lxml')
+        
+        threads = []
+        
+        # 查找帖子列表
+        # Discuz 帖子通常在 <tbody> 标签中
+        thread_list = soup.find_all('tbody', id=lambda x: x and x.startswith('normalthread'))
+        
+        for tbody in thread_list:
+            try:
+                thread = ForumAPI._parse_thread_row(tbody, forum_name_or_id, forum_id)
+                if thread:
+                    threads.append(thread)
+                    
+            except Exception as e:
+                # 跳过解析失败的帖子
+                continue
+        
+        total_pages = 1
+        page_info = soup.find('span', title=_TOTAL_PAGES)
+        if page_info:
+            total_pages = int(_TOTAL_PAGES.search(page_info['title']).group(1))
+        
+        return threads, total_pages
+    
+    @staticmethod
+    def _thread_flags(tbody: Tag) -> Tuple[bool, bool]:
+        """根据图标和 tbody 的 class 判断帖子是否置顶、精华
+        
+        置顶：带 class="icn stk" 的图标，或 tbody 带 sortnum；
+        精华：带 class="icn dgt" 的图标，或 src/alt 中含 "digest" 的图片（如 digest_1.gif）。
+        标题等文本不参与判断，标题里含 "digest" 的普通帖子不算精华。
+        
+        Args:
+            tbody: 帖子所在的 tbody 标签
+            
+        Returns:
+            (是否置顶, 是否精华)
+        """
+        is_sticky = 'sortnum' in tbody.get('class', [])
+        is_digest = False
+        for node in tbody.descendants:
+            if not isinstance(node, Tag):
+                continue
+            classes = node.get('class') or []
+            if 'icn' in classes and 'stk' in classes:
+                is_sticky = True
+            elif 'icn' in classes and 'dgt' in classes:
+                is_digest = True
+            elif node.name == 'img' and any(
+                'digest' in (node.get(name) or '').lower() for name in ('src', 'alt')
+            ):
+                is_digest = True
+            if is_sticky and is_digest:
+                break
+        return is_sticky, is_digest
+    
+    @staticmethod
+    def _parse_thread_row(
+        tbody,
+        forum_name_or_id: str,
+        forum_id: str
+    ) -> Optional[Thread]:
+        """解析帖子列表中的一行（normalthread_ tbody）
+        
+        Args:
+            tbody: id 以 normalthread 开头的 tbody 标签
+            forum_name_or_id: 调用方传入的版块名称或 ID
+            forum_id: 版块 ID
+            
+        Returns:
+            帖子对象，缺少标题或 ID 时返回 None
+        """
+        # 提取帖子 ID
+        thread_id = tbody.get('id', '').replace('normalthread_', '')
+        
+        # 查找标题链接
+        title_link = tbody.find('a', class_='s xst') or tbody.find('a', class_='xst')
+        if not title_link:
+            return None
+        
+        title = title_link.get_text(strip=True)
+        thread_url = title_link.get('href', '')
+        
+        # 如果 ID 不在 tbody 中，从 URL 提取
+        if not thread_id and 'tid=' in thread_url:
+            thread_id = thread_url.split('tid=')[1].split('&')[0]
+        elif not thread_id and 'thread-' in thread_url:
+            thread_id = thread_url.split('thread-')[1].split('-')[0]
+        
+        # 提取作者和发布时间（第一个 class='by' 的 TD）
+        by_tds = tbody.find_all('td', class_='by')
+        author = ''
+        created_at = None
+        last_reply_author = None
+        last_reply_time = None
+        
+        if len(by_tds) >= 1:
+            # 第一个 by TD：作者和发布时间
+            first_by = by_tds[0]
+            cite = first_by.find('cite')
+            if cite:
+                author_a = cite.find('a')
+                author = author_a.get_text(strip=True) if author_a else cite.get_text(strip=True)
+            
+            # 发布时间
+            time_em = first_by.find('em')
+            if time_em:
+                time_span = time_em.find('span')
+                if time_span:
+                    created_at = time_span.get_text(strip=True)
+        
+        if len(by_tds) >= 2:
+            # 第二个 by TD：最后回复者和时间
+            last_by = by_tds[1]
+            last_cite = last_by.find('cite')
+            if last_cite:
+                last_author_a = last_cite.find('a')
+                last_reply_author = last_author_a.get_text(strip=True) if last_author_a else last_cite.get_text(strip=True)
+            
+            # 最后回复时间
+            last_time_em = last_by.find('em')
+            if last_time_em:
+                last_time_span = last_time_em.find('span') or last_time_em.find('a')
+                if last_time_span:
+                    last_reply_time = last_time_span.get_text(strip=True)
+        
+        # 提取回复数和查看数
+        num_td = tbody.find('td', class_='num')
+        replies = 0
+        views = 0
+        if num_td:
+            # 回复数在 <a class="xi2"> 标签中
+            reply_link = num_td.find('a', class_='xi2')
+            if reply_link:
+                try:
+                    replies = int(reply_link.get_text(strip=True))
+                except:
+                    pass
+            
+            # 查看数在 <em> 标签中
+            view_em = num_td.find('em')
+            if view_em:
+                try:
+                    views = int(view_em.get_text(strip=True))
+                except:
+                    pass
+        
+        # 检查是否置顶、精华等
+        is_sticky, is_digest = ForumAPI._thread_flags(tbody)
+        
+        if not (title and thread_id):
+            return None
+        
+        return Thread(
+            id=thread_id,
+            title=title,
+            author=author,
+            forum=forum_name_or_id,
+            forum_id=forum_id,
+            views=views,
+            replies=replies,
+            created_at=created_at,
+            last_reply_author=last_reply_author,
+            last_reply_time=last_reply_time,
+            is_sticky=is_sticky,
+            is_digest=is_digest
+        )
+
 
@@ -0,0 +1,219 @@
+"""版块名称到版块 ID 的索引
+
+ForumAPI.get_thread_list 等接口接受版块名称，以前每次都要先请求并解析一遍
+版块首页才能找到 ID。ForumIndex 把版块列表保存在缓存目录的 forums.json 中
+（与 ``s1cli list`` 共用），按名称或别名直接查出 ID。
+
+``s1cli list`` 也直接使用这里的版块列表：过期时照常返回，同时在后台刷新。
+"""
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from s1cli.config import Config
+from s1cli.models.forum import Forum
+
+# 版块列表的默认有效期（秒）
+DEFAULT_TTL = 24 * 3600
+# 查不到名称时，两次刷新之间至少间隔的时间（秒），避免拼错的名称反复触发请求
+MISS_REFRESH_INTERVAL = 60
+
+
+def _normalize(name: str) -> str:
+    """名称规范化：去掉首尾空白，忽略大小写"""
+    return name.strip().casefold()
+
+
+class ForumIndex:
+    """版块名称/别名 → 版块 ID 索引
+
+    - ``forum_list.ttl``：版块列表的有效期（秒），默认 86400
+    - ``forum_list.aliases``：别名表，如 ``{"游戏" = "游戏论坛", "外野" = "75"}``，
+      值可以是版块名称或 ID
+    """
+
+    def __init__(self, config: Config):
+        """初始化索引
+
+        Args:
+            config: 配置对象
+        """
+        self.config = config
+        self.ttl = float(config.get("forum_list.ttl", DEFAULT_TTL))
+        self.aliases = {
+            _normalize(alias): str(target)
+            for alias, target in (config.get("forum_list.aliases", {}) or {}).items()
+        }
+        self._lock = threading.Lock()
+        self._ids: Optional[Dict[str, str]] = None
+        self._forums: List[Forum] = []
+        self._updated_at: Optional[float] = None
+        self._refreshing = False
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_miss_refresh = 0.0
+
+    def _load(self):
+        """首次使用时从缓存文件加载（调用方持有锁）"""
+        if self._ids is not None:
+            return
+        forums = [
+            Forum(
+                id=str(f['id']),
+                name=f['name'],
+                description=f.get('description'),
+                threads_count=f.get('threads_count', 0),
+                posts_count=f.get('posts_count', 0),
+                new_posts=f.get('new_posts', 0),
+                url=f.get('url'),
+                group=f.get('group')
+            )
+            for f in self.config.load_forum_list() or []
+            if f.get('name') and f.get('id')
+        ]
+        self._forums = forums
+        self._ids = {_normalize(f.name): f.id for f in forums}
+        self._updated_at = self.config.forum_list_updated_at()
+
+    def update(self, forums: List[Forum]):
+        """用新获取的版块列表更新索引并写入缓存
+
+        没有获取到版块时保留原有索引。
+
+        Args:
+            forums: 版块列表
+        """
+        if not forums:
+            return
+        self.config.save_forum_list(forums)
+        with self._lock:
+            self._forums = [f for f in forums if f.name and f.id]
+            self._ids = {_normalize(f.name): f.id for f in self._forums}
+            self._updated_at = time.time()
+    
+    def forums(self) -> Tuple[List[Forum], Optional[float]]:
+        """获取缓存的版块列表
+        
+        Returns:
+            (版块列表, 更新时间戳)；没有缓存时为 ([], None)
+        """
+        with self._lock:
+            self._load()
+            return list(self._forums), self._updated_at
+
+    def is_fresh(self) -> bool:
+        """版块列表是否在有效期内"""
+        with self._lock:
+            self._load()
+            return self._updated_at is not None and time.time() - self._updated_at < self.ttl
+
+    def lookup(self, name_or_id: str) -> Tuple[Optional[str], bool]:
+        """按名称、别名或 ID 查找版块 ID
+
+        Args:
+            name_or_id: 版块名称、别名或 ID
+
+        Returns:
+            (版块 ID, 索引是否在有效期内)；找不到时版块 ID 为 None
+        """
+        name_or_id = self.aliases.get(_normalize(name_or_id), name_or_id)
+        fresh = self.is_fresh()
+        if name_or_id.isdigit():
+            return name_or_id, fresh
+        with self._lock:
+            return self._ids.get(_normalize(name_or_id)), fresh
+
+    def should_refresh_on_miss(self) -> bool:
+        """查不到名称时是否需要刷新版块列表（限制刷新频率）"""
+        with self._lock:
+            now = time.time()
+            if now - self._last_miss_refresh < MISS_REFRESH_INTERVAL:
+                return False
+            self._last_miss_refresh = now
+            return True
+
+    def refresh_in_background(self, fetch: Callable[[], List[Forum]]):
+        """在后台线程中刷新版块列表，同一时间只有一个刷新任务
+
+        Args:
+            fetch: 获取版块列表的函数（如 ForumAPI.get_forum_list，获取后会自行调用 update）
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                fetch()
+            except Exception:
+                # 刷新失败时继续使用原有索引
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        self._thread = threading.Thread(target=run, name="s1cli-forum-index", daemon=True)
+        self._thread.start()
+    
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> bool:
+        """等待后台刷新线程结束
+        
+        后台线程是守护线程，命令行进程退出时会被直接结束；
+        输出完成后调用，让刷新结果写入缓存，供下次使用。
+        
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+            
+        Returns:
+            没有正在进行的刷新时返回 True，超时返回 False
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def refresh_in_background_async(self, fetch: Callable[[], Awaitable[List[Forum]]]):
+        """在当前事件循环中启动后台刷新任务（异步版本），同一时间只有一个刷新任务
+
+        Args:
+            fetch: 获取版块列表的协程函数（如 ForumAPI.get_forum_list_async）
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        async def run():
+            try:
+                await fetch()
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        # 保存引用，避免任务在完成前被回收
+        self._task = asyncio.get_running_loop().create_task(run())
+
+
+_shared_index: Optional[ForumIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_forum_index(config: Config) -> ForumIndex:
+    """获取进程内共享的版块索引
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        共享的版块索引
+    """
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = ForumIndex(config)
+        return _shared_index
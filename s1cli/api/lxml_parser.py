@@ -0,0 +1,311 @@
+"""基于 lxml 的帖子页面解析
+
+与 ThreadAPI 中基于 BeautifulSoup 的解析结果完全一致，但直接在 lxml 树上
+用预编译的 XPath 定位元素，不需要构造 BeautifulSoup 树，也不会在 Python 中
+逐个节点匹配 ``id=lambda x: ...`` 之类的条件。
+
+通过配置 ``parser.backend = lxml`` 启用。
+"""
+import re
+from typing import Iterator, List, Optional, Set
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from s1cli.models.thread import Thread, Post
+from s1cli.utils import linkify_urls
+
+
+def _has_class(name: str) -> str:
+    """生成按 class 匹配的 XPath 条件（与 BeautifulSoup 的 class_ 一致）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 页面级元素
+_THREAD_SUBJECT = etree.XPath("(//span[@id='thread_subject'])[1]")
+_THREAD_TITLE = etree.XPath(f"(//h1[{_has_class('ts')}])[1]")
+_STATS_DIV = etree.XPath("(//div[normalize-space(@class)='hm ptn'])[1]")
+_PAGE_INFO = etree.XPath("(//span[contains(@title, '共') and contains(@title, '页')])[1]")
+_POST_DIVS = etree.XPath("//div[starts-with(@id, 'post_')]")
+_FIRST_MESSAGE = etree.XPath("(//td[starts-with(@id, 'postmessage_')])[1]")
+_FIRST_AUTHI = etree.XPath(f"(//div[{_has_class('authi')}])[1]")
+
+# 回复内的元素
+_STAT_NUMBERS = etree.XPath(f".//span[{_has_class('xi1')}]")
+_POSTNUM = etree.XPath("(.//a[starts-with(@id, 'postnum')])[1]")
+_FIRST_EM = etree.XPath("(.//em)[1]")
+_AUTHI = etree.XPath(f"(.//div[{_has_class('authi')}])[1]")
+_AUTHOR_LINK = etree.XPath(f"(.//a[{_has_class('xw1')}])[1]")
+_POST_TIME = etree.XPath("(.//em[starts-with(@id, 'authorposton')])[1]")
+_MESSAGE = etree.XPath("(.//td[starts-with(@id, 'postmessage_')])[1]")
+
+_TOTAL_PAGES = re.compile(r'共\s*(\d+)\s*页')
+_FLOOR_NAMES = {"沙发": 2, "板凳": 3, "地板": 4}
+
+# get_text 不包含这些标签内的文本
+_NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _first(xpath: etree.XPath, node) -> Optional[etree._Element]:
+    """返回 XPath 的第一个结果"""
+    result = xpath(node)
+    return result[0] if result else None
+
+
+def _is_removed(element: etree._Element) -> bool:
+    """内容区中需要去掉的元素：引用和签名"""
+    if element.tag != "div":
+        return False
+    return "quote" in (element.get("class") or "").split() or "sign_" in (element.get("id") or "")
+
+
+def _is_link(element: etree._Element) -> bool:
+    """内容区中需要替换为完整 URL 的链接"""
+    if element.tag != "a":
+        return False
+    href = element.get("href") or ""
+    return "http://" in href or "https://" in href
+
+
+def _strings(element: etree._Element, content: bool = False) -> Iterator[str]:
+    """按 BeautifulSoup get_text 的规则产出元素内的文本片段
+
+    跳过注释以及 script/style/template 中的文本。``content`` 为 True 时
+    额外去掉引用和签名，并把外部链接替换为其 href，对应解析内容区时的处理。
+
+    Args:
+        element: lxml 元素
+        content: 是否按内容区处理
+
+    Yields:
+        文本片段
+    """
+    if element.text and element.tag not in _NON_TEXT_TAGS:
+        yield element.text
+    for child in element:
+        # 注释、处理指令的 tag 不是字符串
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            if content and _is_removed(child):
+                pass
+            elif content and _is_link(child):
+                yield child.get("href")
+            else:
+                yield from _strings(child, content)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element: etree._Element) -> str:
+    """等价于 get_text(strip=True)"""
+    return "".join(s.strip() for s in _strings(element))
+
+
+def _content(message: etree._Element) -> str:
+    """提取内容区文本（去掉引用和签名，外部链接替换为跳转提示）"""
+    content = "\n".join(s.strip() for s in _strings(message, content=True) if s.strip())
+    return linkify_urls(content)
+
+
+def parse_message(fragment: str) -> str:
+    """从回复内容的 HTML 片段提取文本，规则与解析帖子页面时相同
+
+    Args:
+        fragment: 回复内容 HTML（如移动端接口返回的 message）
+
+    Returns:
+        回复文本
+    """
+    if not fragment.strip():
+        return ''
+    message = lxml_html.fragment_fromstring(fragment, create_parent="td")
+    return _content(message)
+
+
+def _post_time(element: Optional[etree._Element]) -> Optional[str]:
+    """提取发表时间，去掉 "发表于" 前缀"""
+    if element is None:
+        return None
+    time_text = _text(element)
+    if '发表于' in time_text:
+        return time_text.replace('发表于', '').strip()
+    return time_text
+
+
+def _author(container: Optional[etree._Element]) -> str:
+    """从 authi 区域提取作者名"""
+    if container is None:
+        return ''
+    link = _first(_AUTHOR_LINK, container)
+    return _text(link) if link is not None else ''
+
+
+def parse_post(post_div: etree._Element, thread_id: str) -> Optional[Post]:
+    """解析单个 post_ div
+
+    Args:
+        post_div: id 以 post_ 开头的 div 元素
+        thread_id: 帖子 ID
+
+    Returns:
+        回复对象（包括楼主），没有回复 ID 时返回 None
+    """
+    post_id = (post_div.get('id') or '').replace('post_', '')
+    if not post_id:
+        return None
+
+    floor = 0
+    postnum_link = _first(_POSTNUM, post_div)
+    if postnum_link is not None:
+        floor_em = _first(_FIRST_EM, postnum_link)
+        if floor_em is not None:
+            floor_text = _text(floor_em)
+            try:
+                floor = int(floor_text)
+            except ValueError:
+                # 可能是 "沙发"、"板凳" 等
+                floor = _FLOOR_NAMES.get(floor_text, 0)
+        elif '楼主' in "".join(_strings(postnum_link)):
+            floor = 1
+
+    message = _first(_MESSAGE, post_div)
+
+    return Post(
+        id=post_id,
+        thread_id=thread_id,
+        floor=floor,
+        author=_author(_first(_AUTHI, post_div)),
+        content=_content(message) if message is not None else '',
+        post_time=_post_time(_first(_POST_TIME, post_div))
+    )
+
+
+def is_page_element(element: etree._Element) -> bool:
+    """流式解析帖子页面时需要的页面级元素：标题、浏览/回复数和总页数
+
+    回复内容中的同类元素不算在内。
+
+    Args:
+        element: 刚闭合的 lxml 元素
+
+    Returns:
+        是否交给 read_page_element 处理
+    """
+    tag = element.tag
+    if tag == 'span':
+        title = element.get('title') or ''
+        matched = element.get('id') == 'thread_subject' or ('共' in title and '页' in title)
+    elif tag == 'h1':
+        matched = 'ts' in (element.get('class') or '').split()
+    elif tag == 'div':
+        matched = ' '.join((element.get('class') or '').split()) == 'hm ptn'
+    else:
+        return False
+    return matched and not any(
+        (parent.get('id') or '').startswith('post_') for parent in element.iterancestors('div')
+    )
+
+
+def read_page_element(element: etree._Element, thread: Thread, found: Set[str]):
+    """把页面级元素中的信息写入帖子对象
+
+    与 parse_thread 一致，每种元素只取文档中的第一个，标题优先取 thread_subject。
+
+    Args:
+        element: is_page_element 为 True 的元素
+        thread: 帖子对象
+        found: 已经读取过的元素种类，读取后加入本次的种类
+    """
+    if element.tag == 'span' and element.get('id') == 'thread_subject':
+        kind = 'subject'
+    elif element.tag == 'h1':
+        kind = 'title'
+    elif element.tag == 'span':
+        kind = 'page_info'
+    else:
+        kind = 'stats'
+    if kind in found:
+        return
+    found.add(kind)
+
+    if kind == 'subject' or (kind == 'title' and 'subject' not in found):
+        thread.title = _text(element)
+    elif kind == 'page_info':
+        match = _TOTAL_PAGES.search(element.get('title', ''))
+        if match:
+            thread.total_pages = int(match.group(1))
+    elif kind == 'stats':
+        numbers = _STAT_NUMBERS(element)
+        if len(numbers) >= 2:
+            try:
+                thread.views = int(_text(numbers[0]))
+                thread.replies = int(_text(numbers[1]))
+            except ValueError:
+                pass
+
+
+def parse_thread(html: str, thread_id: str, page: int) -> Thread:
+    """从帖子页面 HTML 解析帖子详情
+
+    Args:
+        html: 页面 HTML
+        thread_id: 帖子 ID
+        page: 页码
+
+    Returns:
+        帖子对象，posts 为本页除楼主外的回复
+    """
+    root = lxml_html.document_fromstring(html.encode("utf-8"), parser=_PARSER)
+
+    title_elem = _first(_THREAD_SUBJECT, root)
+    if title_elem is None:
+        title_elem = _first(_THREAD_TITLE, root)
+    title = _text(title_elem) if title_elem is not None else "未知标题"
+
+    post_divs = _POST_DIVS(root)
+    created_time = _post_time(_first(_POST_TIME, post_divs[0])) if post_divs else None
+
+    views = 0
+    replies = 0
+    stats_div = _first(_STATS_DIV, root)
+    if stats_div is not None:
+        numbers = _STAT_NUMBERS(stats_div)
+        if len(numbers) >= 2:
+            try:
+                views = int(_text(numbers[0]))
+                replies = int(_text(numbers[1]))
+            except ValueError:
+                pass
+
+    first_message = _first(_FIRST_MESSAGE, root)
+
+    total_pages = 1
+    page_info = _first(_PAGE_INFO, root)
+    if page_info is not None:
+        match = _TOTAL_PAGES.search(page_info.get('title', ''))
+        if match:
+            total_pages = int(match.group(1))
+
+    posts: List[Post] = []
+    for post_div in post_divs:
+        try:
+            post = parse_post(post_div, thread_id)
+        except Exception:
+            # 跳过解析失败的回复
+            continue
+        if post and post.floor > 1:  # 跳过楼主（楼层1），只保留回复
+            posts.append(post)
+
+    return Thread(
+        id=thread_id,
+        title=title,
+        author=_author(_first(_FIRST_AUTHI, root)),
+        content=_content(first_message) if first_message is not None else '',
+        views=views,
+        replies=replies,
+        created_at=created_time,
+        current_page=page,
+        total_pages=total_pages,
+        posts=posts
+    )
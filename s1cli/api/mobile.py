@@ -0,0 +1,313 @@
+"""Discuz 移动端 JSON 接口
+
+Discuz X 提供 ``api/mobile/index.php?module=forumindex|forumdisplay|viewthread``，
+返回 JSON 格式的版块列表、帖子列表和帖子内容，体积只有桌面版 HTML 的一小部分，
+也不需要解析整个页面。
+
+通过配置 ``api.backend = mobile`` 启用。某个模块不可用时（站点关闭了移动端接口、
+返回的不是 JSON 等），对应的 API 自动退回解析 HTML 页面，之后不再请求该模块。
+"""
+import html
+import math
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from s1cli.api.client import S1Client
+from s1cli.api.lxml_parser import parse_message
+from s1cli.models.forum import Forum
+from s1cli.models.thread import Thread, Post
+
+MOBILE_PATH = "api/mobile/index.php"
+MOBILE_VERSION = "4"
+
+# 各模块返回的 Variables 中必须包含的字段，缺少时说明本次请求出错
+_REQUIRED_KEYS = {
+    "forumindex": "forumlist",
+    "forumdisplay": "forum_threadlist",
+    "viewthread": "postlist",
+}
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _plain(value: Any) -> str:
+    """去掉 HTML 标签并反转义实体
+
+    dateline 等字段可能是 ``<span title="2025-10-28 10:00">3 天前</span>``，
+    此时取 title 中的完整时间。
+    """
+    text = str(value or "")
+    match = re.search(r'title="([^"]+)"', text)
+    if match:
+        return html.unescape(match.group(1))
+    return html.unescape(_TAG.sub("", text)).strip()
+
+
+def _int(value: Any) -> int:
+    """把接口返回的数字字符串转成整数，无法转换时返回 0"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def build_params(module: str, **params: Any) -> Dict[str, Any]:
+    """构造移动端接口的查询参数
+
+    Args:
+        module: 模块名
+        **params: 模块参数（如 fid、tid、page）
+
+    Returns:
+        查询参数字典
+    """
+    return {"version": MOBILE_VERSION, "module": module, **params}
+
+
+def load_variables(response: httpx.Response, module: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """从接口响应中取出 Variables
+
+    Args:
+        response: 接口响应
+        module: 模块名
+
+    Returns:
+        (模块是否可用, Variables 字典)。响应不是 JSON 时模块不可用；
+        是 JSON 但缺少该模块的数据时（帖子不存在、没有权限等）模块可用，
+        但 Variables 为 None，本次请求需要退回 HTML
+    """
+    if response.status_code != 200:
+        return False, None
+    try:
+        payload = response.json()
+    except ValueError:
+        return False, None
+    variables = payload.get("Variables") if isinstance(payload, dict) else None
+    if not isinstance(variables, dict):
+        return False, None
+    if _REQUIRED_KEYS[module] not in variables:
+        return True, None
+    return True, variables
+
+
+def parse_forum_index(variables: Dict[str, Any]) -> List[Forum]:
+    """把 forumindex 的数据转换为版块列表
+
+    与解析 HTML 时一致：子版块排在所属版块之后，不带描述和统计数，
+    分区取自 catlist，子版块沿用所属版块的分区。
+
+    Args:
+        variables: forumindex 返回的 Variables
+
+    Returns:
+        版块列表
+    """
+    groups = {}
+    for category in variables.get("catlist") or []:
+        for fid in category.get("forums") or []:
+            groups[str(fid)] = _plain(category.get("name")) or None
+
+    forums = []
+    for item in variables.get("forumlist") or []:
+        forum_id = str(item.get("fid", ""))
+        name = _plain(item.get("name"))
+        if not forum_id or not name:
+            continue
+
+        forums.append(Forum(
+            id=forum_id,
+            name=name,
+            description=_plain(item.get("description")) or None,
+            threads_count=_int(item.get("threads")),
+            posts_count=_int(item.get("posts")),
+            new_posts=_int(item.get("todayposts")),
+            url=f"forum-{forum_id}-1.html",
+            group=groups.get(forum_id)
+        ))
+
+        for sub in item.get("sublist") or []:
+            sub_id = str(sub.get("fid", ""))
+            sub_name = _plain(sub.get("name"))
+            if sub_id and sub_name:
+                forums.append(Forum(
+                    id=sub_id,
+                    name=sub_name,
+                    new_posts=_int(sub.get("todayposts")),
+                    url=f"forum-{sub_id}-1.html",
+                    group=groups.get(forum_id)
+                ))
+    return forums
+
+
+def parse_forum_display(
+    variables: Dict[str, Any],
+    forum_name_or_id: str,
+    forum_id: str
+) -> Tuple[List[Thread], int]:
+    """把 forumdisplay 的数据转换为帖子列表
+
+    Args:
+        variables: forumdisplay 返回的 Variables
+        forum_name_or_id: 调用方传入的版块名称或 ID
+        forum_id: 版块 ID
+
+    Returns:
+        (帖子列表, 总页数)
+    """
+    threads = []
+    for item in variables.get("forum_threadlist") or []:
+        thread_id = str(item.get("tid", ""))
+        title = _plain(item.get("subject"))
+        if not thread_id or not title:
+            continue
+
+        threads.append(Thread(
+            id=thread_id,
+            title=title,
+            author=_plain(item.get("author")),
+            author_id=str(item.get("authorid") or "") or None,
+            forum=forum_name_or_id,
+            forum_id=forum_id,
+            views=_int(item.get("views")),
+            replies=_int(item.get("replies")),
+            created_at=_plain(item.get("dateline")) or None,
+            last_reply_author=_plain(item.get("lastposter")) or None,
+            last_reply_time=_plain(item.get("lastpost")) or None,
+            is_sticky=_int(item.get("displayorder")) > 0,
+            is_locked=_int(item.get("closed")) > 0,
+            is_digest=_int(item.get("digest")) > 0
+        ))
+
+    forum = variables.get("forum") or {}
+    per_page = _int(variables.get("tpp")) or 50
+    total_pages = max(1, math.ceil(_int(forum.get("threads")) / per_page))
+    return threads, total_pages
+
+
+def parse_view_thread(variables: Dict[str, Any], thread_id: str, page: int) -> Thread:
+    """把 viewthread 的数据转换为帖子详情
+
+    回复内容是 HTML 片段，按解析页面时的规则提取文本（去掉引用和签名，
+    外部链接替换为完整 URL）。
+
+    Args:
+        variables: viewthread 返回的 Variables
+        thread_id: 帖子 ID
+        page: 页码
+
+    Returns:
+        帖子对象，posts 为本页除楼主外的回复
+    """
+    info = variables.get("thread") or {}
+    per_page = _int(variables.get("ppp")) or 30
+    replies = _int(info.get("replies"))
+
+    page_posts = []
+    posts = []
+    for item in variables.get("postlist") or []:
+        post = Post(
+            id=str(item.get("pid", "")),
+            thread_id=thread_id,
+            floor=_int(item.get("position") or item.get("number")),
+            author=_plain(item.get("author")),
+            author_id=str(item.get("authorid") or "") or None,
+            content=parse_message(item.get("message") or ""),
+            post_time=_plain(item.get("dateline")) or None
+        )
+        page_posts.append(post)
+        if str(item.get("first")) != "1" and post.floor > 1:
+            posts.append(post)
+
+    # 与解析 HTML 时一致：楼主信息取本页第一楼，不在第一页时就是本页最早的回复
+    first_post = page_posts[0] if page_posts else None
+    return Thread(
+        id=thread_id,
+        title=_plain(info.get("subject")) or "未知标题",
+        author=first_post.author if first_post else _plain(info.get("author")),
+        author_id=first_post.author_id if first_post else str(info.get("authorid") or "") or None,
+        forum_id=str(info.get("fid") or variables.get("fid") or "") or None,
+        content=first_post.content if first_post else '',
+        views=_int(info.get("views")),
+        replies=replies,
+        created_at=first_post.post_time if first_post else None,
+        current_page=page,
+        total_pages=max(1, math.ceil((replies + 1) / per_page)),
+        posts=posts
+    )
+
+
+class MobileBackend:
+    """移动端接口请求
+
+    记录不可用的模块，之后对这些模块直接返回 None，由调用方退回解析 HTML。
+    """
+
+    def __init__(self, client: S1Client):
+        """初始化移动端接口
+
+        Args:
+            client: HTTP 客户端（S1Client 或 AsyncS1Client）
+        """
+        self.client = client
+        self.unavailable: Set[str] = set()
+
+    def _accept(self, response: httpx.Response, module: str) -> Optional[Dict[str, Any]]:
+        """检查响应，模块不可用时记录下来"""
+        available, variables = load_variables(response, module)
+        if not available:
+            self.unavailable.add(module)
+        return variables
+
+    def fetch(self, module: str, **params: Any) -> Optional[Dict[str, Any]]:
+        """请求移动端接口
+
+        Args:
+            module: 模块名（forumindex/forumdisplay/viewthread）
+            **params: 模块参数
+
+        Returns:
+            Variables 字典，模块不可用或本次请求出错时返回 None
+
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if module in self.unavailable:
+            return None
+        response = self.client.get(MOBILE_PATH, params=build_params(module, **params))
+        return self._accept(response, module)
+
+    async def fetch_async(self, module: str, **params: Any) -> Optional[Dict[str, Any]]:
+        """请求移动端接口（异步版本，需要使用 AsyncS1Client）
+
+        Args:
+            module: 模块名（forumindex/forumdisplay/viewthread）
+            **params: 模块参数
+
+        Returns:
+            Variables 字典，模块不可用或本次请求出错时返回 None
+
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if module in self.unavailable:
+            return None
+        response = await self.client.get(MOBILE_PATH, params=build_params(module, **params))
+        return self._accept(response, module)
+
+
+def get_mobile_backend(client: S1Client) -> Optional[MobileBackend]:
+    """根据配置 ``api.backend`` 创建移动端接口
+
+    Args:
+        client: HTTP 客户端
+
+    Returns:
+        设为 mobile 时返回移动端接口，否则返回 None（只解析 HTML）
+    """
+    if str(client.config.get("api.backend", "html")).lower() != "mobile":
+        return None
+    return MobileBackend(client)
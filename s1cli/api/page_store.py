@@ -0,0 +1,320 @@
+"""压缩的内容寻址页面存储
+
+ResponseCache 的响应体按内容的 SHA-256 存放在 ``blobs/`` 下，内容相同的页面
+（不同登录身份请求的同一页、超出总页数时返回的同一最后一页等）只保存一份。
+写入前压缩：安装了 zstandard 时使用 zstd，否则使用 zlib。
+
+索引是只追加的日志 ``index.log``，每行记录一次写入、访问或删除。启动时顺序
+读一遍即可恢复所有条目的大小和最近访问时间，不需要读取或 stat 页面文件；
+日志过长时改写为当前条目的快照。追加和改写都持有文件锁 ``index.lock``，
+多个进程同时使用时改写期间追加的记录不会丢失。总大小超过上限时按最近访问时间淘汰。
+"""
+import hashlib
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from s1cli.utils import locked_file
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖：pip install s1cli[zstd]
+    zstandard = None
+
+# 两次记录同一条目的访问时间之间至少间隔的时间（秒），避免每次读取都追加日志
+TOUCH_INTERVAL = 60
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    """按编码压缩数据"""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """按编码解压数据"""
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def resolve_codec(codec: str = "auto") -> str:
+    """确定实际使用的压缩编码
+
+    Args:
+        codec: auto、zstd 或 zlib；auto 在安装了 zstandard 时使用 zstd
+
+    Returns:
+        zstd 或 zlib（没有安装 zstandard 时总是 zlib）
+    """
+    codec = str(codec).lower()
+    if codec in ("auto", "zstd") and zstandard is not None:
+        return "zstd"
+    return "zlib"
+
+
+@dataclass
+class _Entry:
+    """索引中的一个页面"""
+    codec: str
+    size: int  # 压缩后的大小
+    raw_size: int  # 原始大小
+    accessed_at: float
+
+
+class PageStore:
+    """压缩的内容寻址页面存储
+
+    - ``put`` 返回内容的 SHA-256，之后用它 ``get`` 原始内容
+    - 多个进程可以同时使用：页面文件先写临时文件再改名，索引行持有文件锁追加写入；
+      其他进程写入、本进程索引中没有的页面在读取时按文件名找到
+    """
+
+    def __init__(self, root: Path, max_size: int = 100 * 1024 * 1024, codec: str = "auto"):
+        """打开（必要时创建）页面存储
+
+        Args:
+            root: 存储目录
+            max_size: 压缩后的总大小上限（字节）
+            codec: 新页面的压缩编码（auto/zstd/zlib）
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.log"
+        self.lock_path = self.root / "index.lock"
+        self.max_size = max_size
+        self.codec = resolve_codec(codec)
+        # 本进程淘汰过的页面数，调用方据此清理指向已淘汰页面的引用
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._total_size = 0
+        self._log_lines = 0
+        self._load()
+
+    def _load(self):
+        """读取索引日志，恢复所有条目（调用方持有锁或在初始化中）
+
+        日志行格式（制表符分隔）：
+        ``P 摘要 编码 压缩大小 原始大小 时间``、``T 摘要 时间``、``D 摘要``。
+        无法解析的行（如写入中途被中断）直接跳过。
+        """
+        entries: Dict[str, _Entry] = {}
+        lines = 0
+        try:
+            with open(self.index_path, "r", encoding="ascii", errors="replace") as f:
+                for line in f:
+                    lines += 1
+                    fields = line.rstrip("\n").split("\t")
+                    try:
+                        if fields[0] == "P":
+                            entries[fields[1]] = _Entry(
+                                fields[2], int(fields[3]), int(fields[4]), float(fields[5])
+                            )
+                        elif fields[0] == "T" and fields[1] in entries:
+                            entries[fields[1]].accessed_at = float(fields[2])
+                        elif fields[0] == "D":
+                            entries.pop(fields[1], None)
+                    except (IndexError, ValueError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+        self._entries = entries
+        self._total_size = sum(entry.size for entry in entries.values())
+        self._log_lines = lines
+
+    def _append(self, *lines: str):
+        """向索引日志追加记录
+
+        与改写日志使用同一个文件锁，其他进程改写期间等待改写完成后再追加。
+        """
+        try:
+            with locked_file(self.lock_path), open(self.index_path, "a", encoding="ascii") as f:
+                f.write("".join(line + "\n" for line in lines))
+        except OSError:
+            return
+        self._log_lines += len(lines)
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        """页面文件路径（按摘要前两位分目录）"""
+        return self.blob_dir / digest[:2] / f"{digest}.{codec}"
+
+    def put(self, data: bytes) -> str:
+        """保存页面内容
+
+        内容已经存在时只更新访问时间。
+
+        Args:
+            data: 原始内容
+
+        Returns:
+            内容的 SHA-256（十六进制）
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and self._blob_path(digest, entry.codec).exists():
+                self._touch(digest, entry, now)
+                return digest
+
+            compressed = _compress(data, self.codec)
+            path = self._blob_path(digest, self.codec)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                path.parent.mkdir(exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+            except OSError:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                return digest
+
+            if entry is not None:
+                self._total_size -= entry.size
+            self._entries[digest] = _Entry(self.codec, len(compressed), len(data), now)
+            self._total_size += len(compressed)
+            self._append(f"P\t{digest}\t{self.codec}\t{len(compressed)}\t{len(data)}\t{now:.0f}")
+            self._evict()
+            self._maybe_compact()
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """读取页面内容
+
+        Args:
+            digest: put 返回的 SHA-256
+
+        Returns:
+            原始内容，页面不存在（已淘汰）时返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(digest)
+            codecs = [entry.codec] if entry is not None else ["zstd", "zlib"]
+            for codec in codecs:
+                if codec == "zstd" and zstandard is None:
+                    continue
+                try:
+                    data = _decompress(self._blob_path(digest, codec).read_bytes(), codec)
+                except FileNotFoundError:
+                    continue
+                except Exception:
+                    # 文件损坏时当作不存在
+                    break
+
+                if entry is None:
+                    # 其他进程写入的页面，加入本进程的索引（日志中已有它的写入记录）
+                    entry = _Entry(codec, self._blob_path(digest, codec).stat().st_size, len(data), 0.0)
+                    self._entries[digest] = entry
+                    self._total_size += entry.size
+                self._touch(digest, entry, time.time())
+                self._maybe_compact()
+                return data
+
+            if entry is not None:
+                # 页面文件已被删除（如其他进程淘汰），同步索引
+                self._forget(digest)
+            return None
+
+    def __contains__(self, digest: str) -> bool:
+        """页面是否存在（包括其他进程写入、本进程索引中还没有的页面）"""
+        with self._lock:
+            if digest in self._entries:
+                return True
+        return any(self._blob_path(digest, codec).exists() for codec in ("zstd", "zlib"))
+
+    def _touch(self, digest: str, entry: _Entry, now: float):
+        """更新访问时间（调用方持有锁）"""
+        if now - entry.accessed_at >= TOUCH_INTERVAL:
+            entry.accessed_at = now
+            self._append(f"T\t{digest}\t{now:.0f}")
+
+    def _forget(self, digest: str):
+        """从索引中删除条目（调用方持有锁）"""
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            self._total_size -= entry.size
+            self._append(f"D\t{digest}")
+
+    def _evict(self):
+        """总大小超过上限时，按最近访问时间淘汰到上限的 90%（调用方持有锁）"""
+        if self._total_size <= self.max_size:
+            return
+
+        target = self.max_size * 0.9
+        removed = []
+        for digest, entry in sorted(self._entries.items(), key=lambda item: item[1].accessed_at):
+            if self._total_size <= target:
+                break
+            try:
+                self._blob_path(digest, entry.codec).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del self._entries[digest]
+            self._total_size -= entry.size
+            removed.append(digest)
+
+        if removed:
+            self.evictions += len(removed)
+            self._append(*(f"D\t{digest}" for digest in removed))
+
+    def _maybe_compact(self):
+        """日志行数远多于条目数时，改写为当前条目的快照（调用方持有锁）
+
+        持有文件锁改写，改写前重新读取日志，合并其他进程追加的记录。
+        """
+        if self._log_lines <= 2 * len(self._entries) + 1024:
+            return
+
+        try:
+            with locked_file(self.lock_path):
+                self._load()
+                tmp_path = self.index_path.with_name(f".index.{os.getpid()}.tmp")
+                with open(tmp_path, "w", encoding="ascii") as f:
+                    for digest, entry in self._entries.items():
+                        f.write(
+                            f"P\t{digest}\t{entry.codec}\t{entry.size}\t{entry.raw_size}\t{entry.accessed_at:.0f}\n"
+                        )
+                os.replace(tmp_path, self.index_path)
+                self._log_lines = len(self._entries)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """存储统计
+
+        Returns:
+            包含 entries（页面数）、size（压缩后总大小）、raw_size（原始总大小）的字典
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self._total_size,
+                "raw_size": sum(entry.raw_size for entry in self._entries.values()),
+            }
+
+    def clear(self):
+        """删除所有页面和索引"""
+        with self._lock:
+            for path in self.blob_dir.glob("*/*"):
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+            try:
+                self.index_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._entries = {}
+            self._total_size = 0
+            self._log_lines = 0
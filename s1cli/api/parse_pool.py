@@ -0,0 +1,155 @@
+"""多进程页面解析
+
+页面解析是纯 Python 的 CPU 密集型工作，解析期间一直持有 GIL，
+多页并发获取时响应虽然同时到达，解析仍然只能用一个核心。
+
+ParsePool 把原始响应字节交给 ProcessPoolExecutor 中的子进程解析，
+子进程直接返回 Thread/Post 对象。通过配置 ``parser.workers`` 启用，
+默认不启用。
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from s1cli.config import Config
+from s1cli.models.thread import Thread
+
+
+def _decode(content: bytes, encoding: Optional[str]) -> str:
+    """按响应编码解码页面（与 httpx 的 Response.text 一致）"""
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def _parse_thread(
+    content: bytes,
+    encoding: Optional[str],
+    thread_id: str,
+    page: int,
+    backend: str
+) -> Thread:
+    """在子进程中解析帖子页面"""
+    if backend == "lxml":
+        from s1cli.api import lxml_parser
+        return lxml_parser.parse_thread(_decode(content, encoding), thread_id, page)
+
+    from s1cli.api.thread import _parse_thread_page
+    return _parse_thread_page(_decode(content, encoding), thread_id, page)
+
+
+def _parse_thread_list(
+    content: bytes,
+    encoding: Optional[str],
+    forum_name_or_id: str,
+    forum_id: str
+) -> Tuple[List[Thread], int]:
+    """在子进程中解析版块帖子列表页面"""
+    from s1cli.api.forum import ForumAPI
+    return ForumAPI._parse_thread_list(_decode(content, encoding), forum_name_or_id, forum_id)
+
+
+class ParsePool:
+    """多进程页面解析池
+
+    子进程在第一次提交任务时才启动，使用 spawn 方式创建：
+    父进程里有正在收发请求的线程，fork 出的子进程可能继承到被锁住的状态。
+    """
+
+    def __init__(self, workers: int):
+        """初始化解析池
+
+        Args:
+            workers: 子进程数
+        """
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """获取进程池，首次调用时启动子进程"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit_thread(
+        self,
+        content: bytes,
+        encoding: Optional[str],
+        thread_id: str,
+        page: int,
+        backend: str = "bs4"
+    ) -> "Future[Thread]":
+        """提交帖子页面解析任务
+
+        Args:
+            content: 响应原始字节
+            encoding: 响应编码
+            thread_id: 帖子 ID
+            page: 页码
+            backend: 解析引擎（bs4/lxml）
+
+        Returns:
+            结果为帖子对象的 Future
+        """
+        return self._get_executor().submit(_parse_thread, content, encoding, thread_id, page, backend)
+
+    def submit_thread_list(
+        self,
+        content: bytes,
+        encoding: Optional[str],
+        forum_name_or_id: str,
+        forum_id: str
+    ) -> "Future[Tuple[List[Thread], int]]":
+        """提交版块帖子列表解析任务
+
+        Args:
+            content: 响应原始字节
+            encoding: 响应编码
+            forum_name_or_id: 调用方传入的版块名称或 ID
+            forum_id: 版块 ID
+
+        Returns:
+            结果为 (帖子列表, 总页数) 的 Future
+        """
+        return self._get_executor().submit(_parse_thread_list, content, encoding, forum_name_or_id, forum_id)
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_shared_pool: Optional[ParsePool] = None
+_shared_lock = threading.Lock()
+
+
+def get_parse_pool(config: Config) -> Optional[ParsePool]:
+    """获取进程内共享的解析池
+
+    首次调用时根据配置 ``parser.workers`` 创建：设为正整数时使用对应数量的
+    子进程，设为 auto 时使用 CPU 核心数，未设置或为 0 时不启用。
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        共享的解析池，未启用时返回 None
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            workers = str(config.get("parser.workers", 0)).lower()
+            count = (os.cpu_count() or 1) if workers == "auto" else int(workers)
+            if count <= 0:
+                return None
+            _shared_pool = ParsePool(count)
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool
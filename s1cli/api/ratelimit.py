@@ -0,0 +1,188 @@
+"""请求频率限制"""
+import asyncio
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from s1cli.config import Config
+from s1cli.utils import locked_file
+
+
+class TokenBucket:
+    """令牌桶限制器
+
+    令牌以 ``rate`` 个/秒的速度补充，最多积攒 ``burst`` 个，每个请求消耗一个。
+    令牌不足时允许余额为负，相当于提前预约后面的时间槽，并发请求会依次排队。
+    需要等待时再叠加 0~``jitter`` 秒的随机抖动，避免请求间隔过于规律。
+
+    指定 ``state_file`` 时，令牌余额保存在加锁的状态文件中，
+    同一台机器上所有 s1cli 进程（命令行、TUI、定时任务）共用一份额度。
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: float = 3.0,
+        jitter: float = 0.5,
+        state_file: Optional[Path] = None
+    ):
+        """初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数
+            burst: 令牌桶容量（允许的突发请求数）
+            jitter: 需要等待时附加的最大随机延迟（秒）
+            state_file: 跨进程共享的状态文件，为 None 时只在进程内共享
+        """
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.jitter = max(jitter, 0.0)
+        self.state_file = Path(state_file) if state_file else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+
+    def _take(self, tokens: float, updated: float) -> Tuple[float, float, float]:
+        """补充令牌并取走一个
+
+        Args:
+            tokens: 上次记录的令牌余额
+            updated: 上次记录的时间戳
+
+        Returns:
+            (新余额, 新时间戳, 需要等待的秒数)
+        """
+        now = time.time()
+        tokens = min(self.burst, tokens + max(now - updated, 0.0) * self.rate)
+        tokens -= 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def _drain(self, tokens: float, updated: float, seconds: float) -> Tuple[float, float, float]:
+        """补充令牌后把余额压到 ``seconds`` 秒之后才能恢复的负值
+
+        Args:
+            tokens: 上次记录的令牌余额
+            updated: 上次记录的时间戳
+            seconds: 暂停的秒数
+
+        Returns:
+            (新余额, 新时间戳, 0)
+        """
+        now = time.time()
+        tokens = min(self.burst, tokens + max(now - updated, 0.0) * self.rate)
+        return min(tokens, -seconds * self.rate), now, 0.0
+
+    def _update_shared(self, update: Callable[[float, float], Tuple[float, float, float]]) -> float:
+        """在状态文件上加锁并更新令牌余额
+
+        Args:
+            update: 根据 (余额, 时间戳) 计算 (新余额, 新时间戳, 等待秒数) 的函数
+
+        Returns:
+            需要等待的秒数
+        """
+        with locked_file(self.state_file) as f:
+            try:
+                state = json.loads(f.read() or b"{}")
+                tokens = float(state.get("tokens", self.burst))
+                updated = float(state.get("updated", 0.0))
+            except (ValueError, TypeError):
+                tokens, updated = self.burst, 0.0
+
+            tokens, updated, wait = update(tokens, updated)
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps({"tokens": tokens, "updated": updated}).encode("utf-8"))
+            f.flush()
+        return wait
+
+    def _update(self, update: Callable[[float, float], Tuple[float, float, float]]) -> float:
+        """更新令牌余额，优先使用共享状态文件"""
+        with self._lock:
+            if self.state_file is not None:
+                try:
+                    return self._update_shared(update)
+                except OSError:
+                    # 状态文件不可用时退回进程内限制
+                    pass
+            self._tokens, self._updated, wait = update(self._tokens, self._updated)
+            return wait
+
+    def reserve(self) -> float:
+        """预约一个请求名额
+
+        Returns:
+            发送请求前需要等待的秒数
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        wait = self._update(self._take)
+
+        if wait > 0:
+            wait += random.uniform(0, self.jitter)
+        return wait
+
+    def pause(self, seconds: float):
+        """让共享额度的所有请求至少暂停 ``seconds`` 秒
+
+        服务器返回 429/503 并要求等待时调用，避免其他线程和进程继续发送请求。
+
+        Args:
+            seconds: 暂停的秒数
+        """
+        if self.rate <= 0 or seconds <= 0:
+            return
+        self._update(lambda tokens, updated: self._drain(tokens, updated, seconds))
+
+    def acquire(self):
+        """阻塞等待直到可以发送请求"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """异步等待直到可以发送请求"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(config: Config) -> TokenBucket:
+    """获取进程内共享的限制器
+
+    首次调用时根据配置创建：
+
+    - ``rate_limit.rate``：每秒请求数，默认 1.0
+    - ``rate_limit.burst``：突发请求数，默认 3
+    - ``rate_limit.jitter``：最大随机延迟（秒），默认 0.5
+    - ``rate_limit.enabled``：设为 false 时不做限制
+
+    令牌余额保存在配置目录下的 ``ratelimit.state``，所有进程共享。
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        共享的限制器实例
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            enabled = str(config.get("rate_limit.enabled", True)).lower() not in ("false", "0", "no")
+            _shared_limiter = TokenBucket(
+                rate=float(config.get("rate_limit.rate", 1.0)) if enabled else 0.0,
+                burst=float(config.get("rate_limit.burst", 3)),
+                jitter=float(config.get("rate_limit.jitter", 0.5)),
+                state_file=config.config_dir / "ratelimit.state",
+            )
+        return _shared_limiter
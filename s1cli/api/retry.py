@@ -1,9 +1,16 @@
 """重试机制"""
+import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
-from typing import Type, Tuple, Callable, Any
+from typing import Type, Tuple, Callable, Any, Optional
 
-from s1cli.api.exceptions import NetworkError, RateLimitError
+import httpx
+
+from s1cli.api.exceptions import CircuitOpenError, NetworkError, RateLimitError
+from s1cli.config import Config
 
 
 def retry_on_error(
@@ -39,9 +46,11 @@ def retry_on_error(
                     last_exception = e
                     
                     if attempt < max_retries:
-                        print(f"⚠️  {func.__name__} 失败，{current_delay:.1f}秒后重试... "
+                        # 服务器给出了等待时间时以其为准
+                        wait = getattr(e, "retry_after", None) or current_delay
+                        print(f"⚠️  {func.__name__} 失败，{wait:.1f}秒后重试... "
                               f"({attempt + 1}/{max_retries})")
-                        time.sleep(current_delay)
+                        time.sleep(wait)
                         current_delay *= backoff
                     else:
                         print(f"❌ {func.__name__} 失败，已达最大重试次数")
@@ -88,5 +97,221 @@ def with_error_handling(error_message: str = "操作失败",
     return decorator
 
 
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头
+
+    Args:
+        value: 响应头的值，可以是秒数或 HTTP 日期
+
+    Returns:
+        需要等待的秒数，无法解析时返回 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def classify_response(response: httpx.Response) -> Optional[Exception]:
+    """判断响应是否是需要重试的失败
+
+    - 429、503：服务器要求降低频率，转换为 RateLimitError，并带上 Retry-After
+    - 500、502、504：服务器或网关暂时故障，转换为 NetworkError
+    - 其他状态码交给调用方处理
+
+    Args:
+        response: 响应对象
+
+    Returns:
+        对应的异常，不需要重试时返回 None
+    """
+    status = response.status_code
+    if status in (429, 503):
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        message = "请求过于频繁" if status == 429 else "论坛服务器繁忙"
+        return RateLimitError(f"{message}（HTTP {status}）", retry_after=retry_after)
+    if status in (500, 502, 504):
+        return NetworkError(f"论坛服务器错误（HTTP {status}）")
+    return None
+
+
+def classify_exception(error: Exception) -> Optional[Exception]:
+    """把 httpx 的传输层异常转换为 NetworkError
+
+    Args:
+        error: 发送请求时抛出的异常
+
+    Returns:
+        对应的 NetworkError，不属于网络故障时返回 None
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return NetworkError(f"请求超时：{error}")
+    if isinstance(error, httpx.TransportError):
+        return NetworkError(f"网络连接失败：{error}")
+    return None
+
+
+class RetryPolicy:
+    """GET 请求的重试策略
+
+    使用 decorrelated jitter 退避：每次等待时间在 ``base_delay`` 与上一次等待的
+    3 倍之间随机选取，并以 ``max_delay`` 为上限。多个客户端同时失败时，
+    重试时间会自然错开，不会一起冲击刚恢复的服务器。
+
+    服务器通过 Retry-After 指定了等待时间时以其为准；
+    超过 ``max_retry_after`` 时不再重试，直接报错。
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_retry_after: float = 120.0
+    ):
+        """初始化重试策略
+
+        Args:
+            max_retries: 最大重试次数
+            base_delay: 最短等待时间（秒）
+            max_delay: 最长等待时间（秒）
+            max_retry_after: 愿意等待的最长 Retry-After（秒）
+        """
+        self.max_retries = max(int(max_retries), 0)
+        self.base_delay = max(base_delay, 0.0)
+        self.max_delay = max(max_delay, self.base_delay)
+        self.max_retry_after = max_retry_after
+
+    def next_delay(self, attempt: int, previous: float, error: Exception) -> Optional[float]:
+        """计算下一次重试前的等待时间
+
+        Args:
+            attempt: 已经重试的次数
+            previous: 上一次的等待时间（首次为 0）
+            error: 本次失败的异常
+
+        Returns:
+            等待秒数，不再重试时返回 None
+        """
+        if attempt >= self.max_retries or isinstance(error, CircuitOpenError):
+            return None
+
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after + random.uniform(0, self.base_delay)
+
+        upper = max(previous, self.base_delay) * 3
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+class CircuitBreaker:
+    """熔断器
+
+    连续失败 ``failure_threshold`` 次后进入断开状态，``reset_timeout`` 秒内的
+    请求直接抛出 CircuitOpenError，不再访问论坛；之后放行一个探测请求，
+    成功则恢复，失败则继续断开。
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """初始化熔断器
+
+        Args:
+            failure_threshold: 触发断开的连续失败次数，0 表示不启用
+            reset_timeout: 断开后等待多久再尝试（秒）
+        """
+        self.failure_threshold = int(failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing_since: Optional[float] = None
 
+    @property
+    def is_open(self) -> bool:
+        """是否处于断开状态"""
+        return self._opened_at is not None
 
+    def check(self):
+        """请求前检查，断开期间抛出 CircuitOpenError"""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            remaining = self.reset_timeout - (now - self._opened_at)
+            # 同一时间只放行一个探测请求；探测请求没有结果时超时后再放行
+            probing = (
+                self._probing_since is not None
+                and now - self._probing_since < self.reset_timeout
+            )
+            if remaining > 0 or probing:
+                raise CircuitOpenError(
+                    f"论坛连续请求失败，已暂停访问，请 {max(remaining, 1):.0f} 秒后再试"
+                )
+            self._probing_since = now
+
+    def record_success(self):
+        """记录一次成功请求"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing_since = None
+
+    def record_failure(self):
+        """记录一次失败请求"""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._probing_since is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probing_since = None
+
+
+_shared_policy: Optional[RetryPolicy] = None
+_shared_breaker: Optional[CircuitBreaker] = None
+_shared_lock = threading.Lock()
+
+
+def get_retry_policy(config: Config) -> Tuple[RetryPolicy, CircuitBreaker]:
+    """获取进程内共享的重试策略和熔断器
+
+    首次调用时根据配置创建：
+
+    - ``retry.max_retries``：最大重试次数，默认 3，设为 0 时不重试
+    - ``retry.base_delay`` / ``retry.max_delay``：退避等待的上下限（秒），默认 1 / 30
+    - ``retry.max_retry_after``：愿意等待的最长 Retry-After（秒），默认 120
+    - ``retry.breaker_threshold``：触发熔断的连续失败次数，默认 5，设为 0 时不熔断
+    - ``retry.breaker_timeout``：熔断持续时间（秒），默认 30
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        (重试策略, 熔断器)
+    """
+    global _shared_policy, _shared_breaker
+    with _shared_lock:
+        if _shared_policy is None:
+            _shared_policy = RetryPolicy(
+                max_retries=int(config.get("retry.max_retries", 3)),
+                base_delay=float(config.get("retry.base_delay", 1.0)),
+                max_delay=float(config.get("retry.max_delay", 30.0)),
+                max_retry_after=float(config.get("retry.max_retry_after", 120.0)),
+            )
+            _shared_breaker = CircuitBreaker(
+                failure_threshold=int(config.get("retry.breaker_threshold", 5)),
+                reset_timeout=float(config.get("retry.breaker_timeout", 30.0)),
+            )
+        return _shared_policy, _shared_breaker
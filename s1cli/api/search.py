@@ -1,8 +1,14 @@
 """搜索功能 API"""
-from typing import List, Optional
+import sqlite3
+from typing import Any, Dict, List, Optional
+import httpx
 from bs4 import BeautifulSoup
 from s1cli.api.client import S1Client
+from s1cli.api.exceptions import NetworkError, RateLimitError
+from s1cli.api.forum import ForumAPI
+from s1cli.metrics import get_registry
 from s1cli.models.thread import Thread
+from s1cli.store import SearchHit, get_store
 
 
 class SearchAPI:
@@ -15,6 +21,10 @@ class SearchAPI:
             client: HTTP 客户端
         """
         self.client = client
+        # 用于把版块名称解析为 ID（与 ForumAPI 共用版块索引）
+        self.forum_api = ForumAPI(client)
+        # 本地全文搜索使用的存储，未启用时为 None
+        self.store = get_store(client.config)
     
     def search(
         self,
@@ -26,119 +36,264 @@ class SearchAPI:
         
         Args:
             keyword: 搜索关键词
-            forum: 限定的版块（可选）
+            forum: 限定的版块名称、别名或 ID（可选）
             page: 页码
             
         Returns:
-            帖子列表
+            帖子列表；离线模式下为本地全文搜索命中的帖子（content 为命中位置附近的原文）
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
         """
+        if self.client.offline:
+            return self._local_threads(keyword, forum)
+        
         try:
-            # Discuz 搜索 URL
-            search_params = {
-                'mod': 'forum',
-                'srchtxt': keyword,
-                'searchsubmit': 'yes',
-                'source': 'hotsearch',
-            }
-            
-            if forum:
-                # 如果指定了版块，添加版块参数
-                # 这里需要先将版块名转换为 ID
-                # 简化处理，直接传入
-                search_params['forum'] = forum
-            
+            forum_id = self.forum_api.resolve_forum_id(forum) if forum else None
+            search_params = self._build_search_params(keyword, forum_id)
             response = self.client.get('search.php', params=search_params)
             
             # 检查是否需要重定向到结果页
-            if 'searchid=' in response.url:
-                # 已经在结果页
-                html = response.text
-            else:
-                # 可能需要二次请求获取结果
-                html = response.text
-                soup = BeautifulSoup(html, 'lxml')
-                
-                # 查找结果链接
-                result_link = soup.find('a', href=lambda x: x and 'searchid=' in x)
-                if result_link:
-                    result_url = result_link.get('href')
-                    response = self.client.get(result_url)
-                    html = response.text
+            result_url = self._find_result_url(response)
+            if result_url:
+                response = self.client.get(result_url)
             
-            # 解析搜索结果
-            soup = BeautifulSoup(html, 'lxml')
-            results = []
+            with get_registry().timer("parse.search"):
+                return self._parse_results(response.text)
             
-            # 查找结果列表
-            # Discuz 搜索结果通常在特定的列表中
-            result_items = soup.find_all('li', class_='pbw') or soup.find_all('tbody', id=lambda x: x and 'normalthread' in x)
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"搜索异常：{e}")
+            return []
+    
+    async def search_async(
+        self,
+        keyword: str,
+        forum: Optional[str] = None,
+        page: int = 1
+    ) -> List[Thread]:
+        """搜索帖子（异步版本，需要使用 AsyncS1Client）
+        
+        Args:
+            keyword: 搜索关键词
+            forum: 限定的版块名称、别名或 ID（可选）
+            page: 页码
             
-            for item in result_items:
-                try:
-                    # 提取标题和链接
-                    title_link = item.find('a', class_='s xst') or item.find('a', class_='xst')
-                    if not title_link:
-                        continue
-                    
-                    title = title_link.get_text(strip=True)
-                    thread_url = title_link.get('href', '')
-                    
-                    # 提取帖子 ID
-                    thread_id = ''
-                    if 'tid=' in thread_url:
-                        thread_id = thread_url.split('tid=')[1].split('&')[0]
-                    elif 'thread-' in thread_url:
-                        thread_id = thread_url.split('thread-')[1].split('-')[0]
-                    
-                    # 提取作者
-                    author_elem = item.find('cite') or item.find('a', class_='xi2')
-                    author = ''
-                    if author_elem:
-                        if author_elem.name == 'cite':
-                            author_link = author_elem.find('a')
-                            author = author_link.get_text(strip=True) if author_link else ''
-                        else:
-                            author = author_elem.get_text(strip=True)
-                    
-                    # 提取版块信息
-                    forum_elem = item.find('a', class_='xi2') or item.find('em', class_='xg1')
-                    forum_name = ''
-                    if forum_elem and 'forum' in str(forum_elem.get('href', '')):
-                        forum_name = forum_elem.get_text(strip=True)
-                    
-                    # 提取查看数和回复数
-                    num_elem = item.find('td', class_='num')
-                    views = 0
-                    replies = 0
-                    if num_elem:
-                        nums = num_elem.find_all('em')
-                        if len(nums) >= 2:
-                            try:
-                                replies = int(nums[0].get_text(strip=True))
-                                views = int(nums[1].get_text(strip=True))
-                            except:
-                                pass
-                    
-                    if title and thread_id:
-                        thread = Thread(
-                            id=thread_id,
-                            title=title,
-                            author=author,
-                            forum=forum_name,
-                            views=views,
-                            replies=replies
-                        )
-                        results.append(thread)
-                        
-                except Exception as e:
-                    # 跳过解析失败的项
-                    continue
+        Returns:
+            帖子列表；离线模式下为本地全文搜索命中的帖子
             
-            return results
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if self.client.offline:
+            return self._local_threads(keyword, forum)
+        
+        try:
+            forum_id = await self.forum_api.resolve_forum_id_async(forum) if forum else None
+            search_params = self._build_search_params(keyword, forum_id)
+            response = await self.client.get('search.php', params=search_params)
+            
+            result_url = self._find_result_url(response)
+            if result_url:
+                response = await self.client.get(result_url)
             
+            with get_registry().timer("parse.search"):
+                return self._parse_results(response.text)
+            
+        except (NetworkError, RateLimitError):
+            raise
         except Exception as e:
             print(f"搜索异常：{e}")
             return []
+    
+    def search_local(
+        self,
+        keyword: str,
+        forum: Optional[str] = None,
+        author: Optional[str] = None,
+        limit: int = 50
+    ) -> List[SearchHit]:
+        """在本地保存过的帖子标题、楼主内容和回复中全文搜索
+        
+        不访问网络：版块名称只在本地版块索引中查找。
+        
+        Args:
+            keyword: 搜索关键词，空格分隔的词都必须出现
+            forum: 限定的版块名称、别名或 ID（可选）
+            author: 限定的作者（可选）
+            limit: 最多返回的结果数
+            
+        Returns:
+            按相关度排序的命中列表，未启用本地存储或查询出错时返回空列表
+        """
+        if self.store is None:
+            print("本地存储未启用（store.enabled = false），无法本地搜索")
+            return []
+        
+        forum_id = None
+        if forum:
+            forum_id, _ = self.forum_api.forum_index.lookup(forum)
+            if forum_id is None:
+                print(f"警告：找不到版块 {forum}，将搜索全部版块")
+        
+        try:
+            with get_registry().timer("search.local"):
+                return self.store.search(keyword, forum_id=forum_id, author=author, limit=limit)
+        except sqlite3.Error as e:
+            print(f"本地搜索异常：{e}")
+            return []
+    
+    def _local_threads(self, keyword: str, forum: Optional[str]) -> List[Thread]:
+        """本地全文搜索，把命中按帖子合并为帖子列表（离线模式使用）
+        
+        Args:
+            keyword: 搜索关键词
+            forum: 限定的版块名称、别名或 ID（可选）
+            
+        Returns:
+            按相关度排序的帖子列表，content 为该帖最相关的命中位置附近的原文
+        """
+        threads = {}
+        for hit in self.search_local(keyword, forum=forum):
+            if hit.thread_id not in threads:
+                threads[hit.thread_id] = Thread(
+                    id=hit.thread_id,
+                    title=hit.title,
+                    author=hit.author,
+                    forum=hit.forum,
+                    forum_id=hit.forum_id,
+                    content=hit.snippet
+                )
+        return list(threads.values())
+    
+    def _build_search_params(self, keyword: str, forum_id: Optional[str]) -> Dict[str, Any]:
+        """构造搜索请求参数
+        
+        Args:
+            keyword: 搜索关键词
+            forum_id: 限定的版块 ID（可选）
+            
+        Returns:
+            查询参数字典
+        """
+        # Discuz 搜索 URL
+        search_params = {
+            'mod': 'forum',
+            'srchtxt': keyword,
+            'searchsubmit': 'yes',
+            'source': 'hotsearch',
+        }
+        
+        if forum_id:
+            if forum_id.isdigit():
+                # Discuz 按 srchfid[] 限定版块
+                search_params['srchfid[]'] = forum_id
+            else:
+                print(f"警告：找不到版块 {forum_id}，将搜索全部版块")
+        
+        return search_params
+    
+    def _find_result_url(self, response: httpx.Response) -> Optional[str]:
+        """判断是否需要二次请求获取搜索结果
+        
+        Args:
+            response: search.php 的响应
+            
+        Returns:
+            结果页地址，已经在结果页时返回 None
+        """
+        if 'searchid=' in str(response.url):
+            # 已经在结果页
+            return None
+        
+        # 查找结果链接
+        soup = BeautifulSoup(response.text, 'lxml')
+        result_link = soup.find('a', href=lambda x: x and 'searchid=' in x)
+        if result_link:
+            return result_link.get('href')
+        return None
+    
+    def _parse_results(self, html: str) -> List[Thread]:
+        """从搜索结果页 HTML 解析帖子列表
+        
+        Args:
+            html: 页面 HTML
+            
+        Returns:
+            帖子列表
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        results = []
+        
+        # 查找结果列表
+        # Discuz 搜索结果通常在特定的列表中
+        result_items = soup.find_all('li', class_='pbw') or soup.find_all('tbody', id=lambda x: x and 'normalthread' in x)
+        
+        for item in result_items:
+            try:
+                # 提取标题和链接
+                title_link = item.find('a', class_='s xst') or item.find('a', class_='xst')
+                if not title_link:
+                    continue
+                
+                title = title_link.get_text(strip=True)
+                thread_url = title_link.get('href', '')
+                
+                # 提取帖子 ID
+                thread_id = ''
+                if 'tid=' in thread_url:
+                    thread_id = thread_url.split('tid=')[1].split('&')[0]
+                elif 'thread-' in thread_url:
+                    thread_id = thread_url.split('thread-')[1].split('-')[0]
+                
+                # 提取作者
+                author_elem = item.find('cite') or item.find('a', class_='xi2')
+                author = ''
+                if author_elem:
+                    if author_elem.name == 'cite':
+                        author_link = author_elem.find('a')
+                        author = author_link.get_text(strip=True) if author_link else ''
+                    else:
+                        author = author_elem.get_text(strip=True)
+                
+                # 提取版块信息
+                forum_elem = item.find('a', class_='xi2') or item.find('em', class_='xg1')
+                forum_name = ''
+                if forum_elem and 'forum' in str(forum_elem.get('href', '')):
+                    forum_name = forum_elem.get_text(strip=True)
+                
+                # 提取查看数和回复数
+                num_elem = item.find('td', class_='num')
+                views = 0
+                replies = 0
+                if num_elem:
+                    nums = num_elem.find_all('em')
+                    if len(nums) >= 2:
+                        try:
+                            replies = int(nums[0].get_text(strip=True))
+                            views = int(nums[1].get_text(strip=True))
+                        except:
+                            pass
+                
+                if title and thread_id:
+                    thread = Thread(
+                        id=thread_id,
+                        title=title,
+                        author=author,
+                        forum=forum_name,
+                        views=views,
+                        replies=replies
+                    )
+                    results.append(thread)
+                    
+            except Exception as e:
+                # 跳过解析失败的项
+                continue
+        
+        return results
 
 
 
@@ -0,0 +1,68 @@
+"""流式 HTML 解析"""
+from typing import Callable, Iterable, Iterator
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+
+def iter_elements(
+    chunks: Iterable[bytes],
+    match: Callable[[etree._Element], bool],
+    stop: Callable[[etree._Element], bool],
+    encoding: str = "utf-8"
+) -> Iterator[etree._Element]:
+    """边接收边解析 HTML，逐个产出闭合的目标元素
+
+    数据块依次喂给 lxml 的增量解析器，每当一个满足 ``match`` 的元素闭合就立即产出；
+    遇到满足 ``stop`` 的元素（通常是列表容器）闭合时停止读取剩余数据。
+    已处理的元素会被清空，内存占用与页面长度无关。
+
+    Args:
+        chunks: 响应体数据块
+        match: 判断元素是否为目标元素
+        stop: 判断是否可以停止解析
+        encoding: 页面编码
+
+    Yields:
+        闭合的目标元素（仅在下一次迭代前有效）
+    """
+    parser = etree.HTMLPullParser(events=("end",), encoding=encoding)
+    stopped = False
+
+    def drain() -> Iterator[etree._Element]:
+        nonlocal stopped
+        for _, element in parser.read_events():
+            if match(element):
+                yield element
+                # 释放已处理的元素及其之前的兄弟节点
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+            elif stop(element):
+                stopped = True
+                return
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+        if stopped:
+            return
+    parser.close()
+    yield from drain()
+
+
+def to_soup(element: etree._Element):
+    """把 lxml 元素转换成 BeautifulSoup 标签，以复用现有的解析逻辑
+
+    Args:
+        element: lxml 元素
+
+    Returns:
+        对应的 BeautifulSoup 标签
+    """
+    fragment = lxml_html.tostring(element, encoding="unicode")
+    # lxml 输出的片段已经是规范的 HTML，html.parser 不会像 lxml 那样
+    # 把游离的 <tbody> 等标签补全或丢弃
+    return BeautifulSoup(fragment, "html.parser").find(element.tag)
@@ -1,10 +1,31 @@
 """帖子相关 API"""
-from typing import List, Optional
-from bs4 import BeautifulSoup
+import asyncio
+import re
+import sqlite3
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import fields, replace
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
 from datetime import datetime
 from s1cli.api.client import S1Client
-from s1cli.models.thread import Thread, Post
-from s1cli.utils import get_signature
+from s1cli.api import lxml_parser, mobile
+from s1cli.api.exceptions import NetworkError, OfflineError, RateLimitError
+from s1cli.api.parse_pool import get_parse_pool
+from s1cli.api.stream import iter_elements, to_soup
+from s1cli.metrics import get_registry
+from s1cli.models.thread import Thread, Post, SyncResult
+from s1cli.records import page_posts
+from s1cli.store import get_store
+from s1cli.utils import get_signature, linkify_urls
+
+
+# 回复容器 <div id="post_123">，不包括 post_rate_div_123、post_new 等
+_POST_DIV_ID = re.compile(r'post_\d+$')
+_TOTAL_PAGES = re.compile(r'共\s*(\d+)\s*页')
+_FLOOR_NAMES = {"沙发": 2, "板凳": 3, "地板": 4}
+# get_text 计入的字符串类型（不含注释、script/style 内容等子类）
+_TEXT_TYPES = (NavigableString, CData)
 
 
 class ThreadAPI:
@@ -17,6 +38,14 @@ class ThreadAPI:
             client: HTTP 客户端
         """
         self.client = client
+        # 解析引擎：bs4（默认）或 lxml，两者结果一致，lxml 更快
+        self.parser_backend = str(client.config.get("parser.backend", "bs4")).lower()
+        # 多页获取时在子进程中解析（配置 parser.workers 启用），未启用时为 None
+        self.parse_pool = get_parse_pool(client.config)
+        # 移动端 JSON 接口（配置 api.backend = mobile 启用），未启用时为 None
+        self.mobile = mobile.get_mobile_backend(client)
+        # 本地存储（配置 store.enabled = false 关闭），获取到的帖子页写入其中
+        self.store = get_store(client.config)
     
     def get_thread(self, thread_id: str, page: int = 1) -> Optional[Thread]:
         """获取帖子详情
@@ -26,249 +55,603 @@ class ThreadAPI:
             page: 页码
             
         Returns:
-            帖子对象
+            帖子对象；离线模式下优先返回本地存储中保存的该页（fetched_at 为获取时间）
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
         """
+        if self.client.offline:
+            stored = self._stored_thread(thread_id, page)
+            if stored is not None:
+                return stored
+        
         try:
-            url = f"thread-{thread_id}-{page}-1.html"
-            response = self.client.get(url)
-            html = response.text
-            soup = BeautifulSoup(html, 'lxml')
+            thread = None
+            if self.mobile is not None:
+                variables = self.mobile.fetch("viewthread", tid=thread_id, page=page)
+                if variables is not None:
+                    with get_registry().timer("parse.thread"):
+                        thread = mobile.parse_view_thread(variables, thread_id, page)
             
-            # 提取帖子标题
-            title_elem = soup.find('span', id='thread_subject') or soup.find('h1', class_='ts')
-            title = title_elem.get_text(strip=True) if title_elem else "未知标题"
-            
-            # 提取作者信息和发帖时间
-            author_elem = soup.find('div', class_='authi')
-            author = ''
-            created_time = None
-            if author_elem:
-                author_link = author_elem.find('a', class_='xw1')
-                author = author_link.get_text(strip=True) if author_link else ''
-            
-            # 提取发帖时间（楼主的时间）
-            first_post_div = soup.find('div', id=lambda x: x and x.startswith('post_'))
-            if first_post_div:
-                time_elem = first_post_div.find('em', id=lambda x: x and x.startswith('authorposton'))
-                if time_elem:
-                    time_text = time_elem.get_text(strip=True)
-                    if '发表于' in time_text:
-                        created_time = time_text.replace('发表于', '').strip()
-                    else:
-                        created_time = time_text
-            
-            # 提取浏览数和回复数
-            # 格式: <span class="xg1">查看:</span> <span class="xi1">38628</span><span class="pipe">|</span><span class="xg1">回复:</span> <span class="xi1">280</span>
-            views = 0
-            replies = 0
-            
-            # 找到包含统计信息的区域
-            stats_div = soup.find('div', class_='hm ptn')
-            if stats_div:
-                # 找到所有 xi1 标签（包含数字）
-                xi1_spans = stats_div.find_all('span', class_='xi1')
-                if len(xi1_spans) >= 2:
-                    try:
-                        views = int(xi1_spans[0].get_text(strip=True))
-                        replies = int(xi1_spans[1].get_text(strip=True))
-                    except:
-                        pass
-            
-            # 提取楼主内容
-            first_post = soup.find('td', id=lambda x: x and x.startswith('postmessage_'))
-            content = ''
-            if first_post:
-                # 移除引用和签名
-                for quote in first_post.find_all('div', class_='quote'):
-                    quote.decompose()
-                for sign in first_post.find_all('div', id=lambda x: x and 'sign_' in x):
-                    sign.decompose()
-                
-                # 收集所有链接（从 <a> 标签获取完整 URL）
-                url_map = {}  # 存储 text -> href 的映射
-                for link in first_post.find_all('a'):
-                    href = link.get('href', '')
-                    if href and ('http://' in href or 'https://' in href):
-                        # 获取链接的文本（可能被省略）
-                        link_text = link.get_text(strip=True)
-                        url_map[link_text] = href
-                        # 将链接替换为完整 URL 文本
-                        link.replace_with(href)
-                
-                # 使用 separator 参数保留换行
-                content = first_post.get_text(separator='\n', strip=True)
-                
-                # 处理所有 URL（包括 <a> 标签中的和纯文本的）
-                import re
-                from urllib.parse import urlparse
-                
-                # 匹配 http:// 或 https:// 开头的 URL
-                url_pattern = r'(https?://[^\s\u200b]+)'
-                
-                def replace_url(match):
-                    url = match.group(1)
-                    # 移除末尾的特殊字符和零宽空格
-                    url = url.rstrip('​​​')
-                    try:
-                        parsed = urlparse(url)
-                        domain = parsed.netloc
-                        if domain.startswith('www.'):
-                            domain = domain[4:]
-                        return f'[link={url}]【跳转至{domain}】[/link]'
-                    except:
-                        return url
-                
-                content = re.sub(url_pattern, replace_url, content)
-            
-            # 提取总页数信息
-            total_pages = 1
-            current_page = page
-            page_info = soup.find('span', title=lambda x: x and '共' in str(x) and '页' in str(x))
-            if page_info:
-                import re
-                match = re.search(r'共\s*(\d+)\s*页', page_info.get('title', ''))
-                if match:
-                    total_pages = int(match.group(1))
-            
-            # 创建 Thread 对象
-            thread = Thread(
-                id=thread_id,
-                title=title,
-                author=author,
-                content=content,
-                views=views,
-                replies=replies,
-                created_at=created_time,  # 添加发帖时间
-                current_page=current_page,
-                total_pages=total_pages
-            )
+            if thread is None:
+                url = f"thread-{thread_id}-{page}-1.html"
+                response = self.client.get(url)
+                with get_registry().timer("parse.thread"):
+                    thread = self._parse_thread(response.text, thread_id, page)
+            
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取帖子详情异常：{e}")
+            return None
+        
+        self._save_thread(thread, page)
+        return thread
+    
+    def load_thread(self, thread_id: str, page: int = 1) -> Optional[Thread]:
+        """获取帖子详情，离线模式或获取失败时使用本地存储中保存的该页
+        
+        供阅读使用：来自本地存储的帖子 fetched_at 为当时获取的时间，
+        调用方可据此提示内容的新旧。
+        
+        Args:
+            thread_id: 帖子 ID
+            page: 页码
+            
+        Returns:
+            帖子对象，获取失败且本地存储中也没有时返回 None
+            
+        Raises:
+            NetworkError: 获取失败（包括离线模式下没有缓存）且本地存储中没有该页
+            RateLimitError: 请求被论坛限制且本地存储中没有该页
+        """
+        error = None
+        try:
+            thread = self.get_thread(thread_id, page)
+        except (NetworkError, RateLimitError) as e:
+            thread, error = None, e
+        
+        if thread is None:
+            stored = self._stored_thread(thread_id, page)
+            if stored is not None:
+                return stored
+        
+        if error is not None:
+            raise error
+        return thread
+    
+    def _stored_thread(self, thread_id: str, page: int) -> Optional[Thread]:
+        """读取本地存储中保存的帖子某一页，未启用存储或读取失败时返回 None"""
+        if self.store is None:
+            return None
+        try:
+            return self.store.get_thread(thread_id, page)
+        except sqlite3.Error as e:
+            print(f"警告：读取本地存储失败：{e}")
+            return None
+    
+    def iter_posts(
+        self,
+        thread_id: str,
+        start_page: int = 1,
+        end_page: Optional[int] = None
+    ) -> Iterator[Tuple[int, Post]]:
+        """流式获取帖子从指定页开始的所有楼层
+        
+        边下载边解析，每个 post_ div 闭合时立即产出对应的回复，
+        回复列表结束后不再读取页面剩余部分；每页结束时把已解析的部分写入本地存储。
+        离线模式下使用本地存储中保存的页面，启用移动端接口时使用接口数据。
+        逐页依次获取，总页数以最新获取到的页面为准。
+        
+        Args:
+            thread_id: 帖子 ID
+            start_page: 起始页码
+            end_page: 最后一页的页码，默认到帖子的最后一页
             
-            # 提取回复列表
-            posts = self._extract_posts(soup, thread_id)
-            thread.posts = posts
+        Yields:
+            (所在页码, 回复对象)，第一页包括楼主（floor 为 1，与 records.page_posts 一致）；
+            某一页没有获取到任何楼层时在它之前停止
             
-            return thread
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试），且本地存储中没有该页
+            RateLimitError: 请求被论坛限制（已自动重试），且本地存储中没有该页
+        """
+        page = max(1, start_page)
+        while True:
+            thread = Thread(id=thread_id, title="未知标题", author="", current_page=page)
+            count = 0
+            for post in self._stream_page(thread, page):
+                count += 1
+                yield page, post
+            
+            last_page = thread.total_pages if end_page is None else min(thread.total_pages, end_page)
+            if count == 0 or page >= last_page:
+                return
+            page += 1
+    
+    def _stream_page(self, thread: Thread, page: int) -> Iterator[Post]:
+        """流式获取帖子的一页，页面信息（标题、总页数等）写入 thread
+        
+        Args:
+            thread: 该页的帖子对象，id 为帖子 ID
+            page: 页码
+            
+        Yields:
+            本页的楼层（第一页包括楼主）
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试），且本地存储中没有该页
+            RateLimitError: 请求被论坛限制（已自动重试），且本地存储中没有该页
+        """
+        thread_id = thread.id
+        if self.client.offline:
+            stored = self._stored_thread(thread_id, page)
+            if stored is not None:
+                _copy_thread(stored, thread)
+                yield from page_posts(stored)
+                return
+        
+        streamed = 0
+        try:
+            if self.mobile is not None:
+                variables = self.mobile.fetch("viewthread", tid=thread_id, page=page)
+                if variables is not None:
+                    with get_registry().timer("parse.thread"):
+                        _copy_thread(mobile.parse_view_thread(variables, thread_id, page), thread)
+                    self._save_thread(thread, page)
+                    for post in page_posts(thread):
+                        streamed += 1
+                        yield post
+                    return
+            
+            url = f"thread-{thread_id}-{page}-1.html"
+            found = set()
+            
+            with self.client.stream(url) as response:
+                elements = iter_elements(
+                    response.iter_bytes(),
+                    match=lambda el: _is_post_div(el) or lxml_parser.is_page_element(el),
+                    stop=lambda el: el.tag == 'div' and el.get('id') == 'postlist',
+                    encoding=response.encoding or 'utf-8'
+                )
+                try:
+                    for element in elements:
+                        if not _is_post_div(element):
+                            lxml_parser.read_page_element(element, thread, found)
+                            continue
+                        try:
+                            with get_registry().timer("parse.post"):
+                                if self.parser_backend == "lxml":
+                                    post = lxml_parser.parse_post(element, thread_id)
+                                else:
+                                    post = self._parse_post(to_soup(element), thread_id)
+                        except Exception:
+                            # 跳过解析失败的回复
+                            continue
+                        if not post or post.floor < 1:
+                            continue
+                        
+                        if streamed == 0:
+                            # 作者、内容和发帖时间取自本页第一楼（与整页解析一致）
+                            thread.author = post.author
+                            thread.content = post.content
+                            thread.created_at = post.post_time
+                        if post.floor == 1:
+                            # 楼主不记录回复 ID，与 records.page_posts 一致
+                            post = replace(post, id="")
+                        else:
+                            thread.posts.append(post)
+                        streamed += 1
+                        yield post
+                finally:
+                    # 已解析的部分（包括提前结束时）一次性写入本地存储
+                    if streamed:
+                        self._save_thread(thread, page)
             
+        except (NetworkError, RateLimitError):
+            stored = self._stored_thread(thread_id, page) if streamed == 0 else None
+            if stored is None:
+                raise
+            _copy_thread(stored, thread)
+            yield from page_posts(stored)
         except Exception as e:
             print(f"获取帖子详情异常：{e}")
-            return None
     
-    def _extract_posts(self, soup: BeautifulSoup, thread_id: str) -> List[Post]:
-        """从页面提取回复列表
+    def get_thread_pages(
+        self,
+        thread_id: str,
+        pages: Union[Iterable[int], str] = 'all',
+        max_workers: Optional[int] = None,
+        start_page: int = 1
+    ) -> Optional[Thread]:
+        """获取帖子的多页内容
+        
+        先请求第一页得到总页数，再并发请求其余页面（并发数受限，
+        且所有请求仍受客户端的请求频率限制），最后按楼层合并回复。
+        启用解析池时，其余页面交给子进程解析，下载线程不等待解析完成。
+        离线模式下只合并本地存储中保存过的页面。
         
         Args:
-            soup: BeautifulSoup 对象
             thread_id: 帖子 ID
+            pages: 页码序列（如 range(3, 11)），或 'all' 表示全部页面
+            max_workers: 最大并发数，默认读取配置 network.max_concurrency（4）
+            start_page: pages 为 'all' 时的起始页码，获取该页到最后一页
             
         Returns:
-            回复列表
+            帖子对象，posts 为所有页面的回复（按楼层排序、按回复 ID 去重）；
+            current_page 为请求到的第一页
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
         """
-        posts = []
+        if pages == 'all':
+            requested = None
+            first_page = max(1, start_page)
+        else:
+            requested = sorted(set(int(p) for p in pages))
+            if not requested:
+                return None
+            first_page = requested[0]
+        
+        thread = self.get_thread(thread_id, first_page)
+        if thread is None:
+            return None
+        
+        # 超出总页数的页码会返回最后一页，直接丢弃
+        candidates = requested if requested is not None else range(first_page, thread.total_pages + 1)
+        remaining = [p for p in candidates if p != first_page and 1 <= p <= thread.total_pages]
+        
+        results = []
+        if remaining and self.client.offline:
+            # 离线时只合并本地存储中保存过的页面
+            results = [self._stored_thread(thread_id, p) for p in remaining]
+        elif remaining:
+            if max_workers is None:
+                max_workers = int(self.client.config.get("network.max_concurrency", 4))
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                results = self._fetch_pages(executor, thread_id, remaining)
+        
+        posts = {}
+        for page_thread in [thread] + results:
+            if page_thread is None:
+                continue
+            for post in page_thread.posts:
+                posts.setdefault(post.id, post)
+        
+        thread.posts = sorted(posts.values(), key=lambda post: post.floor)
+        return thread
+    
+    def iter_pages(
+        self,
+        thread_id: str,
+        start_page: int = 1,
+        window: Optional[int] = None,
+        end_page: Optional[int] = None
+    ) -> Iterator[Thread]:
+        """从指定页开始依次获取帖子的每一页，获取一页产出一页
         
-        # 查找所有回复
-        post_divs = soup.find_all('div', id=lambda x: x and x.startswith('post_'))
+        与 get_thread_pages 不同，不把所有回复合并到一个帖子对象中：
+        最多同时获取 window 页，调用方处理当前页时后面几页已在下载，
+        内存中始终只有这几页，适合逐页写出很长的帖子。
+        总页数以最新获取到的页面为准，获取期间新增的页面也会产出。
         
-        for post_div in post_divs:
+        Args:
+            thread_id: 帖子 ID
+            start_page: 起始页码
+            window: 同时获取的页数，默认读取配置 network.max_concurrency（4）
+            end_page: 最后一页的页码，默认到帖子的最后一页
+            
+        Yields:
+            帖子对象（每页一个），current_page 为该页页码；
+            某一页获取失败（返回 None）时在它之前停止
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        thread = self.get_thread(thread_id, start_page)
+        if thread is None:
+            return
+        total_pages = thread.total_pages
+        yield thread
+        
+        if window is None:
+            window = int(self.client.config.get("network.max_concurrency", 4))
+        use_pool = self._uses_parse_pool()
+        fetch = self._submit_thread if use_pool else self.get_thread
+        next_page = start_page + 1
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max(1, window)) as executor:
             try:
-                # 提取回复 ID
-                post_id = post_div.get('id', '').replace('post_', '')
-                
-                # 提取楼层号 - 楼层号在 <a id="postnumXXX"> 内的 <em> 标签中
-                floor = 0
-                postnum_link = post_div.find('a', id=lambda x: x and x.startswith('postnum'))
-                if postnum_link:
-                    floor_em = postnum_link.find('em')
-                    if floor_em:
-                        floor_text = floor_em.get_text(strip=True)
-                        try:
-                            floor = int(floor_text)
-                        except:
-                            # 可能是 "沙发"、"板凳" 等
-                            floor_map = {"沙发": 2, "板凳": 3, "地板": 4}
-                            floor = floor_map.get(floor_text, 0)
-                    elif '楼主' in postnum_link.get_text():
-                        floor = 1
-                
-                # 提取作者
-                author_elem = post_div.find('div', class_='authi')
-                author = ''
-                if author_elem:
-                    author_link = author_elem.find('a', class_='xw1')
-                    author = author_link.get_text(strip=True) if author_link else ''
-                
-                # 提取回复时间
-                post_time_elem = post_div.find('em', id=lambda x: x and x.startswith('authorposton'))
-                post_time = None
-                if post_time_elem:
-                    time_text = post_time_elem.get_text(strip=True)
-                    # 解析时间格式 "发表于 2025-6-5 10:19"
-                    if '发表于' in time_text:
-                        post_time = time_text.replace('发表于', '').strip()
-                    else:
-                        post_time = time_text
-                
-                # 提取回复内容
-                content_elem = post_div.find('td', id=lambda x: x and x.startswith('postmessage_'))
-                content = ''
-                if content_elem:
-                    # 移除引用和签名
-                    for quote in content_elem.find_all('div', class_='quote'):
-                        quote.decompose()
-                    for sign in content_elem.find_all('div', id=lambda x: x and 'sign_' in x):
-                        sign.decompose()
-                    
-                    # 收集所有链接（从 <a> 标签获取完整 URL）
-                    url_map = {}  # 存储 text -> href 的映射
-                    for link in content_elem.find_all('a'):
-                        href = link.get('href', '')
-                        if href and ('http://' in href or 'https://' in href):
-                            # 获取链接的文本（可能被省略）
-                            link_text = link.get_text(strip=True)
-                            url_map[link_text] = href
-                            # 将链接替换为完整 URL 文本
-                            link.replace_with(href)
-                    
-                    # 使用 separator 参数保留换行
-                    content = content_elem.get_text(separator='\n', strip=True)
-                    
-                    # 处理所有 URL（包括 <a> 标签中的和纯文本的）
-                    import re
-                    from urllib.parse import urlparse
+                while True:
+                    last_page = total_pages if end_page is None else min(total_pages, end_page)
+                    while len(pending) < max(1, window) and next_page <= last_page:
+                        pending.append((next_page, executor.submit(fetch, thread_id, next_page)))
+                        next_page += 1
+                    if not pending:
+                        return
                     
-                    # 匹配 http:// 或 https:// 开头的 URL
-                    url_pattern = r'(https?://[^\s\u200b]+)'
-                    
-                    def replace_url(match):
-                        url = match.group(1)
-                        # 移除末尾的特殊字符和零宽空格
-                        url = url.rstrip('​​​')
-                        try:
-                            parsed = urlparse(url)
-                            domain = parsed.netloc
-                            if domain.startswith('www.'):
-                                domain = domain[4:]
-                            return f'[link={url}]【跳转至{domain}】[/link]'
-                        except:
-                            return url
-                    
-                    content = re.sub(url_pattern, replace_url, content)
-                
-                if post_id and floor > 1:  # 跳过楼主（楼层1），只保留回复
-                    post = Post(
-                        id=post_id,
-                        thread_id=thread_id,
-                        floor=floor,
-                        author=author,
-                        content=content,
-                        post_time=post_time
-                    )
-                    posts.append(post)
-                    
-            except Exception as e:
-                # 跳过解析失败的回复
-                continue
+                    page, future = pending.popleft()
+                    thread = future.result()
+                    if use_pool:
+                        thread = self._thread_result(thread)
+                        self._save_thread(thread, page)
+                    if thread is None:
+                        return
+                    total_pages = max(total_pages, thread.total_pages)
+                    yield thread
+            finally:
+                # 提前结束时不再获取还没开始的页面
+                for _, future in pending:
+                    future.cancel()
+    
+    def sync_thread(self, thread_id: str, known_replies: Optional[int] = None) -> Optional[SyncResult]:
+        """增量同步帖子，只获取上次同步之后的新回复
+        
+        从上次同步到的最后一页开始获取到帖子的最后一页（第一次同步时获取全部页面），
+        获取到的页面照常写入本地存储，同步进度记录在本地存储中。
+        已知回复数没有增加时直接跳过，不发起请求。
+        
+        Args:
+            thread_id: 帖子 ID
+            known_replies: 已知的当前回复数（如 get_thread_list 返回的 replies）；
+                默认使用上次同步之后获取到的帖子列表中的回复数，没有时照常请求
+            
+        Returns:
+            同步结果，未启用本地存储或获取失败时返回 None
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            OfflineError: 处于离线模式
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if self.client.offline:
+            raise OfflineError("离线模式，无法同步")
+        if self.store is None:
+            print("本地存储未启用（store.enabled = false），无法增量同步")
+            return None
+        
+        state = self.store.get_sync_state(thread_id)
+        if state is not None:
+            if known_replies is None:
+                known_replies = self.store.listed_replies(thread_id)
+            if known_replies is not None and known_replies <= state.replies:
+                return SyncResult(
+                    thread_id=thread_id,
+                    last_floor=state.last_floor,
+                    last_page=state.last_page,
+                    skipped=True
+                )
+        
+        start_page = state.last_page if state else 1
+        last_floor = state.last_floor if state else 0
+        thread = self.get_thread(thread_id, start_page)
+        if thread is None:
+            return None
         
-        return posts
+        # 上次之后删帖导致页数变少时，论坛返回的是最后一页
+        start_page = min(start_page, thread.total_pages)
+        remaining = list(range(start_page + 1, thread.total_pages + 1))
+        results = []
+        if remaining:
+            max_workers = int(self.client.config.get("network.max_concurrency", 4))
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                results = self._fetch_pages(executor, thread_id, remaining)
+        
+        # 只推进到第一个获取失败的页面之前，下次从那里继续
+        posts = {}
+        last_page = start_page
+        for page, page_thread in zip([start_page] + remaining, [thread] + results):
+            if page_thread is None:
+                break
+            for post in page_thread.posts:
+                posts.setdefault(post.id, post)
+            last_page = page
+        
+        highest = max([last_floor, 1] + [post.floor for post in posts.values()])
+        new_posts = [post for post in posts.values() if post.floor > last_floor]
+        # 没有获取到最后一页时保留原来的回复数，下次同步不会因为回复数没有变化而跳过
+        if last_page == thread.total_pages:
+            replies = thread.replies
+        else:
+            replies = state.replies if state else 0
+        self.store.save_sync_state(thread_id, highest, last_page, replies)
+        return SyncResult(
+            thread_id=thread_id,
+            title=thread.title,
+            new_posts=sorted(new_posts, key=lambda post: post.floor),
+            last_floor=highest,
+            last_page=last_page,
+            requests=1 + len(remaining)
+        )
+    
+    def sync_threads(self, thread_ids: Optional[Iterable[str]] = None) -> List[SyncResult]:
+        """增量同步多个帖子
+        
+        Args:
+            thread_ids: 帖子 ID 序列，默认为本地存储中所有同步过的帖子
+            
+        Returns:
+            同步结果列表（不含获取失败的帖子）
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if thread_ids is None:
+            thread_ids = self.store.synced_thread_ids() if self.store is not None else []
+        results = []
+        for thread_id in thread_ids:
+            result = self.sync_thread(thread_id)
+            if result is not None:
+                results.append(result)
+        return results
+    
+    async def get_thread_async(self, thread_id: str, page: int = 1) -> Optional[Thread]:
+        """获取帖子详情（异步版本，需要使用 AsyncS1Client）
+        
+        Args:
+            thread_id: 帖子 ID
+            page: 页码
+            
+        Returns:
+            帖子对象；离线模式下优先返回本地存储中保存的该页（fetched_at 为获取时间）
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if self.client.offline:
+            stored = self._stored_thread(thread_id, page)
+            if stored is not None:
+                return stored
+        
+        try:
+            thread = None
+            if self.mobile is not None:
+                variables = await self.mobile.fetch_async("viewthread", tid=thread_id, page=page)
+                if variables is not None:
+                    with get_registry().timer("parse.thread"):
+                        thread = mobile.parse_view_thread(variables, thread_id, page)
+            
+            if thread is None:
+                url = f"thread-{thread_id}-{page}-1.html"
+                response = await self.client.get(url)
+                if self.parse_pool is not None:
+                    # 在子进程中解析，事件循环可以继续处理其他页面的请求
+                    thread = await asyncio.wrap_future(self.parse_pool.submit_thread(
+                        response.content, response.encoding, thread_id, page, self.parser_backend
+                    ))
+                else:
+                    with get_registry().timer("parse.thread"):
+                        thread = self._parse_thread(response.text, thread_id, page)
+            
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取帖子详情异常：{e}")
+            return None
+        
+        self._save_thread(thread, page)
+        return thread
+    
+    def _save_thread(self, thread: Optional[Thread], page: int):
+        """把获取到的帖子页写入本地存储，未启用存储或写入失败时跳过
+        
+        Args:
+            thread: 帖子对象
+            page: 页码
+        """
+        if self.store is None or thread is None:
+            return
+        try:
+            self.store.save_thread(thread, page)
+        except sqlite3.Error as e:
+            print(f"警告：写入本地存储失败：{e}")
+    
+    def _uses_parse_pool(self) -> bool:
+        """多页获取时是否交给解析池（移动端接口返回的 JSON 不需要解析页面，不交给解析池）"""
+        return self.parse_pool is not None and self.mobile is None
+    
+    def _fetch_pages(self, executor: ThreadPoolExecutor, thread_id: str, pages: List[int]) -> List[Optional[Thread]]:
+        """并发获取帖子的多页，启用解析池时下载线程只请求页面，解析在子进程中进行
+        
+        Args:
+            executor: 请求页面的线程池
+            thread_id: 帖子 ID
+            pages: 页码列表
+            
+        Returns:
+            与 pages 对应的帖子对象，获取失败的页面为 None；获取到的页面均已写入本地存储
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        if not self._uses_parse_pool():
+            return list(executor.map(lambda p: self.get_thread(thread_id, p), pages))
+        
+        pending = list(executor.map(lambda p: self._submit_thread(thread_id, p), pages))
+        results = [self._thread_result(future) for future in pending]
+        for page, page_thread in zip(pages, results):
+            self._save_thread(page_thread, page)
+        return results
+    
+    def _submit_thread(self, thread_id: str, page: int) -> Optional["Future[Thread]"]:
+        """请求帖子的一页，并提交到解析池
+        
+        Args:
+            thread_id: 帖子 ID
+            page: 页码
+            
+        Returns:
+            结果为帖子对象的 Future，请求失败时返回 None
+            
+        Raises:
+            NetworkError: 网络故障或论坛服务器错误（已自动重试）
+            RateLimitError: 请求被论坛限制（已自动重试）
+        """
+        try:
+            url = f"thread-{thread_id}-{page}-1.html"
+            response = self.client.get(url)
+            return self.parse_pool.submit_thread(
+                response.content, response.encoding, thread_id, page, self.parser_backend
+            )
+            
+        except (NetworkError, RateLimitError):
+            raise
+        except Exception as e:
+            print(f"获取帖子详情异常：{e}")
+            return None
+    
+    @staticmethod
+    def _thread_result(future: Optional["Future[Thread]"]) -> Optional[Thread]:
+        """等待解析池返回结果
+        
+        Args:
+            future: _submit_thread 返回的 Future
+            
+        Returns:
+            帖子对象，请求或解析失败时返回 None
+        """
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"获取帖子详情异常：{e}")
+            return None
+    
+    def _parse_thread(self, html: str, thread_id: str, page: int) -> Thread:
+        """从帖子页面 HTML 解析帖子详情
+        
+        Args:
+            html: 页面 HTML
+            thread_id: 帖子 ID
+            page: 页码
+            
+        Returns:
+            帖子对象
+        """
+        if self.parser_backend == "lxml":
+            return lxml_parser.parse_thread(html, thread_id, page)
+        return _parse_thread_page(html, thread_id, page)
+    
+    def _parse_post(self, post_div: Tag, thread_id: str) -> Optional[Post]:
+        """解析单个 post_ div
+        
+        Args:
+            post_div: id 以 post_ 开头的 div 标签
+            thread_id: 帖子 ID
+            
+        Returns:
+            回复对象（包括楼主），没有回复 ID 时返回 None
+        """
+        scan = _PostScan(post_div)
+        _scan(post_div, _PageScan(), (scan,))
+        return _build_post(scan, thread_id)
     
     def create_thread(
         self, 
@@ -424,3 +807,241 @@ class ThreadAPI:
             print(f"回复异常：{e}")
             return None
 
+
+def _is_post_div(element) -> bool:
+    """lxml 元素是否为回复容器 <div id="post_123">"""
+    return element.tag == 'div' and bool(_POST_DIV_ID.match(element.get('id') or ''))
+
+
+def _copy_thread(source: Thread, target: Thread):
+    """把 source 的所有字段复制到 target（流式获取时页面信息写入调用方的对象）"""
+    for f in fields(source):
+        setattr(target, f.name, getattr(source, f.name))
+
+
+class _PostScan:
+    """单个 post_ div 内各字段所在的元素（均取第一个）"""
+    
+    __slots__ = ("div", "postnum", "authi", "post_time", "message")
+    
+    def __init__(self, div: Tag):
+        self.div = div
+        self.postnum: Optional[Tag] = None
+        self.authi: Optional[Tag] = None
+        self.post_time: Optional[Tag] = None
+        self.message: Optional[Tag] = None
+
+
+class _PageScan:
+    """帖子页面各字段所在的元素（均取文档中的第一个）"""
+    
+    __slots__ = ("subject", "title", "stats", "page_info", "authi", "message", "posts")
+    
+    def __init__(self):
+        self.subject: Optional[Tag] = None
+        self.title: Optional[Tag] = None
+        self.stats: Optional[Tag] = None
+        self.page_info: Optional[Tag] = None
+        self.authi: Optional[Tag] = None
+        self.message: Optional[Tag] = None
+        self.posts: List[_PostScan] = []
+
+
+def _scan(tag: Tag, page: _PageScan, active: Tuple[_PostScan, ...] = ()):
+    """深度优先遍历一次，同时收集页面级元素和每个回复内的元素
+    
+    Args:
+        tag: 当前遍历的标签
+        page: 页面级元素的收集结果
+        active: 包含当前标签的所有 post_ div（post_rate_div_ 等会嵌套在回复内）
+    """
+    for child in tag.children:
+        if not isinstance(child, Tag):
+            continue
+        name = child.name
+        element_id = child.get('id') or ''
+        inner = active
+        
+        if name == 'div':
+            classes = child.get('class') or ()
+            if element_id.startswith('post_'):
+                post = _PostScan(child)
+                page.posts.append(post)
+                inner = active + (post,)
+            if 'authi' in classes:
+                if page.authi is None:
+                    page.authi = child
+                for post in inner:
+                    if post.authi is None:
+                        post.authi = child
+            if page.stats is None and ' '.join(classes) == 'hm ptn':
+                page.stats = child
+        elif name == 'td' and element_id.startswith('postmessage_'):
+            if page.message is None:
+                page.message = child
+            for post in inner:
+                if post.message is None:
+                    post.message = child
+        elif name == 'em' and element_id.startswith('authorposton'):
+            for post in inner:
+                if post.post_time is None:
+                    post.post_time = child
+        elif name == 'a' and element_id.startswith('postnum'):
+            for post in inner:
+                if post.postnum is None:
+                    post.postnum = child
+        elif name == 'span':
+            if page.subject is None and element_id == 'thread_subject':
+                page.subject = child
+            title = child.get('title')
+            if page.page_info is None and title and '共' in title and '页' in title:
+                page.page_info = child
+        elif name == 'h1' and page.title is None and 'ts' in (child.get('class') or ()):
+            page.title = child
+        
+        _scan(child, page, inner)
+
+
+def _content_strings(tag: Tag) -> Iterator[str]:
+    """产出内容区的文本片段
+    
+    去掉引用和签名，外部链接替换为完整 URL，注释和 script/style 中的文本不计入
+    （与 get_text 相同），不修改原文档。
+    """
+    for child in tag.children:
+        if isinstance(child, Tag):
+            if child.name == 'div' and (
+                'quote' in (child.get('class') or ()) or 'sign_' in (child.get('id') or '')
+            ):
+                continue
+            if child.name == 'a':
+                href = child.get('href', '')
+                if href and ('http://' in href or 'https://' in href):
+                    yield href
+                    continue
+            yield from _content_strings(child)
+        elif type(child) in _TEXT_TYPES:
+            yield child
+
+
+def _content_of(message: Optional[Tag]) -> str:
+    """提取内容区文本，URL 替换为跳转提示"""
+    if message is None:
+        return ''
+    content = '\n'.join(s.strip() for s in _content_strings(message) if s.strip())
+    return linkify_urls(content)
+
+
+def _author_of(authi: Optional[Tag]) -> str:
+    """从 authi 区域提取作者名"""
+    if authi is None:
+        return ''
+    author_link = authi.find('a', class_='xw1')
+    return author_link.get_text(strip=True) if author_link else ''
+
+
+def _post_time_of(time_elem: Optional[Tag]) -> Optional[str]:
+    """提取发表时间，去掉 "发表于" 前缀（如 "发表于 2025-6-5 10:19"）"""
+    if time_elem is None:
+        return None
+    time_text = time_elem.get_text(strip=True)
+    if '发表于' in time_text:
+        return time_text.replace('发表于', '').strip()
+    return time_text
+
+
+def _floor_of(postnum_link: Optional[Tag]) -> int:
+    """提取楼层号 - 楼层号在 <a id="postnumXXX"> 内的 <em> 标签中"""
+    if postnum_link is None:
+        return 0
+    floor_em = postnum_link.find('em')
+    if floor_em:
+        floor_text = floor_em.get_text(strip=True)
+        try:
+            return int(floor_text)
+        except ValueError:
+            # 可能是 "沙发"、"板凳" 等
+            return _FLOOR_NAMES.get(floor_text, 0)
+    if '楼主' in postnum_link.get_text():
+        return 1
+    return 0
+
+
+def _build_post(scan: _PostScan, thread_id: str) -> Optional[Post]:
+    """根据收集到的元素生成回复对象，没有回复 ID 时返回 None"""
+    post_id = scan.div.get('id', '').replace('post_', '')
+    if not post_id:
+        return None
+    
+    return Post(
+        id=post_id,
+        thread_id=thread_id,
+        floor=_floor_of(scan.postnum),
+        author=_author_of(scan.authi),
+        content=_content_of(scan.message),
+        post_time=_post_time_of(scan.post_time)
+    )
+
+
+def _parse_thread_page(html: str, thread_id: str, page: int) -> Thread:
+    """用 BeautifulSoup 解析帖子页面
+    
+    只遍历一次文档树，标题、统计、页数和所有回复所在的元素在同一次遍历中找到，
+    解析耗时与页面大小成正比。
+    
+    Args:
+        html: 页面 HTML
+        thread_id: 帖子 ID
+        page: 页码
+        
+    Returns:
+        帖子对象，posts 为本页除楼主外的回复
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    scan = _PageScan()
+    _scan(soup, scan)
+    
+    title_elem = scan.subject or scan.title
+    title = title_elem.get_text(strip=True) if title_elem else "未知标题"
+    
+    # 浏览数和回复数
+    # 格式: <span class="xg1">查看:</span> <span class="xi1">38628</span><span class="pipe">|</span><span class="xg1">回复:</span> <span class="xi1">280</span>
+    views = 0
+    replies = 0
+    if scan.stats:
+        xi1_spans = scan.stats.find_all('span', class_='xi1')
+        if len(xi1_spans) >= 2:
+            try:
+                views = int(xi1_spans[0].get_text(strip=True))
+                replies = int(xi1_spans[1].get_text(strip=True))
+            except ValueError:
+                pass
+    
+    total_pages = 1
+    if scan.page_info:
+        match = _TOTAL_PAGES.search(scan.page_info.get('title', ''))
+        if match:
+            total_pages = int(match.group(1))
+    
+    posts = []
+    for post_scan in scan.posts:
+        try:
+            post = _build_post(post_scan, thread_id)
+        except Exception:
+            # 跳过解析失败的回复
+            continue
+        if post and post.floor > 1:  # 跳过楼主（楼层1），只保留回复
+            posts.append(post)
+    
+    return Thread(
+        id=thread_id,
+        title=title,
+        author=_author_of(scan.authi),
+        content=_content_of(scan.message),
+        views=views,
+        replies=replies,
+        created_at=_post_time_of(scan.posts[0].post_time) if scan.posts else None,
+        current_page=page,
+        total_pages=total_pages,
+        posts=posts
+    )
@@ -0,0 +1,263 @@
+"""帖子归档
+
+把帖子的所有页面依次写入一个文件（JSONL、HTML 或 Markdown）。
+
+- 页面通过 ThreadAPI.iter_pages 逐页获取，每页解析完立即写出其中的回复，
+  内存中只保留正在获取的几页，几千页的帖子也不会越用越多
+- 每写完一页，在 ``<输出文件>.checkpoint`` 中记录页码、最后一个楼层和文件长度；
+  中断后用 resume 继续时，先把文件截断到记录的长度，再从记录的页码接着写
+- 归档完成后检查点保留，之后再 resume 只会追加新回复
+"""
+import html
+import itertools
+import json
+import os
+import re
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from s1cli.api.client import BaseS1Client
+from s1cli.api.thread import ThreadAPI
+from s1cli.models.thread import Post, Thread
+from s1cli.records import dumps, page_posts, post_record
+
+
+FORMATS = ("jsonl", "html", "md")
+
+# 帖子内容中外部链接的 Rich 标记（见 utils.linkify_urls）
+_LINK_MARKUP = re.compile(r'\[link=([^\]]+)\](.*?)\[/link\]')
+
+
+@dataclass
+class Checkpoint:
+    """归档进度"""
+    thread_id: str
+    format: str
+    page: int  # 最后写完的页码
+    floor: int  # 最后写出的楼层
+    offset: int  # 写完该页后的文件长度（不含结尾）
+
+
+@dataclass
+class ArchiveResult:
+    """一次归档的结果"""
+    thread_id: str
+    title: Optional[str] = None
+    posts: int = 0  # 本次写出的楼层数
+    pages: int = 0  # 本次获取的页面数
+    last_page: int = 0
+    last_floor: int = 0
+    total_pages: int = 0
+
+
+def checkpoint_path(path: Path) -> Path:
+    """归档文件对应的检查点文件路径"""
+    return path.with_name(path.name + ".checkpoint")
+
+
+def load_checkpoint(path: Path) -> Optional[Checkpoint]:
+    """读取归档文件的检查点
+
+    Args:
+        path: 归档文件路径
+
+    Returns:
+        检查点，不存在或无法解析时返回 None
+    """
+    try:
+        with open(checkpoint_path(path), "r", encoding="utf-8") as f:
+            return Checkpoint(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _save_checkpoint(path: Path, checkpoint: Checkpoint):
+    """原子地写入检查点"""
+    target = checkpoint_path(path)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(checkpoint), f)
+    os.replace(tmp_path, target)
+
+
+def _thread_url(thread_id: str) -> str:
+    """帖子第一页的网址"""
+    return f"{BaseS1Client.BASE_URL}/thread-{thread_id}-1-1.html"
+
+
+class _Writer:
+    """输出格式：文件由开头、每个楼层和结尾三部分依次拼成"""
+
+    def header(self, thread: Thread) -> str:
+        """文件开头（只在新建归档时写入）"""
+        return ""
+
+    def post(self, post: Post, page: int) -> str:
+        """一个楼层"""
+        raise NotImplementedError
+
+    def footer(self) -> str:
+        """文件结尾（每次归档结束时写入，继续归档时先截掉）"""
+        return ""
+
+
+class _JsonlWriter(_Writer):
+    """每行一个楼层的 JSON 对象（字段见 records.post_record）"""
+
+    def post(self, post: Post, page: int) -> str:
+        return dumps(post_record(post, page)) + "\n"
+
+
+class _HtmlWriter(_Writer):
+    """单个 HTML 页面，不依赖外部资源"""
+
+    def header(self, thread: Thread) -> str:
+        title = html.escape(thread.title)
+        return (
+            "<!DOCTYPE html>\n"
+            '<html lang="zh-CN">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{title}</title>\n"
+            "<style>body{max-width:50em;margin:auto;padding:1em;font-family:sans-serif;line-height:1.6}"
+            "article{border-top:1px solid #ddd;padding:.5em 0}h2{font-size:1em;color:#555}</style>\n"
+            "</head>\n<body>\n"
+            f'<h1><a href="{html.escape(_thread_url(thread.id))}">{title}</a></h1>\n'
+            f"<p>作者：{html.escape(thread.author)}</p>\n"
+        )
+
+    def post(self, post: Post, page: int) -> str:
+        parts = []
+        last = 0
+        for match in _LINK_MARKUP.finditer(post.content):
+            parts.append(html.escape(post.content[last:match.start()]))
+            parts.append(f'<a href="{html.escape(match.group(1))}">{html.escape(match.group(2))}</a>')
+            last = match.end()
+        parts.append(html.escape(post.content[last:]))
+        content = "".join(parts).replace("\n", "<br>\n")
+
+        anchor = f' id="pid{post.id}"' if post.id else ""
+        post_time = html.escape(str(post.post_time)) if post.post_time else ""
+        return (
+            f"<article{anchor}>\n"
+            f"<h2>#{post.floor} {html.escape(post.author)} <time>{post_time}</time></h2>\n"
+            f"<p>{content}</p>\n</article>\n"
+        )
+
+    def footer(self) -> str:
+        return "</body>\n</html>\n"
+
+
+class _MarkdownWriter(_Writer):
+    """Markdown 文档，每个楼层一节"""
+
+    def header(self, thread: Thread) -> str:
+        return f"# {thread.title}\n\n作者：{thread.author} | 原帖：<{_thread_url(thread.id)}>\n\n"
+
+    def post(self, post: Post, page: int) -> str:
+        content = _LINK_MARKUP.sub(lambda m: f"[{m.group(2)}]({m.group(1)})", post.content)
+        # 保留原文换行
+        content = "  \n".join(content.split("\n"))
+        post_time = f" · {post.post_time}" if post.post_time else ""
+        return f"## #{post.floor} {post.author}{post_time}\n\n{content}\n\n"
+
+
+_WRITERS = {
+    "jsonl": _JsonlWriter,
+    "html": _HtmlWriter,
+    "md": _MarkdownWriter,
+}
+
+
+def archive_thread(
+    thread_api: ThreadAPI,
+    thread_id: str,
+    path: Path,
+    fmt: str = "jsonl",
+    resume: bool = False,
+    progress: Optional[Callable[[ArchiveResult], None]] = None
+) -> ArchiveResult:
+    """把帖子的所有页面写入文件
+
+    获取失败时已经写完的页面和检查点保留，之后可以用 resume 继续；
+    第一页就获取失败时不创建（或改动）输出文件。
+
+    Args:
+        thread_api: 帖子 API
+        thread_id: 帖子 ID
+        path: 输出文件
+        fmt: 输出格式（jsonl/html/md）
+        resume: 按检查点继续；没有检查点时从头开始
+        progress: 每写完一页调用一次，参数为当前的归档结果
+
+    Returns:
+        归档结果
+
+    Raises:
+        ValueError: 格式不支持，或检查点属于其他帖子或其他格式
+        NetworkError: 网络故障或论坛服务器错误（已自动重试）
+        RateLimitError: 请求被论坛限制（已自动重试）
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"不支持的格式：{fmt}（可选：{'/'.join(FORMATS)}）")
+    writer = _WRITERS[fmt]()
+    path = Path(path)
+
+    checkpoint = load_checkpoint(path) if resume and path.exists() else None
+    if checkpoint is not None and (checkpoint.thread_id != str(thread_id) or checkpoint.format != fmt):
+        raise ValueError(
+            f"{path} 是帖子 {checkpoint.thread_id} 的 {checkpoint.format} 归档，"
+            f"不能继续写入帖子 {thread_id} 的 {fmt} 归档"
+        )
+
+    result = ArchiveResult(thread_id=str(thread_id))
+    if checkpoint is not None:
+        # 重新获取最后写完的一页（之后可能有了新回复），已经写过的楼层按楼层号跳过
+        start_page = checkpoint.page
+        result.last_page = checkpoint.page
+        result.last_floor = checkpoint.floor
+    else:
+        start_page = 1
+
+    # 中途出错时关闭生成器，不再获取预取中的页面
+    with closing(thread_api.iter_pages(thread_id, start_page)) as pages:
+        first = next(pages, None)
+        if first is None:
+            return result
+
+        with open(path, "r+b" if checkpoint is not None else "wb") as f:
+            if checkpoint is not None:
+                f.truncate(checkpoint.offset)
+                f.seek(checkpoint.offset)
+
+            for thread in itertools.chain([first], pages):
+                page = thread.current_page
+                if result.title is None:
+                    result.title = thread.title
+                    if checkpoint is None:
+                        f.write(writer.header(thread).encode("utf-8"))
+
+                for post in page_posts(thread):
+                    if post.floor <= result.last_floor:
+                        continue
+                    f.write(writer.post(post, page).encode("utf-8"))
+                    result.posts += 1
+                    result.last_floor = post.floor
+
+                f.flush()
+                result.pages += 1
+                result.last_page = page
+                result.total_pages = max(thread.total_pages, page)
+                _save_checkpoint(path, Checkpoint(
+                    thread_id=str(thread_id),
+                    format=fmt,
+                    page=page,
+                    floor=result.last_floor,
+                    offset=f.tell(),
+                ))
+                if progress is not None:
+                    progress(result)
+
+            f.write(writer.footer().encode("utf-8"))
+
+    return result
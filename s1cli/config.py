@@ -1,10 +1,11 @@
 """配置文件和会话管理"""
 import os
-import toml
+import threading
+import time
 import base64
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import IO, Any, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 
 
@@ -29,19 +30,37 @@ class Config:
         # 确保配置目录存在
         self._ensure_config_dir()
         
-        # 加载配置
-        self._config = self._load_config()
-        self._session = self._load_session()
+        # 配置和会话文件在第一次用到时才读取
+        self._config_data: Optional[Dict[str, Any]] = None
+        self._session_data: Optional[Dict[str, Any]] = None
+    
+    @property
+    def _config(self) -> Dict[str, Any]:
+        """配置（第一次访问时从文件加载）"""
+        if self._config_data is None:
+            self._config_data = self._load_config()
+        return self._config_data
+    
+    @property
+    def _session(self) -> Dict[str, Any]:
+        """会话信息（第一次访问时从文件加载）"""
+        if self._session_data is None:
+            self._session_data = self._load_session()
+        return self._session_data
+    
+    @_session.setter
+    def _session(self, value: Dict[str, Any]):
+        self._session_data = value
     
     def _ensure_config_dir(self):
-        """确保配置目录存在"""
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        """确保配置目录存在（缓存目录在配置目录之下，一次创建）"""
         self.cache_dir.mkdir(parents=True, exist_ok=True)
     
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
         if self.config_file.exists():
             try:
+                import toml
                 return toml.load(self.config_file)
             except Exception as e:
                 print(f"警告：加载配置文件失败：{e}")
@@ -63,6 +82,7 @@ class Config:
         """加载会话信息"""
         if self.session_file.exists():
             try:
+                import toml
                 session = toml.load(self.session_file)
                 # 检查会话是否过期
                 if self._is_session_expired(session):
@@ -96,19 +116,48 @@ class Config:
         except Exception:
             return True
     
+    def _write_atomic(self, path: Path, write: Callable[[IO[str]], None]):
+        """原子地写入文件
+        
+        先写入同目录下的临时文件并 fsync，再用 os.replace 替换，
+        进程中途退出也不会留下写了一半的文件。
+        
+        Args:
+            path: 目标文件
+            write: 向临时文件写入内容的函数
+        """
+        tmp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, path)
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink()
+    
+    def _write_toml_atomic(self, path: Path, data: Dict[str, Any]):
+        """原子地写入 TOML 文件
+        
+        Args:
+            path: 目标文件
+            data: 要写入的数据
+        """
+        import toml
+        self._write_atomic(path, lambda f: toml.dump(data, f))
+    
     def save_config(self):
         """保存配置到文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                toml.dump(self._config, f)
+            self._write_toml_atomic(self.config_file, self._config)
         except Exception as e:
             print(f"错误：保存配置文件失败：{e}")
     
     def save_session(self):
         """保存会话到文件"""
         try:
-            with open(self.session_file, 'w', encoding='utf-8') as f:
-                toml.dump(self._session, f)
+            self._write_toml_atomic(self.session_file, self._session)
         except Exception as e:
             print(f"错误：保存会话文件失败：{e}")
     
@@ -180,19 +229,24 @@ class Config:
         self._session[key] = value
         self.save_session()
     
-    def save_cookies(self, cookies: Dict[str, str]):
+    def save_cookies(self, cookies: Dict[str, str], renew: bool = True):
         """保存 cookies
         
         Args:
             cookies: cookies 字典
+            renew: 是否刷新会话创建时间（仅在登录凭证变化时需要）
         """
         # 使用 base64 编码存储
         cookies_json = json.dumps(cookies)
         cookies_encoded = base64.b64encode(cookies_json.encode()).decode()
         
+        if cookies_encoded == self._session.get("cookies") and not renew:
+            return
+        
         self._session["cookies"] = cookies_encoded
-        self._session["created_at"] = datetime.now().isoformat()
-        self._session["expires_in"] = 7 * 24 * 3600  # 7 天
+        if renew or "created_at" not in self._session:
+            self._session["created_at"] = datetime.now().isoformat()
+            self._session["expires_in"] = 7 * 24 * 3600  # 7 天
         self.save_session()
     
     def load_cookies(self) -> Dict[str, str]:
@@ -262,17 +316,17 @@ class Config:
         return self.cache_dir / cache_name
     
     def save_forum_list(self, forums: list):
-        """保存版块列表到缓存
+        """保存版块列表到缓存，同时记录更新时间
         
         Args:
             forums: 版块列表
         """
         try:
             cache_file = self.cache_dir / "forums.json"
-            import json
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                # 将 Forum 对象转换为字典
-                forums_data = [
+            # 将 Forum 对象转换为字典
+            data = {
+                'updated_at': time.time(),
+                'forums': [
                     {
                         'id': f.id,
                         'name': f.name,
@@ -280,32 +334,59 @@ class Config:
                         'threads_count': f.threads_count,
                         'posts_count': f.posts_count,
                         'new_posts': f.new_posts,
-                        'url': f.url
+                        'url': f.url,
+                        'group': f.group
                     }
                     for f in forums
                 ]
-                json.dump(forums_data, f, ensure_ascii=False, indent=2)
+            }
+            self._write_atomic(cache_file, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
         except Exception as e:
             print(f"警告：保存版块列表失败：{e}")
     
-    def load_forum_list(self):
+    def _read_forum_cache(self) -> Optional[Dict[str, Any]]:
+        """读取版块列表缓存文件
+        
+        旧版本直接保存版块列表，没有更新时间，此时以文件修改时间作为更新时间。
+        
+        Returns:
+            {'updated_at': 时间戳, 'forums': 版块列表}，没有缓存时返回 None
+        """
+        cache_file = self.cache_dir / "forums.json"
+        if not cache_file.exists():
+            return None
+        
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return {'updated_at': cache_file.stat().st_mtime, 'forums': data}
+        return data
+    
+    def load_forum_list(self) -> Optional[List[Dict[str, Any]]]:
         """从缓存加载版块列表
         
         Returns:
             版块列表或 None
         """
         try:
-            cache_file = self.cache_dir / "forums.json"
-            if not cache_file.exists():
-                return None
-            
-            import json
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            data = self._read_forum_cache()
+            return data['forums'] if data else None
         except Exception as e:
             print(f"警告：加载版块列表失败：{e}")
             return None
     
+    def forum_list_updated_at(self) -> Optional[float]:
+        """获取版块列表缓存的更新时间
+        
+        Returns:
+            更新时间戳，没有缓存时返回 None
+        """
+        try:
+            data = self._read_forum_cache()
+            return float(data['updated_at']) if data else None
+        except Exception:
+            return None
+    
     def save_thread_list(self, threads: list, forum_name: str):
         """保存帖子列表到缓存
         
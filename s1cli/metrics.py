@@ -0,0 +1,177 @@
+"""请求和解析耗时统计"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+
+@dataclass
+class RequestTiming:
+    """单个请求的耗时（秒）"""
+
+    method: str
+    url: str
+    status: Optional[int] = None
+    queued: float = 0.0     # 等待请求频率限制
+    connect: float = 0.0    # 建立连接（TCP + TLS），复用连接时为 0
+    ttfb: float = 0.0       # 发出请求到收到响应头
+    download: float = 0.0   # 读取响应体
+    total: float = 0.0      # 从排队到读完响应体
+    bytes: int = 0
+    cache_hit: bool = False
+
+
+@dataclass
+class PhaseTiming:
+    """某一阶段（如解析）的累计耗时"""
+
+    count: int = 0
+    total: float = 0.0
+
+
+class MetricsRegistry:
+    """进程内的耗时统计
+
+    默认关闭，关闭时记录操作几乎没有开销。开启后 S1Client 记录每个请求的耗时，
+    各 API 类记录解析阶段的耗时。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self.requests: List[RequestTiming] = []
+        self.phases: Dict[str, PhaseTiming] = {}
+
+    def enable(self):
+        """开启统计并重新开始计时"""
+        self.reset()
+        self.enabled = True
+
+    def reset(self):
+        """清空已有记录"""
+        with self._lock:
+            self.started_at = time.perf_counter()
+            self.requests = []
+            self.phases = {}
+
+    def record_request(self, timing: RequestTiming):
+        """记录一个请求的耗时"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.requests.append(timing)
+
+    def record_phase(self, name: str, elapsed: float):
+        """累加某个阶段的耗时"""
+        if not self.enabled:
+            return
+        with self._lock:
+            phase = self.phases.setdefault(name, PhaseTiming())
+            phase.count += 1
+            phase.total += elapsed
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """统计代码块的耗时
+
+        Example:
+            with get_registry().timer("parse.thread"):
+                thread = parse(html)
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def wall_time(self) -> float:
+        """开启统计以来经过的时间"""
+        return time.perf_counter() - self.started_at
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """获取进程内共享的统计对象"""
+    return _registry
+
+
+class RequestTracer:
+    """通过 httpcore 的 trace 扩展收集连接、首字节等时间点
+
+    Example:
+        tracer = RequestTracer()
+        sent = time.perf_counter()
+        response = client.get(url, extensions={"trace": tracer})
+        timing = tracer.timing("GET", url, sent, sent, time.perf_counter(),
+                               response.status_code, len(response.content))
+    """
+
+    def __init__(self):
+        self.marks: Dict[str, float] = {}
+
+    def __call__(self, event_name: str, info: dict):
+        self.marks[event_name] = time.perf_counter()
+
+    async def async_trace(self, event_name: str, info: dict):
+        """异步客户端使用的 trace 回调"""
+        self(event_name, info)
+
+    def _first(self, *suffixes: str) -> Optional[float]:
+        """按事件名后缀查找时间点（兼容 http11/http2）
+
+        按参数顺序优先：前面的后缀没有记录时才查找后面的后缀。
+        """
+        for suffix in suffixes:
+            for name, mark in self.marks.items():
+                if name.endswith(suffix):
+                    return mark
+        return None
+
+    def timing(
+        self,
+        method: str,
+        url: str,
+        started: float,
+        sent: float,
+        finished: float,
+        status: Optional[int],
+        size: int
+    ) -> RequestTiming:
+        """根据记录的时间点生成请求耗时
+
+        Args:
+            method: 请求方法
+            url: 请求 URL
+            started: 开始排队的时间
+            sent: 通过频率限制、开始发送的时间
+            finished: 读完响应体的时间
+            status: 状态码
+            size: 响应体字节数
+
+        Returns:
+            请求耗时
+        """
+        connect_start = self._first("connect_tcp.started")
+        connect_end = self._first("start_tls.complete", "connect_tcp.complete")
+        headers_done = self._first("receive_response_headers.complete")
+
+        connect = connect_end - connect_start if connect_start and connect_end else 0.0
+        headers_done = headers_done or finished
+        return RequestTiming(
+            method=method,
+            url=url,
+            status=status,
+            queued=sent - started,
+            connect=connect,
+            ttfb=headers_done - sent,
+            download=finished - headers_done,
+            total=finished - started,
+            bytes=size,
+        )
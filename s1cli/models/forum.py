@@ -14,6 +14,7 @@ class Forum:
     posts_count: int = 0
     new_posts: int = 0  # 新帖数
     url: Optional[str] = None
+    group: Optional[str] = None  # 所属分区，如 主论坛
     
     def __str__(self) -> str:
         return f"{self.name} (主题: {self.threads_count})"
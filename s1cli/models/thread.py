@@ -26,6 +26,7 @@ class Thread:
     posts: List['Post'] = field(default_factory=list)
     current_page: int = 1
     total_pages: int = 1
+    fetched_at: Optional[float] = None  # 从本地存储读取时为当时获取的时间戳
     
     def __str__(self) -> str:
         return f"[{self.id}] {self.title} by {self.author}"
@@ -47,3 +48,16 @@ class Post:
     def __str__(self) -> str:
         return f"#{self.floor} {self.author}: {self.content[:50]}..."
 
+
+
+@dataclass
+class SyncResult:
+    """帖子增量同步结果"""
+    
+    thread_id: str
+    title: Optional[str] = None
+    new_posts: List[Post] = field(default_factory=list)  # 上次同步之后的新回复
+    last_floor: int = 0  # 同步后的最高楼层
+    last_page: int = 1  # 最高楼层所在页码
+    requests: int = 0  # 本次同步请求的页面数
+    skipped: bool = False  # 帖子列表中的回复数没有变化，没有请求帖子页面
@@ -0,0 +1,66 @@
+"""机器可读输出的记录格式
+
+NDJSON 输出（--format ndjson）和 JSONL 归档共用这里的字段，每条记录是一个扁平的 dict：
+
+- 帖子：Thread 的字段（不含 posts），列表、搜索结果中的帖子都是这种记录
+- 楼层：帖子 ID、回复 ID、楼层、所在页码、作者、时间和内容，第一页包括楼主（floor 为 1）
+- 版块：Forum 的全部字段
+- 本地搜索命中：SearchHit 的全部字段
+
+时间字段按字符串输出。
+"""
+import json
+from dataclasses import asdict, fields
+from typing import Any, Dict, Iterator
+
+from s1cli.models.forum import Forum
+from s1cli.models.thread import Post, Thread
+
+
+def dumps(record: Dict[str, Any]) -> str:
+    """把记录编码为一行紧凑的 JSON（不含换行）"""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def thread_record(thread: Thread) -> Dict[str, Any]:
+    """帖子记录（不含回复）"""
+    return {f.name: getattr(thread, f.name) for f in fields(thread) if f.name != "posts"}
+
+
+def post_record(post: Post, page: int) -> Dict[str, Any]:
+    """楼层记录
+
+    Args:
+        post: 回复对象
+        page: 所在页码
+    """
+    return {
+        "thread_id": post.thread_id,
+        "id": post.id or None,
+        "floor": post.floor,
+        "page": page,
+        "author": post.author,
+        "author_id": post.author_id,
+        "post_time": post.post_time,
+        "content": post.content,
+    }
+
+
+def forum_record(forum: Forum) -> Dict[str, Any]:
+    """版块记录"""
+    return asdict(forum)
+
+
+def page_posts(thread: Thread) -> Iterator[Post]:
+    """一页中的所有楼层（第一页包括楼主）"""
+    if thread.current_page == 1:
+        yield Post(
+            id="",
+            thread_id=thread.id,
+            floor=1,
+            author=thread.author,
+            author_id=thread.author_id,
+            content=thread.content or "",
+            post_time=thread.created_at,
+        )
+    yield from thread.posts
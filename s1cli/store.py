@@ -0,0 +1,717 @@
+"""本地 SQLite 存储
+
+ForumAPI 和 ThreadAPI 获取到的版块、帖子列表和回复都会写入配置目录下的
+``store.db``，供离线阅读、增量同步和本地搜索使用。
+
+- 使用 WAL 模式，读写互不阻塞，多个 s1cli 进程可以同时使用
+- 每次 API 调用的结果在一个事务中批量写入
+- 表结构按 ``PRAGMA user_version`` 逐版本升级
+- 帖子标题、楼主内容和回复建有 FTS5 全文索引，中日韩文字按相邻两字切分，
+  不需要额外的分词库
+
+通过配置 ``store.enabled = false`` 关闭。
+"""
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from s1cli.config import Config
+from s1cli.models.forum import Forum
+from s1cli.models.thread import Thread, Post
+
+
+# 每个元素把表结构从上一版本升级到下一版本（下标 0 对应版本 1）
+_MIGRATIONS: List[str] = [
+    """
+    CREATE TABLE forums (
+        fid INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        threads_count INTEGER NOT NULL DEFAULT 0,
+        posts_count INTEGER NOT NULL DEFAULT 0,
+        new_posts INTEGER NOT NULL DEFAULT 0,
+        url TEXT,
+        fetched_at REAL NOT NULL
+    );
+    CREATE TABLE threads (
+        tid INTEGER PRIMARY KEY,
+        fid INTEGER,
+        title TEXT NOT NULL,
+        author TEXT,
+        author_id TEXT,
+        content TEXT,
+        views INTEGER NOT NULL DEFAULT 0,
+        replies INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT,
+        last_reply_time TEXT,
+        last_reply_author TEXT,
+        is_sticky INTEGER NOT NULL DEFAULT 0,
+        is_locked INTEGER NOT NULL DEFAULT 0,
+        is_digest INTEGER NOT NULL DEFAULT 0,
+        total_pages INTEGER,
+        -- 最近一次出现在版块帖子列表中的页码和位置
+        list_page INTEGER,
+        list_position INTEGER,
+        fetched_at REAL NOT NULL
+    );
+    CREATE INDEX threads_list ON threads (fid, list_page, list_position);
+    CREATE TABLE posts (
+        pid INTEGER PRIMARY KEY,
+        tid INTEGER NOT NULL,
+        floor INTEGER NOT NULL,
+        page INTEGER NOT NULL,
+        author TEXT,
+        author_id TEXT,
+        content TEXT,
+        post_time TEXT,
+        fetched_at REAL NOT NULL
+    );
+    CREATE INDEX posts_thread ON posts (tid, floor);
+    """,
+    """
+    -- 最近一次在版块帖子列表中看到该帖子的时间（此时的 replies 来自帖子列表）
+    ALTER TABLE threads ADD COLUMN listed_at REAL;
+    -- 增量同步的帖子：上次同步到的最高楼层、所在页码和当时的回复数
+    CREATE TABLE sync_state (
+        tid INTEGER PRIMARY KEY,
+        last_floor INTEGER NOT NULL DEFAULT 0,
+        last_page INTEGER NOT NULL DEFAULT 1,
+        replies INTEGER NOT NULL DEFAULT 0,
+        synced_at REAL NOT NULL
+    );
+    """,
+    """
+    -- 全文索引：rowid 为正数时是回复（pid），为负数时是帖子标题和楼主内容（-tid）
+    CREATE VIRTUAL TABLE search_index USING fts5(title, body, tokenize = 'unicode61 remove_diacritics 2');
+    INSERT INTO search_index (rowid, title, body)
+        SELECT -tid, s1_ngrams(title), s1_ngrams(content) FROM threads;
+    INSERT INTO search_index (rowid, title, body)
+        SELECT pid, '', s1_ngrams(content) FROM posts;
+    """,
+    """
+    -- 楼主内容已经在帖子的条目（-tid）中，去掉第一楼回复的重复条目
+    DELETE FROM search_index WHERE rowid IN (SELECT pid FROM posts WHERE floor = 1);
+    """,
+]
+
+# 重建帖子和回复的索引条目（参数为 tid / pid），与数据写入在同一个事务中执行。
+# 楼主内容只在帖子的条目中建索引，第一楼的回复不再重复索引
+_INDEX_THREAD = """
+    INSERT OR REPLACE INTO search_index (rowid, title, body)
+    SELECT -tid, s1_ngrams(title), s1_ngrams(content) FROM threads WHERE tid = ?
+"""
+_INDEX_POST = """
+    INSERT OR REPLACE INTO search_index (rowid, title, body)
+    SELECT pid, '', s1_ngrams(content) FROM posts WHERE pid = ? AND floor > 1
+"""
+
+# 中日韩文字（汉字、假名、谚文），词之间没有空格，按相邻两字切分后建索引
+_CJK_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+")
+_WORD = re.compile(r"\w", re.UNICODE)
+
+
+@dataclass
+class SyncState:
+    """帖子的增量同步进度"""
+    thread_id: str
+    last_floor: int  # 已同步的最高楼层
+    last_page: int  # 最高楼层所在页码
+    replies: int  # 同步时帖子的回复数
+    synced_at: float
+
+
+@dataclass
+class SearchHit:
+    """本地搜索命中的一条内容"""
+    thread_id: str
+    title: str
+    author: str
+    forum_id: Optional[str]
+    forum: Optional[str]  # 版块名称（本地存储中有该版块时）
+    post_id: Optional[str]  # 命中回复时为回复 ID，命中标题或楼主内容时为 None
+    floor: int  # 命中的楼层，标题或楼主内容为 1
+    snippet: str  # 命中位置附近的原文
+    rank: float  # BM25 相关度，越小越相关
+
+
+def ngrams(text: Optional[str]) -> str:
+    """把文本转换为建索引用的形式
+
+    中日韩文字连续的一段切分为相邻两字（“宝可梦” → “宝可 可梦 梦”，末尾单字用于
+    单字查询），其余文字保持原样，交给 FTS5 的 unicode61 分词。
+
+    Args:
+        text: 原文
+
+    Returns:
+        以空格分隔的词
+    """
+    if not text:
+        return ''
+
+    def split(match: re.Match) -> str:
+        run = match.group(0)
+        pairs = [run[i:i + 2] for i in range(len(run) - 1)]
+        return ' ' + ' '.join(pairs + [run[-1]]) + ' '
+
+    return _CJK_RUN.sub(split, text)
+
+
+def match_expression(query: str) -> Tuple[str, List[str]]:
+    """把用户输入的查询转换为 FTS5 MATCH 表达式
+
+    空格分隔的每个词都必须出现；词中连续的中日韩文字按相邻两字组成短语
+    （保证相邻），其余部分按前缀匹配。
+
+    Args:
+        query: 查询文本
+
+    Returns:
+        (MATCH 表达式, 用于定位摘要的原文片段)；没有可搜索的内容时表达式为空字符串
+    """
+    clauses = []
+    parts = []
+    for term in query.split():
+        position = 0
+        for match in _CJK_RUN.finditer(term):
+            parts.extend([term[position:match.start()], match.group(0)])
+            position = match.end()
+        parts.append(term[position:])
+
+    fragments = []
+    for part in parts:
+        if not _WORD.search(part):
+            continue
+        fragments.append(part)
+        if _CJK_RUN.fullmatch(part) and len(part) > 1:
+            tokens = ' '.join(part[i:i + 2] for i in range(len(part) - 1))
+            clauses.append(f'"{tokens}"')
+        else:
+            clauses.append('"%s"*' % part.replace('"', '""'))
+    return ' '.join(clauses), fragments
+
+
+def _snippet(text: Optional[str], fragments: Sequence[str], width: int = 80) -> str:
+    """截取第一个命中片段附近的原文"""
+    text = ' '.join((text or '').split())
+    lowered = text.casefold()
+    positions = [lowered.find(f.casefold()) for f in fragments]
+    start = min((p for p in positions if p >= 0), default=0)
+    begin = max(0, start - width // 4)
+    snippet = text[begin:begin + width]
+    return ('…' if begin > 0 else '') + snippet + ('…' if begin + width < len(text) else '')
+
+
+def _int_id(value: Optional[str]) -> Optional[int]:
+    """把字符串 ID 转成整数，不是数字时返回 None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+
+class Store:
+    """本地 SQLite 存储
+
+    所有线程共用一个连接，写入时持有锁；ID 在库中以整数保存，读出时转回字符串，
+    与数据模型一致。
+    """
+
+    def __init__(self, path: Path):
+        """打开（必要时创建）数据库
+
+        Args:
+            path: 数据库文件路径
+        """
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        # 建索引时调用（只注册在本连接上，表结构中不引用它）
+        self._conn.create_function("s1_ngrams", 1, ngrams, deterministic=True)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        """把表结构升级到最新版本"""
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            for index in range(version, len(_MIGRATIONS)):
+                # executescript 会先提交当前事务，升级脚本和版本号需要放在同一个脚本里
+                self._conn.executescript(
+                    f"BEGIN; {_MIGRATIONS[index]} PRAGMA user_version = {index + 1}; COMMIT;"
+                )
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: Iterable[tuple]):
+        """在一个事务中执行多组批量写入
+
+        Args:
+            statements: (SQL, 参数序列) 的序列
+        """
+        with self._lock, self._conn:
+            for sql, rows in statements:
+                self._conn.executemany(sql, rows)
+
+    # ------------------------------------------------------------ 写入
+
+    def save_forums(self, forums: Sequence[Forum]):
+        """保存版块列表
+
+        Args:
+            forums: 版块列表
+        """
+        now = time.time()
+        rows = [
+            (_int_id(f.id), f.name, f.description, f.threads_count, f.posts_count, f.new_posts, f.url, now)
+            for f in forums if _int_id(f.id) is not None
+        ]
+        self._write([(
+            """
+            INSERT INTO forums (fid, name, description, threads_count, posts_count, new_posts, url, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (fid) DO UPDATE SET
+                name = excluded.name,
+                description = COALESCE(excluded.description, forums.description),
+                threads_count = excluded.threads_count,
+                posts_count = excluded.posts_count,
+                new_posts = excluded.new_posts,
+                url = COALESCE(excluded.url, forums.url),
+                fetched_at = excluded.fetched_at
+            """,
+            rows,
+        )])
+
+    def save_thread_list(self, threads: Sequence[Thread], page: Optional[int] = None):
+        """保存版块帖子列表中的帖子
+
+        只更新列表中能看到的字段，不覆盖已保存的帖子内容。
+
+        Args:
+            threads: 帖子列表
+            page: 列表页码（可选），提供时记录帖子在该页中的位置，用于离线显示
+        """
+        now = time.time()
+        rows = [
+            (
+                _int_id(t.id), _int_id(t.forum_id), t.title, t.author, t.author_id,
+                t.views, t.replies, t.created_at, t.last_reply_time, t.last_reply_author,
+                int(t.is_sticky), int(t.is_locked), int(t.is_digest),
+                page, position if page is not None else None, now, now,
+            )
+            for position, t in enumerate(threads) if _int_id(t.id) is not None
+        ]
+        statements = []
+        if page is not None and rows:
+            # 同一版块同一页的旧位置作废，避免离线显示时混入已经翻到后面的帖子
+            fids = {row[1] for row in rows if row[1] is not None}
+            statements.append((
+                "UPDATE threads SET list_page = NULL, list_position = NULL WHERE fid = ? AND list_page = ?",
+                [(fid, page) for fid in fids],
+            ))
+        statements.append((
+            """
+            INSERT INTO threads (
+                tid, fid, title, author, author_id, views, replies, created_at,
+                last_reply_time, last_reply_author, is_sticky, is_locked, is_digest,
+                list_page, list_position, listed_at, fetched_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (tid) DO UPDATE SET
+                fid = COALESCE(excluded.fid, threads.fid),
+                title = excluded.title,
+                author = excluded.author,
+                author_id = COALESCE(excluded.author_id, threads.author_id),
+                views = excluded.views,
+                replies = excluded.replies,
+                created_at = COALESCE(excluded.created_at, threads.created_at),
+                last_reply_time = excluded.last_reply_time,
+                last_reply_author = excluded.last_reply_author,
+                is_sticky = excluded.is_sticky,
+                is_locked = excluded.is_locked,
+                is_digest = excluded.is_digest,
+                list_page = COALESCE(excluded.list_page, threads.list_page),
+                list_position = COALESCE(excluded.list_position, threads.list_position),
+                listed_at = excluded.listed_at,
+                fetched_at = excluded.fetched_at
+            """,
+            rows,
+        ))
+        statements.append((_INDEX_THREAD, [(row[0],) for row in rows]))
+        self._write(statements)
+
+    def save_thread(self, thread: Thread, page: int):
+        """保存帖子某一页的内容和回复
+
+        Args:
+            thread: 帖子对象（get_thread 的结果）
+            page: 页码
+        """
+        tid = _int_id(thread.id)
+        if tid is None:
+            return
+        now = time.time()
+        # 楼主和发帖时间只有第一页上的可靠，其他页面上解析到的是该页第一条回复的
+        first_page = page == 1
+        thread_row = (
+            tid, _int_id(thread.forum_id), thread.title,
+            thread.author if first_page else None, thread.author_id,
+            thread.content if first_page else None, thread.views, thread.replies,
+            thread.created_at if first_page else None, thread.total_pages, now,
+        )
+        post_rows = [
+            (_int_id(p.id), tid, p.floor, page, p.author, p.author_id, p.content, p.post_time, now)
+            for p in thread.posts if _int_id(p.id) is not None
+        ]
+        self._write([
+            (
+                """
+                INSERT INTO threads (
+                    tid, fid, title, author, author_id, content, views, replies,
+                    created_at, total_pages, fetched_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (tid) DO UPDATE SET
+                    fid = COALESCE(excluded.fid, threads.fid),
+                    title = excluded.title,
+                    author = COALESCE(NULLIF(excluded.author, ''), threads.author),
+                    author_id = COALESCE(excluded.author_id, threads.author_id),
+                    content = COALESCE(excluded.content, threads.content),
+                    views = excluded.views,
+                    replies = excluded.replies,
+                    created_at = COALESCE(excluded.created_at, threads.created_at),
+                    total_pages = excluded.total_pages,
+                    fetched_at = excluded.fetched_at
+                """,
+                [thread_row],
+            ),
+            (
+                """
+                INSERT INTO posts (pid, tid, floor, page, author, author_id, content, post_time, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (pid) DO UPDATE SET
+                    floor = excluded.floor,
+                    page = excluded.page,
+                    author = excluded.author,
+                    author_id = COALESCE(excluded.author_id, posts.author_id),
+                    content = excluded.content,
+                    post_time = excluded.post_time,
+                    fetched_at = excluded.fetched_at
+                """,
+                post_rows,
+            ),
+            (_INDEX_THREAD, [(tid,)]),
+            (_INDEX_POST, [(row[0],) for row in post_rows]),
+        ])
+
+    def save_sync_state(self, thread_id: str, last_floor: int, last_page: int, replies: int):
+        """记录帖子的增量同步进度
+
+        Args:
+            thread_id: 帖子 ID
+            last_floor: 已同步的最高楼层
+            last_page: 最高楼层所在页码
+            replies: 帖子当前的回复数
+        """
+        self._write([(
+            """
+            INSERT INTO sync_state (tid, last_floor, last_page, replies, synced_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (tid) DO UPDATE SET
+                last_floor = excluded.last_floor,
+                last_page = excluded.last_page,
+                replies = excluded.replies,
+                synced_at = excluded.synced_at
+            """,
+            [(_int_id(thread_id), last_floor, last_page, replies, time.time())],
+        )])
+
+    def remove_sync_state(self, thread_id: str) -> bool:
+        """不再同步该帖子（已保存的内容保留）
+
+        Args:
+            thread_id: 帖子 ID
+
+        Returns:
+            该帖子之前是否在同步
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM sync_state WHERE tid = ?", (_int_id(thread_id),))
+        return cursor.rowcount > 0
+
+    # ------------------------------------------------------------ 读取
+
+    def get_forums(self) -> List[Forum]:
+        """读取保存的版块列表（按版块 ID 排序）"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM forums ORDER BY fid").fetchall()
+        return [
+            Forum(
+                id=str(row["fid"]),
+                name=row["name"],
+                description=row["description"],
+                threads_count=row["threads_count"],
+                posts_count=row["posts_count"],
+                new_posts=row["new_posts"],
+                url=row["url"],
+            )
+            for row in rows
+        ]
+
+    def forum_name(self, forum_id: str) -> Optional[str]:
+        """按版块 ID 查询版块名称
+
+        Args:
+            forum_id: 版块 ID
+
+        Returns:
+            版块名称，没有保存过时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT name FROM forums WHERE fid = ?", (_int_id(forum_id),)).fetchone()
+        return row["name"] if row else None
+
+    @staticmethod
+    def _thread_of(row: sqlite3.Row) -> Thread:
+        """把 threads 表的一行转换为帖子对象"""
+        return Thread(
+            id=str(row["tid"]),
+            title=row["title"],
+            author=row["author"] or '',
+            author_id=row["author_id"],
+            forum_id=str(row["fid"]) if row["fid"] is not None else None,
+            content=row["content"],
+            views=row["views"],
+            replies=row["replies"],
+            created_at=row["created_at"],
+            last_reply_time=row["last_reply_time"],
+            last_reply_author=row["last_reply_author"],
+            is_sticky=bool(row["is_sticky"]),
+            is_locked=bool(row["is_locked"]),
+            is_digest=bool(row["is_digest"]),
+            total_pages=row["total_pages"] or 1,
+            fetched_at=row["fetched_at"],
+        )
+
+    def get_thread_list(self, forum_id: str, page: int = 1) -> List[Thread]:
+        """读取版块某一页最近一次获取到的帖子列表
+
+        Args:
+            forum_id: 版块 ID
+            page: 页码
+
+        Returns:
+            帖子列表，按当时在页面中的顺序排列，fetched_at 为获取该列表的时间
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM threads WHERE fid = ? AND list_page = ? ORDER BY list_position",
+                (_int_id(forum_id), page),
+            ).fetchall()
+        threads = [self._thread_of(row) for row in rows]
+        for thread, row in zip(threads, rows):
+            thread.forum = forum_id
+            thread.fetched_at = row["listed_at"] or row["fetched_at"]
+        return threads
+
+    def thread_list_pages(self, forum_id: str) -> int:
+        """版块保存过的帖子列表最大页码
+
+        Args:
+            forum_id: 版块 ID
+
+        Returns:
+            最大页码，没有保存过时为 0
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(list_page) AS pages FROM threads WHERE fid = ?", (_int_id(forum_id),)
+            ).fetchone()
+        return row["pages"] or 0
+
+    def get_thread(self, thread_id: str, page: int = 1) -> Optional[Thread]:
+        """读取保存的帖子某一页
+
+        Args:
+            thread_id: 帖子 ID
+            page: 页码
+
+        Returns:
+            帖子对象，posts 为该页除楼主外的回复，fetched_at 为获取该页的时间；
+            没有保存过该页时返回 None
+        """
+        tid = _int_id(thread_id)
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM threads WHERE tid = ?", (tid,)).fetchone()
+            post_rows = self._conn.execute(
+                "SELECT * FROM posts WHERE tid = ? AND page = ? AND floor > 1 ORDER BY floor",
+                (tid, page),
+            ).fetchall()
+        # 只在帖子列表中出现过、没有获取过该页时不返回空页面
+        if row is None or (not post_rows and (page > 1 or row["content"] is None)):
+            return None
+
+        thread = self._thread_of(row)
+        thread.current_page = page
+        thread.posts = [
+            Post(
+                id=str(p["pid"]),
+                thread_id=thread.id,
+                floor=p["floor"],
+                author=p["author"] or '',
+                author_id=p["author_id"],
+                content=p["content"] or '',
+                post_time=p["post_time"],
+            )
+            for p in post_rows
+        ]
+        if post_rows:
+            thread.fetched_at = max(p["fetched_at"] for p in post_rows)
+        return thread
+
+    def get_sync_state(self, thread_id: str) -> Optional[SyncState]:
+        """读取帖子的增量同步进度
+
+        Args:
+            thread_id: 帖子 ID
+
+        Returns:
+            同步进度，从未同步过时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sync_state WHERE tid = ?", (_int_id(thread_id),)).fetchone()
+        if row is None:
+            return None
+        return SyncState(
+            thread_id=str(row["tid"]),
+            last_floor=row["last_floor"],
+            last_page=row["last_page"],
+            replies=row["replies"],
+            synced_at=row["synced_at"],
+        )
+
+    def synced_thread_ids(self) -> List[str]:
+        """所有同步过的帖子 ID（按上次同步时间从早到晚）"""
+        with self._lock:
+            rows = self._conn.execute("SELECT tid FROM sync_state ORDER BY synced_at").fetchall()
+        return [str(row["tid"]) for row in rows]
+
+    def listed_replies(self, thread_id: str) -> Optional[int]:
+        """上次同步之后在版块帖子列表中看到的回复数
+
+        Args:
+            thread_id: 帖子 ID
+
+        Returns:
+            回复数；上次同步之后没有获取过包含该帖子的帖子列表时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT threads.replies FROM threads JOIN sync_state USING (tid)
+                WHERE tid = ? AND threads.listed_at > sync_state.synced_at
+                """,
+                (_int_id(thread_id),),
+            ).fetchone()
+        return row["replies"] if row else None
+
+    def search(
+        self,
+        query: str,
+        forum_id: Optional[str] = None,
+        author: Optional[str] = None,
+        limit: int = 50
+    ) -> List[SearchHit]:
+        """在保存的帖子标题、楼主内容和回复中全文搜索
+
+        Args:
+            query: 查询文本，空格分隔的词都必须出现
+            forum_id: 只搜索该版块（可选）
+            author: 只搜索该作者发表的内容（可选）
+            limit: 最多返回的结果数
+
+        Returns:
+            按相关度排序的命中列表（标题的权重高于正文）
+
+        Raises:
+            sqlite3.OperationalError: 查询表达式无法解析
+        """
+        expression, fragments = match_expression(query)
+        if not expression:
+            return []
+
+        sql = """
+            SELECT search_index.rowid AS doc, bm25(search_index, 5.0, 1.0) AS rank,
+                   threads.tid, threads.fid, threads.title, forums.name AS forum,
+                   posts.pid, COALESCE(posts.floor, 1) AS floor,
+                   COALESCE(posts.author, threads.author) AS author,
+                   COALESCE(posts.content, threads.content) AS content
+            FROM search_index
+            LEFT JOIN posts ON search_index.rowid > 0 AND posts.pid = search_index.rowid
+            JOIN threads ON threads.tid = COALESCE(posts.tid, -search_index.rowid)
+            LEFT JOIN forums ON forums.fid = threads.fid
+            WHERE search_index MATCH ?
+        """
+        params: list = [expression]
+        if forum_id is not None:
+            sql += " AND threads.fid = ?"
+            params.append(_int_id(forum_id))
+        if author:
+            sql += " AND COALESCE(posts.author, threads.author) = ?"
+            params.append(author)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            SearchHit(
+                thread_id=str(row["tid"]),
+                title=row["title"],
+                author=row["author"] or '',
+                forum_id=str(row["fid"]) if row["fid"] is not None else None,
+                forum=row["forum"],
+                post_id=str(row["pid"]) if row["pid"] is not None else None,
+                floor=row["floor"],
+                snippet=_snippet(row["content"] or row["title"], fragments),
+                rank=row["rank"],
+            )
+            for row in rows
+        ]
+
+
+_shared_store: Optional[Store] = None
+_shared_lock = threading.Lock()
+
+
+def get_store(config: Config) -> Optional[Store]:
+    """获取进程内共享的本地存储
+
+    数据库位于配置目录下的 ``store.db``，配置 ``store.enabled = false`` 时不启用。
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        共享的存储对象，未启用或无法打开数据库时返回 None
+    """
+    global _shared_store
+    if str(config.get("store.enabled", True)).lower() in ("false", "0", "no"):
+        return None
+    with _shared_lock:
+        if _shared_store is None:
+            try:
+                _shared_store = Store(config.config_dir / "store.db")
+            except sqlite3.Error as e:
+                print(f"警告：打开本地存储失败：{e}")
+                return None
+        return _shared_store
@@ -5,6 +5,7 @@ from textual.widgets import Header, Footer, Static, Button
 from textual.binding import Binding
 
 from s1cli.config import Config
+from s1cli.api.cache import CACHE_NORMAL
 from s1cli.api.client import S1Client
 
 
@@ -50,10 +51,15 @@ class S1App(App):
     
     TITLE = "S1CLI - Stage1st 论坛客户端"
     
-    def __init__(self):
+    def __init__(self, cache_mode: str = CACHE_NORMAL):
+        """初始化应用
+        
+        Args:
+            cache_mode: 响应缓存模式（offline 时只显示本地保存的内容）
+        """
         super().__init__()
         self.config = Config()
-        self.client = S1Client(self.config)
+        self.client = S1Client(self.config, cache_mode=cache_mode)
     
     def compose(self) -> ComposeResult:
         """组装界面"""
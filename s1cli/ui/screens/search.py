@@ -1,4 +1,5 @@
 """搜索界面"""
+from rich.text import Text
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Input, DataTable, Static, Footer, Header, Button
@@ -56,6 +57,7 @@ class SearchScreen(Screen):
         Binding("escape", "back", "返回", priority=True),
         Binding("enter", "view_thread", "查看帖子"),
         Binding("ctrl+f", "focus_search", "聚焦搜索框"),
+        Binding("ctrl+l", "toggle_local", "在线/本地"),
     ]
     
     def __init__(self, client, config):
@@ -64,6 +66,8 @@ class SearchScreen(Screen):
         self.config = config
         self.search_api = SearchAPI(client)
         self.results = []
+        # 本地全文搜索（不访问网络），ctrl+l 切换
+        self.local = False
     
     def compose(self) -> ComposeResult:
         """组装界面"""
@@ -88,7 +92,11 @@ class SearchScreen(Screen):
         
         # 更新状态栏
         status = self.query_one("#status-bar", Static)
-        status.update("💡 输入关键词后按回车或点击搜索按钮")
+        status.update("💡 输入关键词后按回车或点击搜索按钮 | [ctrl+l]切换在线/本地搜索")
+        
+        # 离线模式下默认本地搜索
+        if self.client.offline:
+            self.action_toggle_local()
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """处理按钮点击"""
@@ -113,26 +121,39 @@ class SearchScreen(Screen):
         status.update(f"🔄 正在搜索：{keyword}")
         
         try:
-            self.results = self.search_api.search(keyword)
-            
             table = self.query_one("#results-table", DataTable)
-            table.clear()
+            
+            if self.local:
+                self.results = self.search_api.search_local(keyword)
+                table.clear()
+                for hit in self.results:
+                    table.add_row(
+                        hit.thread_id,
+                        hit.title[:50],
+                        hit.forum or hit.forum_id or "未知",
+                        hit.author,
+                        # 摘要是原文，可能包含 [link] 等方括号，不按 markup 解析
+                        Text(f"#{hit.floor} {hit.snippet[:40]}")
+                    )
+            else:
+                self.results = self.search_api.search(keyword)
+                table.clear()
+                # 添加数据行
+                for result in self.results:
+                    table.add_row(
+                        result.id,
+                        result.title[:50],  # 限制标题长度
+                        result.forum or "未知",
+                        result.author,
+                        str(result.replies)
+                    )
             
             if not self.results:
                 status.update(f"❌ 没有找到相关结果")
                 return
             
-            # 添加数据行
-            for result in self.results:
-                table.add_row(
-                    result.id,
-                    result.title[:50],  # 限制标题长度
-                    result.forum or "未知",
-                    result.author,
-                    str(result.replies)
-                )
-            
-            status.update(f"✅ 找到 {len(self.results)} 个结果 | [Enter]查看帖子")
+            mode = "本地" if self.local else "在线"
+            status.update(f"✅ {mode}找到 {len(self.results)} 个结果 | [Enter]查看帖子 [ctrl+l]切换在线/本地")
             
         except Exception as e:
             status.update(f"❌ 搜索失败：{str(e)}")
@@ -141,6 +162,24 @@ class SearchScreen(Screen):
         """返回"""
         self.dismiss()
     
+    def action_toggle_local(self) -> None:
+        """切换在线搜索和本地全文搜索"""
+        self.local = not self.local
+        header = self.query_one("#search-header", Static)
+        header.update("🔍 本地搜索（已保存的帖子和回复）" if self.local else "🔍 搜索帖子")
+        
+        table = self.query_one("#results-table", DataTable)
+        table.clear(columns=True)
+        if self.local:
+            table.add_columns("ID", "标题", "版块", "作者", "命中内容")
+        else:
+            table.add_columns("ID", "标题", "版块", "作者", "回复")
+        self.results = []
+        
+        # 输入框中有关键词时直接按新模式重新搜索
+        if self.query_one("#search-input", Input).value.strip():
+            self.action_search()
+    
     def action_focus_search(self) -> None:
         """聚焦搜索框"""
         self.query_one("#search-input", Input).focus()
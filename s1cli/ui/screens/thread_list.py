@@ -6,6 +6,7 @@ from textual.binding import Binding
 from textual.containers import Container
 
 from s1cli.api.forum import ForumAPI
+from s1cli.utils import format_age
 
 
 class ThreadListScreen(Screen):
@@ -78,7 +79,8 @@ class ThreadListScreen(Screen):
         status.update(f"🔄 正在加载第{self.page}页...")
         
         try:
-            self.threads = self.forum_api.get_thread_list(self.forum_name, self.page)
+            # 离线或获取失败时显示本地存储中该页最近一次的内容
+            self.threads, _ = self.forum_api.load_thread_list(self.forum_name, self.page)
             
             table = self.query_one("#thread-table", DataTable)
             table.clear()
@@ -104,7 +106,10 @@ class ThreadListScreen(Screen):
                     str(thread.views)
                 )
             
-            status.update(f"✅ 已加载 {len(self.threads)} 个帖子 | 第{self.page}页 | "
+            source = ""
+            if self.threads[0].fetched_at is not None:
+                source = f"📦 本地保存（{format_age(self.threads[0].fetched_at)}获取） | "
+            status.update(f"✅ 已加载 {len(self.threads)} 个帖子 | 第{self.page}页 | {source}"
                          f"[n]下一页 [p]上一页 [r]刷新 [Enter]查看")
             
         except Exception as e:
@@ -115,8 +120,9 @@ class ThreadListScreen(Screen):
         self.dismiss()
     
     def action_refresh(self) -> None:
-        """刷新"""
-        self.load_threads()
+        """刷新（跳过本地缓存）"""
+        with self.client.refreshing():
+            self.load_threads()
     
     def action_next_page(self) -> None:
         """下一页"""
@@ -6,7 +6,7 @@ from textual.binding import Binding
 from textual.containers import Container, Vertical, ScrollableContainer
 
 from s1cli.api.thread import ThreadAPI
-from s1cli.utils import strip_html_tags
+from s1cli.utils import format_age, strip_html_tags
 
 
 class ThreadViewScreen(Screen):
@@ -109,7 +109,8 @@ class ThreadViewScreen(Screen):
         status.update(f"🔄 正在加载帖子...")
         
         try:
-            self.thread = self.thread_api.get_thread(self.thread_id, self.page)
+            # 离线或获取失败时显示本地存储中保存的该页内容
+            self.thread = self.thread_api.load_thread(self.thread_id, self.page)
             
             if not self.thread:
                 status.update(f"❌ 未找到帖子")
@@ -152,9 +153,12 @@ class ThreadViewScreen(Screen):
                     content_log.write(clean_post_content)
                     content_log.write("")
             
+            source = ""
+            if self.thread.fetched_at is not None:
+                source = f"📦 本地保存（{format_age(self.thread.fetched_at)}获取） | "
             status.update(
                 f"✅ 已加载 {len(self.thread.posts)} 条回复 | "
-                f"第{self.page}页 | "
+                f"第{self.page}页 | {source}"
                 f"[n]下一页 [p]上一页 [r]刷新 [j/k]滚动"
             )
             
@@ -166,8 +170,9 @@ class ThreadViewScreen(Screen):
         self.dismiss()
     
     def action_refresh(self) -> None:
-        """刷新"""
-        self.load_thread()
+        """刷新（跳过本地缓存）"""
+        with self.client.refreshing():
+            self.load_thread()
     
     def action_next_page(self) -> None:
         """下一页"""
@@ -1,8 +1,23 @@
 """工具函数"""
+import os
+import re
 import time
 import random
-from typing import Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
 from functools import wraps
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# 匹配 http:// 或 https:// 开头的 URL
+_URL_PATTERN = re.compile(r'(https?://[^\s\u200b]+)')
 
 
 def rate_limit(min_delay: float = 0.5, max_delay: float = 2.0):
@@ -23,6 +38,35 @@ def rate_limit(min_delay: float = 0.5, max_delay: float = 2.0):
     return decorator
 
 
+@contextmanager
+def locked_file(path: Path) -> Iterator[IO[bytes]]:
+    """以独占锁打开文件，跨进程互斥
+    
+    Args:
+        path: 文件路径
+        
+    Yields:
+        已加锁的文件对象（读写模式）
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    f = os.fdopen(fd, "r+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        yield f
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            f.close()
+
+
 def strip_html_tags(html: str) -> str:
     """移除 HTML 标签，保留纯文本
     
@@ -54,6 +98,22 @@ def format_number(num: int) -> str:
         return str(num)
 
 
+def format_age(timestamp: float) -> str:
+    """把时间戳格式化为距现在多久（如 3 小时前）
+    
+    Args:
+        timestamp: 时间戳
+        
+    Returns:
+        格式化后的字符串
+    """
+    seconds = max(time.time() - timestamp, 0)
+    for unit, size in (("天", 86400), ("小时", 3600), ("分钟", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)} {unit}前"
+    return "刚刚"
+
+
 def truncate_text(text: str, max_length: int = 50, suffix: str = "...") -> str:
     """截断文本
     
@@ -70,6 +130,32 @@ def truncate_text(text: str, max_length: int = 50, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)] + suffix
 
 
+def _replace_url(match: re.Match) -> str:
+    """把 URL 替换为可点击的跳转提示"""
+    url = match.group(1)
+    # 移除末尾的零宽空格
+    url = url.rstrip('\u200b')
+    try:
+        domain = urlparse(url).netloc
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        return f'[link={url}]【跳转至{domain}】[/link]'
+    except ValueError:
+        return url
+
+
+def linkify_urls(text: str) -> str:
+    """把文本中的 URL 替换为 Rich 链接标记（显示为 "【跳转至域名】"）
+    
+    Args:
+        text: 帖子内容文本
+        
+    Returns:
+        替换后的文本
+    """
+    return _URL_PATTERN.sub(_replace_url, text)
+
+
 def get_signature() -> str:
     """获取 s1cli 签名
     
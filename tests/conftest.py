@@ -0,0 +1,28 @@
+"""测试共用的 fixture"""
+import httpx
+import pytest
+
+from s1cli import store
+from s1cli.api.client import S1Client
+from s1cli.config import Config
+
+
+@pytest.fixture
+def fake_client(tmp_path, monkeypatch):
+    """创建使用假站点的客户端，关闭缓存、频率限制和重试
+
+    本地存储默认关闭，传入 store={"enabled": True} 时使用临时目录中的数据库。
+    """
+    monkeypatch.setattr(store, "_shared_store", None)
+
+    def make(handler, **settings):
+        config = Config(str(tmp_path / "config"))
+        config._config.update({
+            "cache": {"enabled": False},
+            "rate_limit": {"enabled": False},
+            "retry": {"max_retries": 0},
+            "store": {"enabled": False},
+            **settings,
+        })
+        return S1Client(config, transport=httpx.MockTransport(handler))
+    return make
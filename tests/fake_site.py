@@ -0,0 +1,58 @@
+"""测试使用的假站点"""
+import random
+import re
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import make_corpus  # noqa: E402
+
+_THREAD_URL = re.compile(r"thread-(\d+)-(\d+)-1\.html")
+_SUBJECT = re.compile(r'<span id="thread_subject">.*?</span>')
+
+
+class ThreadSite:
+    """按页生成一个帖子页面的传输层处理函数
+
+    页面由 benchmarks/make_corpus.py 生成，每页 30 楼，最后一页 last_floors 楼；
+    同一页的内容固定，增加 last_floors 或 total_pages 相当于有了新回复。
+
+    Args:
+        thread_id: 帖子 ID
+        total_pages: 总页数
+        last_floors: 最后一页的楼层数
+    """
+
+    def __init__(self, thread_id: str = "2000002", total_pages: int = 3, last_floors: int = 10):
+        self.thread_id = thread_id
+        self.total_pages = total_pages
+        self.last_floors = last_floors
+        self.fail_pages = set()  # 请求这些页面时连接中断
+        self.requests = []  # 请求过的页码
+
+    def page_html(self, page: int) -> str:
+        """生成帖子某一页的 HTML（超出总页数时为最后一页）"""
+        page = min(page, self.total_pages)
+        floors = self.last_floors if page == self.total_pages else 30
+        html = make_corpus.thread(
+            random.Random(f"{self.thread_id}-{page}"), int(self.thread_id), page,
+            self.total_pages, floors, quotes=0.3
+        )
+        return _SUBJECT.sub(f'<span id="thread_subject">测试帖子 {self.thread_id}</span>', html)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        match = _THREAD_URL.fullmatch(request.url.path.rsplit("/", 1)[-1])
+        if match is None or match.group(1) != self.thread_id:
+            return httpx.Response(404)
+        page = int(match.group(2))
+        self.requests.append(page)
+        if page in self.fail_pages:
+            raise RuntimeError(f"第 {page} 页连接中断")
+        return httpx.Response(
+            200,
+            content=self.page_html(page).encode("utf-8"),
+            headers={"Content-Type": "text/html; charset=utf-8"},
+        )
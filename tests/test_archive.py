@@ -0,0 +1,91 @@
+"""帖子归档的检查点和继续归档测试"""
+import pytest
+
+from s1cli.api.thread import ThreadAPI
+from s1cli.archive import FORMATS, archive_thread, load_checkpoint
+
+from tests.fake_site import ThreadSite
+
+
+class Interrupt(Exception):
+    """模拟归档中途被中断（如 Ctrl+C）"""
+
+
+def _clean_archive(fake_client, site, path, fmt):
+    """在同样内容的新站点上从头归档一次，作为对照"""
+    clean_site = ThreadSite(site.thread_id, site.total_pages, site.last_floors)
+    archive_thread(ThreadAPI(fake_client(clean_site)), site.thread_id, path, fmt)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_resume_after_interrupt(fake_client, tmp_path, fmt):
+    site = ThreadSite(total_pages=4, last_floors=10)
+    api = ThreadAPI(fake_client(site))
+    path = tmp_path / f"thread.{fmt}"
+
+    def stop_after_second_page(result):
+        if result.last_page == 2:
+            raise Interrupt()
+
+    with pytest.raises(Interrupt):
+        archive_thread(api, site.thread_id, path, fmt, progress=stop_after_second_page)
+    checkpoint = load_checkpoint(path)
+    assert (checkpoint.page, checkpoint.floor) == (2, 60)
+
+    result = archive_thread(api, site.thread_id, path, fmt, resume=True)
+    assert (result.posts, result.last_page, result.last_floor) == (40, 4, 100)
+    assert path.read_bytes() == _clean_archive(fake_client, site, tmp_path / f"clean.{fmt}", fmt)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_resume_after_failed_page(fake_client, tmp_path, fmt):
+    site = ThreadSite(total_pages=4, last_floors=10)
+    site.fail_pages = {3}
+    api = ThreadAPI(fake_client(site))
+    path = tmp_path / f"thread.{fmt}"
+
+    # 获取失败的页面之前的部分照常写完
+    result = archive_thread(api, site.thread_id, path, fmt)
+    assert (result.last_page, result.last_floor) == (2, 60)
+
+    site.fail_pages.clear()
+    result = archive_thread(api, site.thread_id, path, fmt, resume=True)
+    assert (result.last_page, result.last_floor) == (4, 100)
+    assert path.read_bytes() == _clean_archive(fake_client, site, tmp_path / f"clean.{fmt}", fmt)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_resume_appends_new_replies(fake_client, tmp_path, fmt):
+    site = ThreadSite(total_pages=2, last_floors=10)
+    api = ThreadAPI(fake_client(site))
+    path = tmp_path / f"thread.{fmt}"
+    archive_thread(api, site.thread_id, path, fmt)
+
+    # 最后一页有了新回复，并且多了一页
+    site.total_pages, site.last_floors = 3, 5
+    site.requests.clear()
+    result = archive_thread(api, site.thread_id, path, fmt, resume=True)
+    assert site.requests == [2, 3]
+    assert (result.posts, result.last_page, result.last_floor) == (25, 3, 65)
+    assert path.read_bytes() == _clean_archive(fake_client, site, tmp_path / f"clean.{fmt}", fmt)
+
+    # 没有新回复时文件不变
+    before = path.read_bytes()
+    result = archive_thread(api, site.thread_id, path, fmt, resume=True)
+    assert result.posts == 0
+    assert path.read_bytes() == before
+
+
+def test_resume_rejects_other_checkpoint(fake_client, tmp_path):
+    site = ThreadSite(total_pages=1, last_floors=10)
+    api = ThreadAPI(fake_client(site))
+    path = tmp_path / "thread.jsonl"
+    archive_thread(api, site.thread_id, path, "jsonl")
+    before = path.read_bytes()
+
+    with pytest.raises(ValueError):
+        archive_thread(api, "2000003", path, "jsonl", resume=True)
+    with pytest.raises(ValueError):
+        archive_thread(api, site.thread_id, path, "md", resume=True)
+    assert path.read_bytes() == before
@@ -0,0 +1,23 @@
+"""帖子列表置顶/精华标记测试"""
+from bs4 import BeautifulSoup
+
+from s1cli.api.forum import ForumAPI
+
+
+def _flags(row: str):
+    html = f'<table><tbody id="normalthread_1"{row}</tbody></table>'
+    return ForumAPI._thread_flags(BeautifulSoup(html, "lxml").tbody)
+
+
+def test_digest_in_title_is_not_digest():
+    assert _flags('><tr><th><a class="s xst">Weekly digest 讨论</a></th></tr>') == (False, False)
+
+
+def test_digest_icon():
+    assert _flags('><tr><th><img src="static/image/common/digest_1.gif" alt="digest" /></th></tr>') == (False, True)
+    assert _flags('><tr><th><img class="icn dgt" src="x.gif" /></th></tr>') == (False, True)
+
+
+def test_sticky():
+    assert _flags('><tr><th><img class="icn stk" src="x.gif" /></th></tr>') == (True, False)
+    assert _flags(' class="sortnum"><tr><th>置顶</th></tr>') == (True, False)
@@ -0,0 +1,37 @@
+"""请求耗时统计测试"""
+from s1cli.metrics import RequestTracer
+
+
+def _timing(marks):
+    tracer = RequestTracer()
+    tracer.marks = marks
+    return tracer.timing("GET", "https://example.com/", 0.0, 1.0, 10.0, 200, 0)
+
+
+def test_connect_includes_tls():
+    """HTTPS 请求的连接耗时包括 TLS 握手"""
+    timing = _timing({
+        "connection.connect_tcp.started": 1.0,
+        "connection.connect_tcp.complete": 2.0,
+        "connection.start_tls.started": 2.0,
+        "connection.start_tls.complete": 4.0,
+        "http11.receive_response_headers.complete": 6.0,
+    })
+    assert timing.connect == 3.0
+    assert timing.ttfb == 5.0
+
+
+def test_connect_without_tls():
+    """HTTP 请求没有 TLS 事件时使用 TCP 连接完成的时间"""
+    timing = _timing({
+        "connection.connect_tcp.started": 1.0,
+        "connection.connect_tcp.complete": 2.5,
+        "http11.receive_response_headers.complete": 6.0,
+    })
+    assert timing.connect == 1.5
+
+
+def test_reused_connection():
+    """复用连接时没有连接事件，连接耗时为 0"""
+    timing = _timing({"http11.receive_response_headers.complete": 6.0})
+    assert timing.connect == 0.0
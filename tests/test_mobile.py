@@ -0,0 +1,165 @@
+"""移动端 JSON 接口测试
+
+通过 httpx.MockTransport 回放 benchmarks/corpus/v2 中的移动端接口数据和 HTML 页面。
+"""
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from s1cli.api import mobile
+from s1cli.api.client import S1Client
+from s1cli.api.forum import ForumAPI
+from s1cli.api.thread import ThreadAPI
+from s1cli.config import Config
+from s1cli.models.thread import Post, Thread
+
+CORPUS = Path(__file__).resolve().parent.parent / "benchmarks" / "corpus" / "v2"
+
+
+def _variables(name):
+    return json.loads((CORPUS / name).read_text(encoding="utf-8"))["Variables"]
+
+
+class FakeSite:
+    """按 URL 返回语料的传输层，记录请求过的路径
+
+    Args:
+        mobile_modules: 可用的移动端接口模块，其他模块返回 HTML 页面（站点关闭了接口）
+    """
+
+    def __init__(self, mobile_modules=("forumindex", "forumdisplay", "viewthread")):
+        self.mobile_modules = mobile_modules
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.rsplit("/", 1)[-1]
+        module = request.url.params.get("module")
+        self.requests.append(module or path)
+
+        if path == "index.php" and module in self.mobile_modules:
+            name = "mobile_viewthread_short.json" if module == "viewthread" else f"mobile_{module}.json"
+            content_type = "application/json"
+        elif path == "index.php" or path == "forum.php":
+            name = "forum_index.html"
+            content_type = "text/html"
+        elif path.startswith("thread-"):
+            name = "thread_short.html"
+            content_type = "text/html"
+        else:
+            return httpx.Response(404)
+        return httpx.Response(
+            200,
+            content=(CORPUS / name).read_bytes(),
+            headers={"Content-Type": f"{content_type}; charset=utf-8"},
+        )
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    def make(site):
+        config = Config(str(tmp_path))
+        config._config.update({
+            "api": {"backend": "mobile"},
+            "cache": {"enabled": False},
+            "rate_limit": {"enabled": False},
+            "retry": {"max_retries": 0},
+            "store": {"enabled": False},
+        })
+        return S1Client(config, transport=httpx.MockTransport(site))
+    return make
+
+
+def test_parse_forum_index():
+    forums = mobile.parse_forum_index(_variables("mobile_forumindex.json"))
+    first = forums[0]
+    assert (first.id, first.name, first.threads_count, first.posts_count, first.new_posts) == (
+        "4", "版块4", 59030, 2125080, 2071
+    )
+    assert first.description == "讨论活动画面联动剧透难度剧情抽卡主机今天"
+    assert first.group == "主论坛"
+
+    # 子版块紧跟在所属版块之后，沿用所属版块的分区，不带描述和统计数
+    ids = [f.id for f in forums]
+    assert ids[ids.index("6"):ids.index("6") + 4] == ["6", "60", "61", "7"]
+    sub = forums[ids.index("60")]
+    assert (sub.name, sub.group, sub.description, sub.threads_count) == ("子版块6-0", "主论坛", None, 0)
+    assert {f.group for f in forums} == {"主论坛", "子论坛", "专楼"}
+
+
+def test_parse_forum_display():
+    threads, total_pages = mobile.parse_forum_display(_variables("mobile_forumdisplay.json"), "游戏论坛", "4")
+    assert len(threads) == 50
+    assert total_pages == 1234  # 61700 个主题，每页 50 个
+
+    first = threads[0]
+    assert first.id == "2260000"
+    assert first.title == "发售玩法漫画掌机补丁评测难度 & 0"
+    assert (first.author, first.author_id) == ("作者0", "1000")
+    assert (first.forum, first.forum_id) == ("游戏论坛", "4")
+    assert first.created_at == "2025-10-1 10:00"  # 取 title 中的完整时间
+    assert (first.last_reply_author, first.last_reply_time) == ("回复者0", "2025-10-28 10:00")
+    assert (first.views, first.replies) == (423308, 2814)
+
+    assert [(t.is_sticky, t.is_digest) for t in threads[4:9]] == [
+        (False, True), (False, True), (False, False), (True, False), (True, False)
+    ]
+
+
+def test_parse_view_thread():
+    thread = mobile.parse_view_thread(_variables("mobile_viewthread_short.json"), "2000001", 1)
+    assert thread.title == "今天发售今天感想活动音乐 <2000001>"
+    assert (thread.author, thread.author_id, thread.forum_id) == ("用户405043", "405043", "4")
+    assert thread.content == "收集抽卡联动\n剧透掌机\n通关音乐剧情发售联动画面剧情版本剧透动画"
+    assert thread.created_at == "2025-2-2 01:01"
+    assert (thread.views, thread.replies, thread.total_pages) == (200973, 29, 1)
+    assert [p.floor for p in thread.posts] == [2, 3, 4, 5]
+    assert (thread.posts[0].id, thread.posts[0].author_id) == ("50001002", "329840")
+
+    # 第 2 页没有楼主，楼主信息取本页第一楼
+    thread = mobile.parse_view_thread(_variables("mobile_viewthread_quotes.json"), "2000003", 2)
+    assert [p.floor for p in thread.posts] == list(range(31, 61))
+    assert thread.author == thread.posts[0].author
+    assert thread.total_pages == 5
+
+
+def test_load_variables():
+    def response(body, status=200):
+        return httpx.Response(status, content=body.encode("utf-8"))
+
+    assert mobile.load_variables(response('{"Variables": {"postlist": []}}'), "viewthread") == (
+        True, {"postlist": []}
+    )
+    # 是 JSON 但没有帖子数据（帖子不存在等）：接口可用，本次退回 HTML
+    assert mobile.load_variables(response('{"Variables": {"notice": {}}}'), "viewthread") == (True, None)
+    assert mobile.load_variables(response("<html></html>"), "viewthread") == (False, None)
+    assert mobile.load_variables(response("{}", status=404), "viewthread") == (False, None)
+
+
+def test_fetch_through_client(make_client):
+    site = FakeSite()
+    client = make_client(site)
+    threads = ForumAPI(client).get_thread_list("4")
+    thread = ThreadAPI(client).get_thread("2000001")
+
+    assert threads == mobile.parse_forum_display(_variables("mobile_forumdisplay.json"), "4", "4")[0]
+    assert thread == mobile.parse_view_thread(_variables("mobile_viewthread_short.json"), "2000001", 1)
+    assert site.requests == ["forumdisplay", "viewthread"]
+
+
+def test_fallback_to_html(make_client):
+    site = FakeSite(mobile_modules=())
+    client = make_client(site)
+    api = ThreadAPI(client)
+    data = json.loads((CORPUS / "expected.json").read_text(encoding="utf-8"))["threads"]["thread_short.html"]
+    expected = Thread(**{**data, "posts": [Post(**post) for post in data["posts"]]})
+
+    assert api.get_thread("2000001") == expected
+    assert api.mobile.unavailable == {"viewthread"}
+    # 不可用的模块之后直接解析 HTML，不再请求接口
+    assert api.get_thread("2000001") == expected
+    assert site.requests == ["viewthread", "thread-2000001-1-1.html", "thread-2000001-1-1.html"]
+
+    # 不可用的记录属于各自的实例
+    assert ThreadAPI(client).mobile.unavailable == set()
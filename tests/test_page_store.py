@@ -0,0 +1,33 @@
+"""页面存储测试"""
+import threading
+
+from s1cli.api.page_store import PageStore
+from s1cli.utils import locked_file
+
+
+def test_append_waits_for_index_lock(tmp_path):
+    """其他进程改写索引日志期间，追加记录等待改写完成"""
+    store = PageStore(tmp_path)
+    with locked_file(store.lock_path):
+        writer = threading.Thread(target=store.put, args=(b"page",))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+        assert not store.index_path.exists()
+    writer.join(5)
+
+    assert PageStore(tmp_path).stats()["entries"] == 1
+
+
+def test_compact_keeps_other_writers(tmp_path):
+    """改写日志时合并其他进程追加的记录"""
+    first = PageStore(tmp_path)
+    second = PageStore(tmp_path)
+    digests = [first.put(b"first"), second.put(b"second")]
+
+    first._log_lines = 10 ** 6  # 触发改写
+    first._maybe_compact()
+
+    reopened = PageStore(tmp_path)
+    assert reopened.stats()["entries"] == 2
+    assert [reopened.get(digest) for digest in digests] == [b"first", b"second"]
@@ -0,0 +1,177 @@
+"""解析器一致性测试
+
+用 benchmarks/corpus 下的语料页面，确认各个解析路径得到的 Thread/Post 与语料目录中
+expected.json 记录的期望结果完全一致：
+
+- BeautifulSoup 和 lxml 解析帖子页面（parser.backend = bs4/lxml）
+- 流式获取帖子楼层（ThreadAPI.iter_posts，bs4 和 lxml）
+- SoupStrainer 只解析帖子列表和分页，以及不使用 SoupStrainer 的完整解析
+- 多进程解析池（parser.workers）
+- 移动端 JSON 接口（api.backend = mobile）
+
+expected.json 由重写解析之前的 ThreadAPI.get_thread / ForumAPI.get_thread_list
+对同一语料的结果生成，之后不再修改。
+
+语料中的移动端数据与 HTML 页面内容不同，移动端用例按桌面页面构造同一页的接口数据：
+元数据取自期望结果，回复内容使用页面中回复的原始 HTML（与接口的 message 字段相同）。
+"""
+import html
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from bench_parsers import CORPUS_ROOT, THREAD_KINDS, load_corpus, make_client  # noqa: E402
+from s1cli.api import forum, mobile  # noqa: E402
+from s1cli.api.forum import ForumAPI  # noqa: E402
+from s1cli.api.parse_pool import ParsePool  # noqa: E402
+from s1cli.api.thread import ThreadAPI  # noqa: E402
+from s1cli.models.thread import Post, Thread  # noqa: E402
+
+# 语料中各帖子页面的页码
+THREAD_PAGES = {"short": 1, "long": 1, "quotes": 2}
+
+
+@pytest.fixture(scope="module", params=["v1", "v2"])
+def corpus_dir(request):
+    return CORPUS_ROOT / request.param
+
+
+@pytest.fixture(scope="module")
+def pages(corpus_dir):
+    return load_corpus(corpus_dir)
+
+
+@pytest.fixture(scope="module")
+def expected(corpus_dir):
+    return json.loads((corpus_dir / "expected.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def parse_pool():
+    pool = ParsePool(1)
+    yield pool
+    pool.shutdown()
+
+
+def _thread(data):
+    return Thread(**{**data, "posts": [Post(**post) for post in data["posts"]]})
+
+
+def _expected_thread(expected, kind):
+    """返回 (页码, 期望的帖子对象)"""
+    thread = _thread(expected["threads"][f"thread_{kind}.html"])
+    assert thread.posts
+    return THREAD_PAGES[kind], thread
+
+
+def _expected_thread_list(expected):
+    threads = [_thread(data) for data in expected["thread_list"]]
+    assert threads
+    return threads
+
+
+@pytest.mark.parametrize("tid,kind", list(THREAD_KINDS.items()))
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_thread(pages, expected, tmp_path, backend, tid, kind):
+    page, thread = _expected_thread(expected, kind)
+    api = ThreadAPI(make_client(str(tmp_path), pages))
+    api.parser_backend = backend
+    assert api.get_thread(tid, page) == thread
+
+
+@pytest.mark.parametrize("tid,kind", list(THREAD_KINDS.items()))
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_streamed_thread(pages, expected, tmp_path, backend, tid, kind):
+    page, expected_thread = _expected_thread(expected, kind)
+    api = ThreadAPI(make_client(str(tmp_path), pages))
+    api.parser_backend = backend
+    thread = Thread(id=tid, title="未知标题", author="", current_page=page)
+    posts = list(api._stream_page(thread, page))
+    assert thread == expected_thread
+    assert [p for p in posts if p.floor > 1] == expected_thread.posts
+
+
+@pytest.mark.parametrize("strained", [True, False])
+def test_thread_list(pages, expected, tmp_path, monkeypatch, strained):
+    if not strained:
+        monkeypatch.setattr(forum, "_THREAD_LIST_STRAINER", None)
+    api = ForumAPI(make_client(str(tmp_path), pages))
+    assert api.get_thread_list("4") == _expected_thread_list(expected)
+
+
+@pytest.mark.parametrize("tid,kind", list(THREAD_KINDS.items()))
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_parse_pool_thread(pages, expected, parse_pool, backend, tid, kind):
+    page, thread = _expected_thread(expected, kind)
+    future = parse_pool.submit_thread(pages[f"thread_{kind}.html"], "utf-8", tid, page, backend)
+    assert future.result(timeout=60) == thread
+
+
+def test_parse_pool_thread_list(pages, expected, parse_pool):
+    future = parse_pool.submit_thread_list(pages["forumdisplay.html"], "utf-8", "4", "4")
+    assert future.result(timeout=60)[0] == _expected_thread_list(expected)
+
+
+@pytest.mark.parametrize("tid,kind", list(THREAD_KINDS.items()))
+def test_mobile_view_thread(pages, expected, tid, kind):
+    page, thread = _expected_thread(expected, kind)
+    content = pages[f"thread_{kind}.html"].decode("utf-8")
+    messages = [td.decode_contents() for td in BeautifulSoup(content, "lxml").select("td.t_f")]
+    postlist = [
+        {"pid": post.id, "position": str(post.floor), "author": post.author,
+         "authorid": post.author_id, "dateline": post.post_time}
+        for post in thread.posts
+    ]
+    if page == 1:
+        postlist.insert(0, {"pid": "", "first": "1", "position": "1",
+                            "author": thread.author, "dateline": thread.created_at})
+    assert len(postlist) == len(messages)
+    for item, message in zip(postlist, messages):
+        item["message"] = message
+
+    variables = {
+        "thread": {"subject": html.escape(thread.title), "views": str(thread.views),
+                   "replies": str(thread.replies)},
+        "postlist": postlist,
+        "ppp": "30",
+    }
+    assert mobile.parse_view_thread(variables, tid, page) == thread
+
+
+def test_mobile_forum_display(expected):
+    threads = _expected_thread_list(expected)
+    variables = {
+        "forum_threadlist": [
+            {"tid": t.id, "subject": html.escape(t.title), "author": t.author, "authorid": t.author_id,
+             "dateline": t.created_at, "lastposter": t.last_reply_author, "lastpost": t.last_reply_time,
+             "views": str(t.views), "replies": str(t.replies), "displayorder": str(int(t.is_sticky)),
+             "digest": str(int(t.is_digest)), "closed": str(int(t.is_locked))}
+            for t in threads
+        ],
+        "forum": {"threads": "1000"},
+        "tpp": "50",
+    }
+    assert mobile.parse_forum_display(variables, "4", "4") == (threads, 20)
+
+
+def test_mobile_forum_index(pages, tmp_path):
+    expected = ForumAPI(make_client(str(tmp_path), pages))._parse_forum_list(
+        pages["forum_index.html"].decode("utf-8")
+    )
+    groups = {}
+    for f in expected:
+        groups.setdefault(f.group, []).append(f.id)
+    variables = {
+        "catlist": [{"name": name, "forums": fids} for name, fids in groups.items()],
+        "forumlist": [
+            {"fid": f.id, "name": f.name, "description": f.description or "",
+             "threads": str(f.threads_count), "posts": str(f.posts_count), "todayposts": str(f.new_posts)}
+            for f in expected
+        ],
+    }
+    assert mobile.parse_forum_index(variables) == expected
@@ -0,0 +1,18 @@
+"""本地存储测试"""
+from s1cli.models.thread import Post, Thread
+from s1cli.store import Store
+
+
+def test_search_opening_post_once(tmp_path):
+    """楼主内容只命中一次，即使回复列表中也有第一楼"""
+    store = Store(tmp_path / "store.db")
+    posts = [
+        Post(id="101", thread_id="1", floor=1, author="楼主", content="出售游戏机一台"),
+        Post(id="102", thread_id="1", floor=2, author="路人", content="游戏机多少钱"),
+    ]
+    store.save_thread(
+        Thread(id="1", title="出物", author="楼主", content="出售游戏机一台", posts=posts), 1
+    )
+
+    hits = store.search("游戏机")
+    assert sorted((hit.floor, hit.post_id or "") for hit in hits) == [(1, ""), (2, "102")]
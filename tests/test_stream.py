@@ -0,0 +1,69 @@
+"""流式获取帖子楼层测试"""
+from contextlib import closing
+
+import httpx
+import pytest
+
+from s1cli.api.exceptions import NetworkError
+from s1cli.api.thread import ThreadAPI, _parse_thread_page
+from s1cli.records import page_posts
+
+from tests.fake_site import ThreadSite
+
+
+def _expected(site, pages):
+    return [
+        (page, post)
+        for page in pages
+        for post in page_posts(_parse_thread_page(site.page_html(page), site.thread_id, page))
+    ]
+
+
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_iter_posts_matches_page_parse(fake_client, backend):
+    site = ThreadSite(total_pages=3, last_floors=10)
+    api = ThreadAPI(fake_client(site, parser={"backend": backend}, store={"enabled": True}))
+
+    assert list(api.iter_posts(site.thread_id)) == _expected(site, [1, 2, 3])
+    assert site.requests == [1, 2, 3]
+    assert list(api.iter_posts(site.thread_id, 2, 2)) == _expected(site, [2])
+
+    # 获取到的页面写入本地存储，与整页解析的结果一致
+    for page in (1, 3):
+        expected = _parse_thread_page(site.page_html(page), site.thread_id, page)
+        stored = api.store.get_thread(site.thread_id, page)
+        assert (stored.title, stored.total_pages) == (expected.title, expected.total_pages)
+        assert [(p.id, p.floor, p.content) for p in stored.posts] == [
+            (p.id, p.floor, p.content) for p in expected.posts
+        ]
+
+
+def test_iter_posts_saves_partial_page(fake_client):
+    """提前结束时已产出的楼层也写入本地存储，离线时可以读回"""
+    site = ThreadSite(total_pages=2)
+    api = ThreadAPI(fake_client(site, store={"enabled": True}))
+
+    with closing(api.iter_posts(site.thread_id)) as posts:
+        streamed = [next(posts) for _ in range(5)]
+    assert [post.floor for _, post in streamed] == [1, 2, 3, 4, 5]
+    assert [p.floor for p in api.store.get_thread(site.thread_id, 1).posts] == [2, 3, 4, 5]
+
+    api.client.cache_mode = "offline"
+    site.requests.clear()
+    assert [post.floor for _, post in api.iter_posts(site.thread_id, 1, 1)] == [1, 2, 3, 4, 5]
+    assert site.requests == []
+
+
+def test_iter_posts_falls_back_to_store(fake_client):
+    site = ThreadSite(total_pages=2)
+    api = ThreadAPI(fake_client(site, store={"enabled": True}))
+    list(api.iter_posts(site.thread_id))
+
+    # 服务器错误时使用本地存储中保存的页面
+    api = ThreadAPI(fake_client(lambda request: httpx.Response(502), store={"enabled": True}))
+    assert [(page, post.id) for page, post in api.iter_posts(site.thread_id)] == [
+        (page, post.id) for page, post in _expected(site, [1, 2])
+    ]
+
+    with pytest.raises(NetworkError):
+        list(api.iter_posts("2000009"))
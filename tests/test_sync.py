@@ -0,0 +1,88 @@
+"""帖子增量同步测试"""
+from s1cli.api.parse_pool import ParsePool
+from s1cli.api.thread import ThreadAPI, _parse_thread_page
+
+from tests.fake_site import ThreadSite
+
+
+def _api(fake_client, site):
+    return ThreadAPI(fake_client(site, store={"enabled": True}))
+
+
+def test_sync_fetches_new_pages(fake_client):
+    site = ThreadSite(total_pages=2, last_floors=10)
+    api = _api(fake_client, site)
+
+    result = api.sync_thread(site.thread_id)
+    assert (result.last_page, result.last_floor, result.skipped) == (2, 40, False)
+    assert [post.floor for post in result.new_posts] == list(range(2, 41))
+
+    # 回复数没有变化时不请求
+    site.requests.clear()
+    assert api.sync_thread(site.thread_id, known_replies=59).skipped
+    assert site.requests == []
+
+    # 有新回复时从上次的最后一页开始获取
+    site.total_pages, site.last_floors = 3, 5
+    result = api.sync_thread(site.thread_id, known_replies=89)
+    assert site.requests == [2, 3]
+    assert [post.floor for post in result.new_posts] == list(range(41, 66))
+
+
+def test_sync_resumes_after_failed_page(fake_client):
+    """某一页获取失败时，下次同步从该页之前继续，而不是因为回复数没有变化而跳过"""
+    site = ThreadSite(total_pages=4, last_floors=10)
+    site.fail_pages = {3}
+    api = _api(fake_client, site)
+
+    result = api.sync_thread(site.thread_id)
+    assert (result.last_page, result.last_floor) == (2, 60)
+
+    site.fail_pages.clear()
+    site.requests.clear()
+    result = api.sync_thread(site.thread_id, known_replies=119)
+    assert not result.skipped
+    assert site.requests == [2, 3, 4]
+    assert (result.last_page, result.last_floor) == (4, 100)
+    assert [post.floor for post in result.new_posts] == list(range(61, 101))
+
+    # 同步到最后一页之后，回复数没有变化时跳过
+    assert api.sync_thread(site.thread_id, known_replies=119).skipped
+
+
+class CountingPool(ParsePool):
+    """记录提交的帖子页"""
+
+    def __init__(self):
+        super().__init__(1)
+        self.pages = []
+
+    def submit_thread(self, content, encoding, thread_id, page, backend="bs4"):
+        self.pages.append(page)
+        return super().submit_thread(content, encoding, thread_id, page, backend)
+
+
+def test_sync_uses_parse_pool(fake_client):
+    site = ThreadSite(total_pages=3, last_floors=10)
+    expected = [
+        post for page in (1, 2, 3)
+        for post in _parse_thread_page(site.page_html(page), site.thread_id, page).posts
+    ]
+
+    api = _api(fake_client, site)
+    api.parse_pool = CountingPool()
+    try:
+        # 第一页由 get_thread 解析以得到总页数，其余页面交给解析池，结果照常写入本地存储
+        result = api.sync_thread(site.thread_id)
+        assert api.parse_pool.pages == [2, 3]
+        assert result.new_posts == expected
+        assert [post.id for post in api.store.get_thread(site.thread_id, 3).posts] == [
+            post.id for post in expected if post.floor > 60
+        ]
+
+        api.parse_pool.pages.clear()
+        pages = list(api.iter_pages(site.thread_id))
+        assert api.parse_pool.pages == [2, 3]
+        assert [post for thread in pages for post in thread.posts] == expected
+    finally:
+        api.parse_pool.shutdown()